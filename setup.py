@@ -61,6 +61,7 @@ setup(
     ],
     extras_require={
         "test": ["pytest", "pytest-cov", "requests", "pytest-asyncio"],
+        "speedups": ["orjson", "brotli"],
         "dev": ["pylint", "black", "sqlalchemy-stubs", "pre-commit"],
         "nvim": ["neovim", "python-language-server"],
         "docs": ["mkdocs", "pygments", "pymdown-extensions", "mkautodoc"],
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import os
+import tempfile
+
 import click
 import uvicorn
 from graphql.utilities import print_schema
@@ -24,21 +27,218 @@ def main(**kwargs):
 @click.option("--jwt-secret", default=None, help="Secret key for JWT encryption")
 @click.option("--reload/--no-reload", default=False, help="Reload if source files change")
 @click.option("--default-role", type=str, default=None, help="Default PostgreSQL role for anonymous users")
-def run(connection, schema, host, port, jwt_identifier, jwt_secret, reload, workers, default_role):
+@click.option(
+    "--cache-control-max-age",
+    type=int,
+    default=None,
+    help="Cache-Control max-age in seconds for anonymous read-only GET requests",
+)
+@click.option(
+    "--json-passthrough/--no-json-passthrough",
+    default=False,
+    help="Serve eligible queries with JSON produced by PostgreSQL, skipping the GraphQL executor",
+)
+@click.option(
+    "--stream-connections/--no-stream-connections",
+    default=False,
+    help="Stream edges of eligible connection queries from a server-side cursor",
+)
+@click.option(
+    "--compression-minimum-size",
+    type=int,
+    default=500,
+    help="Minimum response size in bytes to compress with brotli or gzip. Negative to disable",
+)
+@click.option(
+    "--result-cache-ttl",
+    type=float,
+    default=None,
+    help="Seconds to cache query results. Installs triggers to detect writes",
+)
+@click.option(
+    "--result-cache-stale-while-revalidate",
+    type=float,
+    default=0,
+    help="Seconds an expired cached result may be served while it is refreshed",
+)
+@click.option("--max-query-depth", type=int, default=None, help="Maximum nesting of tables and connections")
+@click.option(
+    "--max-query-node-count", type=int, default=None, help="Maximum number of tables and connections in a query"
+)
+@click.option("--max-query-estimated-rows", type=float, default=None, help="Maximum estimated rows read by a query")
+@click.option(
+    "--expose-query-cost/--no-expose-query-cost",
+    default=False,
+    help="Return the estimated cost of each operation in the cost response extension",
+)
+@click.option("--pool-size", type=int, default=5, help="Database connections kept open per worker")
+@click.option("--max-overflow", type=int, default=10, help="Additional connections per worker opened under load")
+@click.option("--pool-timeout", type=float, default=30, help="Seconds to wait for a pooled connection")
+@click.option("--pool-recycle", type=int, default=-1, help="Seconds after which a connection is replaced")
+@click.option("--pool-pre-ping/--no-pool-pre-ping", default=False, help="Test connections when checked out")
+@click.option(
+    "--prepared-statement-cache-size", type=int, default=100, help="Prepared statements cached per connection"
+)
+@click.option("--command-timeout", type=float, default=None, help="Seconds before a database command is cancelled")
+@click.option(
+    "--max-db-connections",
+    type=int,
+    default=None,
+    help="Refuse to start if all workers together could open more database connections",
+)
+@click.option("--warmup/--no-warmup", default=False, help="Open pool connections before serving requests")
+@click.option(
+    "--warmup-queries",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="File of GraphQL queries to prepare on each connection during warmup",
+)
+@click.option(
+    "--fold-claims/--no-fold-claims",
+    default=False,
+    help="Send BEGIN and JWT claims to PostgreSQL in one round trip",
+)
+@click.option(
+    "--native-pool/--no-native-pool",
+    default=False,
+    help="Execute queries on a native asyncpg pool, opened alongside the SQLAlchemy pool",
+)
+@click.option(
+    "--replica", "replicas", multiple=True, help="Read replica connection string for queries. May be repeated"
+)
+@click.option(
+    "--read-your-writes",
+    type=float,
+    default=0,
+    help="Seconds a JWT subject reads from the primary after a mutation",
+)
+@click.option(
+    "--max-concurrency", type=int, default=None, help="Maximum concurrently executing GraphQL requests per worker"
+)
+@click.option("--max-queue", type=int, default=100, help="Maximum requests waiting to execute before responding 503")
+@click.option("--max-queue-wait", type=float, default=5, help="Seconds a request may wait to execute before a 503")
+@click.option(
+    "--max-concurrency-per-tenant", type=int, default=None, help="Maximum concurrently executing requests per tenant"
+)
+@click.option("--tenant-claim", default="role", help="JWT claim identifying a tenant e.g. role or sub")
+def run(
+    connection,
+    schema,
+    host,
+    port,
+    jwt_identifier,
+    jwt_secret,
+    reload,
+    workers,
+    default_role,
+    cache_control_max_age,
+    json_passthrough,
+    stream_connections,
+    compression_minimum_size,
+    result_cache_ttl,
+    result_cache_stale_while_revalidate,
+    max_query_depth,
+    max_query_node_count,
+    max_query_estimated_rows,
+    expose_query_cost,
+    pool_size,
+    max_overflow,
+    pool_timeout,
+    pool_recycle,
+    pool_pre_ping,
+    prepared_statement_cache_size,
+    command_timeout,
+    max_db_connections,
+    warmup,
+    warmup_queries,
+    fold_claims,
+    native_pool,
+    replicas,
+    read_your_writes,
+    max_concurrency,
+    max_queue,
+    max_queue_wait,
+    max_concurrency_per_tenant,
+    tenant_claim,
+):
     """Run the GraphQL Web Server"""
     if reload and workers > 1:
         click.echo("Reload not supported with workers > 1")
-    else:
+        return
+
+    if pool_size < 1 or max_overflow < 0:
+        raise click.BadParameter("--pool-size must be at least 1 and --max-overflow must not be negative")
+
+    from nebulo.server.starlette import get_connection_budget
+
+    budget = workers * get_connection_budget(
+        pool_size, max_overflow, result_cache_ttl is not None, native_pool, replicas=len(replicas)
+    )
+    click.echo(f"Database connection budget: {budget} ({workers} worker(s) x {budget // workers} connections)")
+    if max_db_connections is not None and budget > max_db_connections:
+        raise click.BadParameter(
+            f"{workers} worker(s) may open {budget} connections, exceeding {max_db_connections}. "
+            "Reduce --workers, --pool-size, --max-overflow or --replica",
+            param_hint="--max-db-connections",
+        )
+    if max_concurrency is not None and max_concurrency > pool_size + max_overflow:
+        click.echo("Warning: --max-concurrency exceeds the pool's capacity, requests will queue inside the pool")
+
+    snapshot_path = None
+    if workers > 1:
+        # Reflect once and share the result with every worker
+        from nebulo.sql.reflection.snapshot import dump_snapshot, reflect_snapshot
+
+        engine = create_engine(connection)
+        snapshot = dump_snapshot(reflect_snapshot(engine, schema=schema))
+        engine.dispose()
+
+        snapshot_fd, snapshot_path = tempfile.mkstemp(prefix="nebulo-", suffix=".snapshot")
+        with os.fdopen(snapshot_fd, "wb") as snapshot_file:
+            snapshot_file.write(snapshot)
 
+    try:
         with EnvManager(
             NEBULO_CONNECTION=connection,
             NEBULO_SCHEMA=schema,
             NEBULO_JWT_IDENTIFIER=jwt_identifier,
             NEBULO_JWT_SECRET=jwt_secret,
             NEBULO_DEFAULT_ROLE=default_role,
+            NEBULO_CACHE_CONTROL_MAX_AGE=cache_control_max_age,
+            NEBULO_JSON_PASSTHROUGH=json_passthrough,
+            NEBULO_STREAM_CONNECTIONS=stream_connections,
+            NEBULO_COMPRESSION_MINIMUM_SIZE=compression_minimum_size,
+            NEBULO_RESULT_CACHE_TTL=result_cache_ttl,
+            NEBULO_RESULT_CACHE_STALE_WHILE_REVALIDATE=result_cache_stale_while_revalidate,
+            NEBULO_MAX_QUERY_DEPTH=max_query_depth,
+            NEBULO_MAX_QUERY_NODE_COUNT=max_query_node_count,
+            NEBULO_MAX_QUERY_ESTIMATED_ROWS=max_query_estimated_rows,
+            NEBULO_EXPOSE_QUERY_COST=expose_query_cost,
+            NEBULO_POOL_SIZE=pool_size,
+            NEBULO_MAX_OVERFLOW=max_overflow,
+            NEBULO_POOL_TIMEOUT=pool_timeout,
+            NEBULO_POOL_RECYCLE=pool_recycle,
+            NEBULO_POOL_PRE_PING=pool_pre_ping,
+            NEBULO_PREPARED_STATEMENT_CACHE_SIZE=prepared_statement_cache_size,
+            NEBULO_COMMAND_TIMEOUT=command_timeout,
+            NEBULO_MAX_CONCURRENCY=max_concurrency,
+            NEBULO_MAX_QUEUE=max_queue,
+            NEBULO_MAX_QUEUE_WAIT=max_queue_wait,
+            NEBULO_MAX_CONCURRENCY_PER_TENANT=max_concurrency_per_tenant,
+            NEBULO_TENANT_CLAIM=tenant_claim,
+            NEBULO_REFLECTION_SNAPSHOT=snapshot_path,
+            NEBULO_WARMUP=warmup,
+            NEBULO_WARMUP_QUERIES=os.path.abspath(warmup_queries) if warmup_queries else None,
+            NEBULO_FOLD_CLAIMS=fold_claims,
+            NEBULO_NATIVE_POOL=native_pool,
+            NEBULO_REPLICAS=",".join(replicas) or None,
+            NEBULO_READ_YOUR_WRITES=read_your_writes,
         ):
 
             uvicorn.run("nebulo.server.app:APP", host=host, workers=workers, port=port, log_level="info", reload=reload)
+    finally:
+        if snapshot_path is not None:
+            os.remove(snapshot_path)
 
 
 @main.command()
@@ -37,6 +37,121 @@ class Config:
     # Default number of entries per API page
     DEFAULT_PAGE_SIZE = int(ENV.get("NEBULO_DEFAULT_PAGE_SIZE", 20))
 
+    # Maximum rows written per statement by createMany*, updateMany* and deleteMany* mutations.
+    # Chunks are made smaller if needed to stay within PostgreSQL's limit on bind parameters
+    BULK_MUTATION_CHUNK_SIZE = int(ENV.get("NEBULO_BULK_MUTATION_CHUNK_SIZE", 1000))
+
+    # Maximum number of parsed and validated GraphQL documents to cache
+    DOCUMENT_CACHE_SIZE = int(ENV.get("NEBULO_DOCUMENT_CACHE_SIZE", 1000))
+
+    # Builds SQL for queries with SQLAlchemy, "sqlalchemy", or directly as text, "text"
+    SQL_COMPILER = ENV.get("NEBULO_SQL_COMPILER", "sqlalchemy")
+
+    # Selects nested relationships as correlated subqueries, "subquery", joins them with LEFT JOIN LATERAL,
+    # "lateral", or picks per relationship, "auto". Requests may choose with the relationshipStrategy extension
+    RELATIONSHIP_STRATEGY = ENV.get("NEBULO_RELATIONSHIP_STRATEGY", "subquery")
+
+    # Maximum number of compiled SQL statements to cache, keyed by the shape of the query
+    PLAN_CACHE_SIZE = int(ENV.get("NEBULO_PLAN_CACHE_SIZE", 1000))
+
+    # Maximum number of automatic persisted queries to store
+    PERSISTED_QUERY_CACHE_SIZE = int(ENV.get("NEBULO_PERSISTED_QUERY_CACHE_SIZE", 1000))
+
+    # Cache-Control max-age (seconds) for anonymous read-only GET requests. Disabled if not set
+    CACHE_CONTROL_MAX_AGE = (
+        int(ENV["NEBULO_CACHE_CONTROL_MAX_AGE"]) if ENV.get("NEBULO_CACHE_CONTROL_MAX_AGE") is not None else None
+    )
+
+    # Serve eligible queries with the JSON text produced by PostgreSQL, skipping the GraphQL executor
+    JSON_PASSTHROUGH = ENV.get("NEBULO_JSON_PASSTHROUGH", "false").lower() in ("true", "1")
+
+    # Stream the edges of eligible connection queries from a server-side cursor
+    STREAM_CONNECTIONS = ENV.get("NEBULO_STREAM_CONNECTIONS", "false").lower() in ("true", "1")
+
+    # Responses of at least this many bytes are compressed with brotli or gzip. Disabled if negative
+    COMPRESSION_MINIMUM_SIZE = int(ENV.get("NEBULO_COMPRESSION_MINIMUM_SIZE", 500))
+
+    # Seconds to cache query results. Disabled if not set
+    RESULT_CACHE_TTL = float(ENV["NEBULO_RESULT_CACHE_TTL"]) if ENV.get("NEBULO_RESULT_CACHE_TTL") is not None else None
+
+    # Seconds an expired result may be served while it is refreshed in the background
+    RESULT_CACHE_STALE_WHILE_REVALIDATE = float(ENV.get("NEBULO_RESULT_CACHE_STALE_WHILE_REVALIDATE", 0))
+
+    # Maximum number of query results to cache
+    RESULT_CACHE_SIZE = int(ENV.get("NEBULO_RESULT_CACHE_SIZE", 1000))
+
+    # Query cost limits. Operations exceeding a limit are rejected. Disabled if not set
+    MAX_QUERY_DEPTH = int(ENV["NEBULO_MAX_QUERY_DEPTH"]) if ENV.get("NEBULO_MAX_QUERY_DEPTH") is not None else None
+    MAX_QUERY_NODE_COUNT = (
+        int(ENV["NEBULO_MAX_QUERY_NODE_COUNT"]) if ENV.get("NEBULO_MAX_QUERY_NODE_COUNT") is not None else None
+    )
+    MAX_QUERY_ESTIMATED_ROWS = (
+        float(ENV["NEBULO_MAX_QUERY_ESTIMATED_ROWS"])
+        if ENV.get("NEBULO_MAX_QUERY_ESTIMATED_ROWS") is not None
+        else None
+    )
+
+    # Return the estimated cost of each operation in the `cost` response extension, even if no limit is set
+    EXPOSE_QUERY_COST = ENV.get("NEBULO_EXPOSE_QUERY_COST", "false").lower() in ("true", "1")
+
+    # Path to a reflection snapshot written by the CLI so workers skip reflecting the database
+    REFLECTION_SNAPSHOT = ENV.get("NEBULO_REFLECTION_SNAPSHOT")
+
+    # Connections kept open by each worker's pool, and additional connections opened under load
+    POOL_SIZE = int(ENV.get("NEBULO_POOL_SIZE", 5))
+    MAX_OVERFLOW = int(ENV.get("NEBULO_MAX_OVERFLOW", 10))
+
+    # Seconds to wait for a pooled connection
+    POOL_TIMEOUT = float(ENV.get("NEBULO_POOL_TIMEOUT", 30))
+
+    # Seconds after which a connection is replaced. Disabled if negative
+    POOL_RECYCLE = int(ENV.get("NEBULO_POOL_RECYCLE", -1))
+
+    # Test connections for liveness when checked out of the pool
+    POOL_PRE_PING = ENV.get("NEBULO_POOL_PRE_PING", "false").lower() in ("true", "1")
+
+    # Prepared statements cached per connection by the asyncpg driver. Disabled if 0
+    PREPARED_STATEMENT_CACHE_SIZE = int(ENV.get("NEBULO_PREPARED_STATEMENT_CACHE_SIZE", 100))
+
+    # Seconds before a database command is cancelled. Disabled if not set
+    COMMAND_TIMEOUT = float(ENV["NEBULO_COMMAND_TIMEOUT"]) if ENV.get("NEBULO_COMMAND_TIMEOUT") is not None else None
+
+    # Comma separated connection strings of read replicas to serve query operations from
+    REPLICAS = [x.strip() for x in ENV.get("NEBULO_REPLICAS", "").split(",") if x.strip()]
+
+    # Seconds a JWT subject reads from the primary after executing a mutation. Disabled if 0
+    READ_YOUR_WRITES = float(ENV.get("NEBULO_READ_YOUR_WRITES", 0))
+
+    # Open pool connections and load type codecs before serving requests
+    WARMUP = ENV.get("NEBULO_WARMUP", "false").lower() in ("true", "1")
+
+    # Path to a file of GraphQL query operations to prepare on each connection during warmup
+    WARMUP_QUERIES = ENV.get("NEBULO_WARMUP_QUERIES")
+
+    # Send BEGIN and the statement setting JWT claims and role in one round trip
+    FOLD_CLAIMS = ENV.get("NEBULO_FOLD_CLAIMS", "false").lower() in ("true", "1")
+
+    # Execute queries on an asyncpg pool, sized like the SQLAlchemy pool, rather than through SQLAlchemy
+    NATIVE_POOL = ENV.get("NEBULO_NATIVE_POOL", "false").lower() in ("true", "1")
+
+    # Maximum concurrently executing GraphQL requests. Should not exceed the pool's capacity, POOL_SIZE + MAX_OVERFLOW.
+    # Disabled if not set
+    MAX_CONCURRENCY = int(ENV["NEBULO_MAX_CONCURRENCY"]) if ENV.get("NEBULO_MAX_CONCURRENCY") is not None else None
+
+    # Maximum requests waiting to execute, and seconds each may wait, before responding with a 503
+    MAX_QUEUE = int(ENV.get("NEBULO_MAX_QUEUE", 100))
+    MAX_QUEUE_WAIT = float(ENV.get("NEBULO_MAX_QUEUE_WAIT", 5))
+
+    # Maximum concurrently executing requests per tenant. Disabled if not set
+    MAX_CONCURRENCY_PER_TENANT = (
+        int(ENV["NEBULO_MAX_CONCURRENCY_PER_TENANT"])
+        if ENV.get("NEBULO_MAX_CONCURRENCY_PER_TENANT") is not None
+        else None
+    )
+
+    # JWT claim identifying a tenant, e.g. role or sub
+    TENANT_CLAIM = ENV.get("NEBULO_TENANT_CLAIM", "role")
+
     @staticmethod
     def function_name_mapper(sql_function: SQLFunction) -> str:
         """to_upper -> toUpper"""
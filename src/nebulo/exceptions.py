@@ -4,3 +4,7 @@ class NebuloException(Exception):
 
 class SQLParseError(NebuloException):
     """An entity could not be parsed"""
+
+
+class QueryCostError(NebuloException):
+    """A query exceeded the configured cost limits"""
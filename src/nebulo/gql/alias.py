@@ -131,10 +131,34 @@ class DeletePayloadType(MutationPayloadType):
     pass
 
 
+class UpsertPayloadType(MutationPayloadType):
+    pass
+
+
 class FunctionPayloadType(MutationPayloadType, HasSQLFunction):
     pass
 
 
+class BulkMutationPayloadType(ObjectType):
+    pass
+
+
+class CreateManyPayloadType(BulkMutationPayloadType):
+    pass
+
+
+class UpdateManyPayloadType(BulkMutationPayloadType):
+    pass
+
+
+class DeleteManyPayloadType(BulkMutationPayloadType):
+    pass
+
+
+class UpsertManyPayloadType(BulkMutationPayloadType):
+    pass
+
+
 class InputObjectType(GraphQLInputObjectType, HasSQLAModel):
     def __init__(
         self,
@@ -175,6 +199,26 @@ class DeleteInputType(InputObjectType):
     pass
 
 
+class CreateManyInputType(InputObjectType):
+    pass
+
+
+class UpdateManyInputType(InputObjectType):
+    pass
+
+
+class DeleteManyInputType(InputObjectType):
+    pass
+
+
+class UpsertInputType(InputObjectType):
+    pass
+
+
+class UpsertManyInputType(InputObjectType):
+    pass
+
+
 class FunctionInputType(GraphQLInputObjectType):
     def __init__(
         self,
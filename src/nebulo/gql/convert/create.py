@@ -5,9 +5,12 @@ from functools import lru_cache
 from nebulo.config import Config
 from nebulo.gql.alias import (
     CreateInputType,
+    CreateManyInputType,
+    CreateManyPayloadType,
     CreatePayloadType,
     Field,
     InputObjectType,
+    List,
     NonNull,
     ObjectType,
     String,
@@ -18,10 +21,14 @@ from nebulo.gql.relay.node_interface import ID
 from nebulo.gql.resolve.resolvers.default import default_resolver
 from nebulo.sql.inspect import get_columns
 from nebulo.sql.table_base import TableProtocol
+from nebulo.text_utils import to_plural
 
 """
 createAccount(input: CreateAccountInput!):
     CreateAccountPayload
+
+createManyAccounts(input: CreateManyAccountsInput!):
+    CreateManyAccountsPayload
 """
 
 
@@ -47,6 +54,7 @@ def create_input_type_factory(sqla_model: TableProtocol) -> CreateInputType:
     return CreateInputType(result_name, attrs, description=f"All input for the create {relevant_type_name} mutation.")
 
 
+@lru_cache()
 def input_type_factory(sqla_model: TableProtocol) -> TableInputType:
     """AccountInput"""
     relevant_type_name = Config.table_type_name_mapper(sqla_model)
@@ -82,3 +90,57 @@ def create_payload_factory(sqla_model: TableProtocol) -> CreatePayloadType:
     return CreatePayloadType(
         result_name, attrs, description=f"The output of our create {relevant_type_name} mutation", sqla_model=sqla_model
     )
+
+
+@lru_cache()
+def create_many_entrypoint_factory(sqla_model: TableProtocol, resolver) -> Field:
+    """createManyAccounts"""
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    name = f"createMany{relevant_type_name}"
+    args = {"input": NonNull(create_many_input_type_factory(sqla_model))}
+    payload = create_many_payload_factory(sqla_model)
+    return {name: Field(payload, args=args, resolve=resolver, description=f"Creates many {relevant_type_name}.")}
+
+
+@lru_cache()
+def create_many_input_type_factory(sqla_model: TableProtocol) -> CreateManyInputType:
+    """CreateManyAccountsInput!"""
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    result_name = f"CreateMany{relevant_type_name}Input"
+
+    input_object_name = to_plural(Config.table_name_mapper(sqla_model))
+
+    attrs = {
+        "clientMutationId": String,
+        input_object_name: NonNull(List(NonNull(input_type_factory(sqla_model)))),
+    }
+    return CreateManyInputType(
+        result_name, attrs, description=f"All input for the create many {relevant_type_name} mutation."
+    )
+
+
+@lru_cache()
+def create_many_payload_factory(sqla_model: TableProtocol) -> CreateManyPayloadType:
+    """CreateManyAccountsPayload"""
+    from nebulo.gql.convert.table import table_factory
+
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    relevant_attr_name = to_plural(Config.table_name_mapper(sqla_model))
+    result_name = f"CreateMany{relevant_type_name}Payload"
+
+    attrs = {
+        "clientMutationId": Field(String, resolve=default_resolver),
+        "nodeIds": Field(NonNull(List(NonNull(ID))), resolve=default_resolver),
+        relevant_attr_name: Field(
+            NonNull(List(NonNull(table_factory(sqla_model)))),
+            description=f"The {relevant_type_name} that were created by this mutation, in input order.",
+            resolve=default_resolver,
+        ),
+    }
+
+    return CreateManyPayloadType(
+        result_name,
+        attrs,
+        description=f"The output of our create many {relevant_type_name} mutation",
+        sqla_model=sqla_model,
+    )
@@ -5,9 +5,12 @@ from functools import lru_cache
 from nebulo.config import Config
 from nebulo.gql.alias import (
     DeleteInputType,
+    DeleteManyInputType,
+    DeleteManyPayloadType,
     DeletePayloadType,
     Field,
     InputObjectType,
+    List,
     NonNull,
     ObjectType,
     String,
@@ -16,10 +19,14 @@ from nebulo.gql.alias import (
 from nebulo.gql.relay.node_interface import ID
 from nebulo.gql.resolve.resolvers.default import default_resolver
 from nebulo.sql.table_base import TableProtocol
+from nebulo.text_utils import to_plural
 
 """
 deleteAccount(input: DeleteAccountInput!):
     deleteAccountPayload
+
+deleteManyAccounts(input: DeleteManyAccountsInput!):
+    DeleteManyAccountsPayload
 """
 
 
@@ -67,3 +74,55 @@ def delete_payload_factory(sqla_model: TableProtocol) -> InputObjectType:
     return DeletePayloadType(
         result_name, attrs, description=f"The output of our delete {relevant_type_name} mutation", sqla_model=sqla_model
     )
+
+
+@lru_cache()
+def delete_many_entrypoint_factory(sqla_model: TableProtocol, resolver) -> Field:
+    """deleteManyAccounts"""
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    name = f"deleteMany{relevant_type_name}"
+    args = {"input": NonNull(delete_many_input_type_factory(sqla_model))}
+    payload = delete_many_payload_factory(sqla_model)
+    return {
+        name: Field(
+            payload,
+            args=args,
+            resolve=resolver,
+            description=f"Delete many {relevant_type_name} using their globally unique ids.",
+        )
+    }
+
+
+@lru_cache()
+def delete_many_input_type_factory(sqla_model: TableProtocol) -> InputObjectType:
+    """DeleteManyAccountsInput!"""
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    result_name = f"DeleteMany{relevant_type_name}Input"
+
+    attrs = {
+        "nodeIds": NonNull(List(NonNull(ID))),
+        "clientMutationId": String,
+    }
+    return DeleteManyInputType(
+        result_name, attrs, description=f"All input for the delete many {relevant_type_name} mutation."
+    )
+
+
+@lru_cache()
+def delete_many_payload_factory(sqla_model: TableProtocol) -> InputObjectType:
+    """DeleteManyAccountsPayload"""
+
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    result_name = f"DeleteMany{relevant_type_name}Payload"
+
+    attrs = {
+        "clientMutationId": Field(String, resolve=default_resolver),
+        "nodeIds": Field(NonNull(List(NonNull(ID))), resolve=default_resolver),
+    }
+
+    return DeleteManyPayloadType(
+        result_name,
+        attrs,
+        description=f"The output of our delete many {relevant_type_name} mutation",
+        sqla_model=sqla_model,
+    )
@@ -7,11 +7,14 @@ from nebulo.config import Config
 from nebulo.gql.alias import (
     Field,
     InputObjectType,
+    List,
     NonNull,
     ObjectType,
     String,
     TableInputType,
     UpdateInputType,
+    UpdateManyInputType,
+    UpdateManyPayloadType,
     UpdatePayloadType,
 )
 from nebulo.gql.convert.column import convert_column_to_input
@@ -19,10 +22,14 @@ from nebulo.gql.relay.node_interface import ID
 from nebulo.gql.resolve.resolvers.default import default_resolver
 from nebulo.sql.inspect import get_columns
 from nebulo.sql.table_base import TableProtocol
+from nebulo.text_utils import to_plural
 
 """
 updateAccount(input: UpdateAccountInput!):
     UpdateAccountPayload
+
+updateManyAccounts(input: UpdateManyAccountsInput!):
+    UpdateManyAccountsPayload
 """
 
 
@@ -59,6 +66,7 @@ def update_input_type_factory(sqla_model: TableProtocol) -> InputObjectType:
     return UpdateInputType(result_name, attrs, description=f"All input for the create {relevant_type_name} mutation.")
 
 
+@lru_cache()
 def patch_type_factory(sqla_model: TableProtocol) -> InputObjectType:
     """AccountPatch"""
     relevant_type_name = Config.table_type_name_mapper(sqla_model)
@@ -96,3 +104,78 @@ def update_payload_factory(sqla_model: TableProtocol) -> InputObjectType:
     return UpdatePayloadType(
         result_name, attrs, description=f"The output of our update {relevant_type_name} mutation", sqla_model=sqla_model
     )
+
+
+@lru_cache()
+def update_many_entrypoint_factory(sqla_model: TableProtocol, resolver) -> t.Dict[str, Field]:
+    """updateManyAccounts"""
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    name = f"updateMany{relevant_type_name}"
+    args = {"input": NonNull(update_many_input_type_factory(sqla_model))}
+    payload = update_many_payload_factory(sqla_model)
+    return {
+        name: Field(
+            payload,
+            args=args,
+            resolve=resolver,
+            description=f"Updates many {relevant_type_name} using their globally unique ids and patches.",
+        )
+    }
+
+
+@lru_cache()
+def update_many_input_type_factory(sqla_model: TableProtocol) -> InputObjectType:
+    """UpdateManyAccountsInput!"""
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    result_name = f"UpdateMany{relevant_type_name}Input"
+
+    input_object_name = to_plural(Config.table_name_mapper(sqla_model))
+
+    attrs = {
+        "clientMutationId": String,
+        input_object_name: NonNull(List(NonNull(node_patch_type_factory(sqla_model)))),
+    }
+    return UpdateManyInputType(
+        result_name, attrs, description=f"All input for the update many {relevant_type_name} mutation."
+    )
+
+
+@lru_cache()
+def node_patch_type_factory(sqla_model: TableProtocol) -> InputObjectType:
+    """AccountNodePatch"""
+    relevant_type_name = Config.table_type_name_mapper(sqla_model)
+    result_name = f"{relevant_type_name}NodePatch"
+
+    input_object_name = Config.table_name_mapper(sqla_model)
+
+    attrs = {"nodeId": NonNull(ID), input_object_name: NonNull(patch_type_factory(sqla_model))}
+    return TableInputType(
+        result_name, attrs, description=f"A patch for the {relevant_type_name} with a globally unique id."
+    )
+
+
+@lru_cache()
+def update_many_payload_factory(sqla_model: TableProtocol) -> InputObjectType:
+    """UpdateManyAccountsPayload"""
+    from nebulo.gql.convert.table import table_factory
+
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    relevant_attr_name = to_plural(Config.table_name_mapper(sqla_model))
+    result_name = f"UpdateMany{relevant_type_name}Payload"
+
+    attrs = {
+        "clientMutationId": Field(String, resolve=default_resolver),
+        "nodeIds": Field(NonNull(List(NonNull(ID))), resolve=default_resolver),
+        relevant_attr_name: Field(
+            NonNull(List(NonNull(table_factory(sqla_model)))),
+            resolve=default_resolver,
+            description=f"The {relevant_type_name} that were updated by this mutation, in input order.",
+        ),
+    }
+
+    return UpdateManyPayloadType(
+        result_name,
+        attrs,
+        description=f"The output of our update many {relevant_type_name} mutation",
+        sqla_model=sqla_model,
+    )
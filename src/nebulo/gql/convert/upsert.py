@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import re
+import typing as t
+from functools import lru_cache
+
+from nebulo.config import Config
+from nebulo.gql.alias import (
+    EnumType,
+    EnumValue,
+    Field,
+    InputField,
+    InputObjectType,
+    List,
+    NonNull,
+    String,
+    TableInputType,
+    UpsertInputType,
+    UpsertManyInputType,
+    UpsertManyPayloadType,
+    UpsertPayloadType,
+)
+from nebulo.gql.convert.column import convert_column_to_input
+from nebulo.gql.relay.node_interface import ID
+from nebulo.gql.resolve.resolvers.default import default_resolver
+from nebulo.sql.inspect import get_columns, get_unique_constraints
+from nebulo.sql.table_base import TableProtocol
+from nebulo.text_utils import to_plural
+from sqlalchemy.sql.schema import Constraint
+
+"""
+upsertAccount(input: UpsertAccountInput!):
+    UpsertAccountPayload
+
+upsertManyAccounts(input: UpsertManyAccountsInput!):
+    UpsertManyAccountsPayload
+"""
+
+GRAPHQL_NAME = re.compile(r"^[_a-zA-Z][_a-zA-Z0-9]*$")
+
+
+@lru_cache()
+def get_conflict_targets(sqla_model: TableProtocol) -> t.List[Constraint]:
+    """Constraints an upsert may conflict on, the primary key first"""
+    return [x for x in get_unique_constraints(sqla_model) if x.name is not None and GRAPHQL_NAME.match(x.name)]
+
+
+@lru_cache()
+def upsert_entrypoint_factory(sqla_model: TableProtocol, resolver) -> t.Dict[str, Field]:
+    """upsertAccount"""
+    relevant_type_name = Config.table_type_name_mapper(sqla_model)
+    name = f"upsert{relevant_type_name}"
+    args = {"input": NonNull(upsert_input_type_factory(sqla_model))}
+    payload = upsert_payload_factory(sqla_model)
+    return {
+        name: Field(
+            payload,
+            args=args,
+            resolve=resolver,
+            description=f"Creates a single {relevant_type_name}, or updates it if it conflicts with an existing row.",
+        )
+    }
+
+
+@lru_cache()
+def upsert_many_entrypoint_factory(sqla_model: TableProtocol, resolver) -> t.Dict[str, Field]:
+    """upsertManyAccounts"""
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    name = f"upsertMany{relevant_type_name}"
+    args = {"input": NonNull(upsert_many_input_type_factory(sqla_model))}
+    payload = upsert_many_payload_factory(sqla_model)
+    return {
+        name: Field(
+            payload,
+            args=args,
+            resolve=resolver,
+            description=f"Creates many {relevant_type_name}, updating those that conflict with existing rows.",
+        )
+    }
+
+
+@lru_cache()
+def conflict_target_factory(sqla_model: TableProtocol) -> EnumType:
+    """AccountConflictTarget"""
+    relevant_type_name = Config.table_type_name_mapper(sqla_model)
+    result_name = f"{relevant_type_name}ConflictTarget"
+
+    values = {
+        x.name: EnumValue(x.name, description=f"Columns: {', '.join(col.name for col in x.columns)}")
+        for x in get_conflict_targets(sqla_model)
+    }
+    return EnumType(
+        result_name, values, description=f"Unique constraints an upsert of {relevant_type_name} may conflict on."
+    )
+
+
+@lru_cache()
+def upsert_row_type_factory(sqla_model: TableProtocol) -> TableInputType:
+    """AccountUpsertInput"""
+    relevant_type_name = Config.table_type_name_mapper(sqla_model)
+    result_name = f"{relevant_type_name}UpsertInput"
+
+    attrs = {}
+    for column in get_columns(sqla_model):
+        # Primary keys may be provided to conflict on
+        if column.primary_key or not Config.exclude_create(column):
+            field_key = Config.column_name_mapper(column)
+            attrs[field_key] = convert_column_to_input(column)
+    return TableInputType(result_name, attrs, description=f"An input for upserts of {relevant_type_name}.")
+
+
+def on_conflict_field(sqla_model: TableProtocol) -> InputField:
+    return InputField(
+        conflict_target_factory(sqla_model),
+        default_value=get_conflict_targets(sqla_model)[0].name,
+        description="Constraint identifying an existing row to update. Defaults to the primary key",
+    )
+
+
+@lru_cache()
+def upsert_input_type_factory(sqla_model: TableProtocol) -> InputObjectType:
+    """UpsertAccountInput!"""
+    relevant_type_name = Config.table_type_name_mapper(sqla_model)
+    result_name = f"Upsert{relevant_type_name}Input"
+
+    input_object_name = Config.table_name_mapper(sqla_model)
+
+    attrs = {
+        "clientMutationId": String,
+        input_object_name: NonNull(upsert_row_type_factory(sqla_model)),
+        "onConflict": on_conflict_field(sqla_model),
+    }
+    return UpsertInputType(result_name, attrs, description=f"All input for the upsert {relevant_type_name} mutation.")
+
+
+@lru_cache()
+def upsert_many_input_type_factory(sqla_model: TableProtocol) -> InputObjectType:
+    """UpsertManyAccountsInput!"""
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    result_name = f"UpsertMany{relevant_type_name}Input"
+
+    input_object_name = to_plural(Config.table_name_mapper(sqla_model))
+
+    attrs = {
+        "clientMutationId": String,
+        input_object_name: NonNull(List(NonNull(upsert_row_type_factory(sqla_model)))),
+        "onConflict": on_conflict_field(sqla_model),
+    }
+    return UpsertManyInputType(
+        result_name, attrs, description=f"All input for the upsert many {relevant_type_name} mutation."
+    )
+
+
+@lru_cache()
+def upsert_payload_factory(sqla_model: TableProtocol) -> UpsertPayloadType:
+    """UpsertAccountPayload"""
+    from nebulo.gql.convert.table import table_factory
+
+    relevant_type_name = Config.table_type_name_mapper(sqla_model)
+    relevant_attr_name = Config.table_name_mapper(sqla_model)
+    result_name = f"Upsert{relevant_type_name}Payload"
+
+    attrs = {
+        "clientMutationId": Field(String, resolve=default_resolver),
+        "nodeId": ID,
+        relevant_attr_name: Field(
+            NonNull(table_factory(sqla_model)),
+            description=f"The {relevant_type_name} that was created or updated by this mutation.",
+            resolve=default_resolver,
+        ),
+    }
+
+    return UpsertPayloadType(
+        result_name, attrs, description=f"The output of our upsert {relevant_type_name} mutation", sqla_model=sqla_model
+    )
+
+
+@lru_cache()
+def upsert_many_payload_factory(sqla_model: TableProtocol) -> UpsertManyPayloadType:
+    """UpsertManyAccountsPayload"""
+    from nebulo.gql.convert.table import table_factory
+
+    relevant_type_name = to_plural(Config.table_type_name_mapper(sqla_model))
+    relevant_attr_name = to_plural(Config.table_name_mapper(sqla_model))
+    result_name = f"UpsertMany{relevant_type_name}Payload"
+
+    attrs = {
+        "clientMutationId": Field(String, resolve=default_resolver),
+        "nodeIds": Field(NonNull(List(NonNull(ID))), resolve=default_resolver),
+        relevant_attr_name: Field(
+            NonNull(List(NonNull(table_factory(sqla_model)))),
+            description=(
+                f"The {relevant_type_name} that were created or updated by this mutation, in input order."
+            ),
+            resolve=default_resolver,
+        ),
+    }
+
+    return UpsertManyPayloadType(
+        result_name,
+        attrs,
+        description=f"The output of our upsert many {relevant_type_name} mutation",
+        sqla_model=sqla_model,
+    )
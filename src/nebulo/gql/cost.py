@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import typing
+from dataclasses import asdict, dataclass
+
+from graphql import DocumentNode
+from graphql.utilities import get_operation_ast
+from nebulo.exceptions import QueryCostError
+from nebulo.gql.alias import ConnectionType, Schema, TableType
+from nebulo.gql.parse_info import ASTNode, parse_operation
+from nebulo.gql.resolve.transpile.query_builder import to_limit
+
+__all__ = ["QueryCost", "QueryCostLimits", "estimate_cost", "get_operation_cost"]
+
+
+@dataclass
+class QueryCost:
+    """Static estimate of the work an operation will do in the database
+
+    * **depth** = Deepest nesting of tables and connections
+    * **node_count** = Number of tables and connections selected, each is a subquery
+    * **estimated_rows** = Rows read, multiplying page sizes through each level of nesting
+    """
+
+    depth: int = 0
+    node_count: int = 0
+    estimated_rows: float = 0
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return asdict(self)
+
+
+class QueryCostLimits(typing.NamedTuple):
+    """Maximum allowed cost of an operation. None disables a limit"""
+
+    max_depth: typing.Optional[int] = None
+    max_node_count: typing.Optional[int] = None
+    max_estimated_rows: typing.Optional[float] = None
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether any limit is set"""
+        return any(limit is not None for limit in self)
+
+    def check(self, cost: QueryCost) -> None:
+        """Raise a QueryCostError if *cost* exceeds any limit"""
+        for value, limit, description in [
+            (cost.depth, self.max_depth, "depth"),
+            (cost.node_count, self.max_node_count, "number of tables and connections"),
+            (cost.estimated_rows, self.max_estimated_rows, "estimated number of rows"),
+        ]:
+            if limit is not None and value > limit:
+                raise QueryCostError(
+                    f"Query {description} of {value:g} exceeds the limit of {limit:g}. "
+                    "Reduce nesting or page sizes with first/last"
+                )
+
+
+def get_reltuples(sqla_model) -> typing.Optional[float]:
+    """Row estimate collected at reflection time, if available"""
+    return sqla_model.__table__.info.get("reltuples")
+
+
+def estimate_cost(tree: ASTNode, cost: typing.Optional[QueryCost] = None) -> QueryCost:
+    """Estimate the cost of the SQL the query builder will generate for *tree*
+
+    Connections multiply the rows read by all nested selections by their page size,
+    which is capped by the table's estimated row count. totalCount counts every row
+    in the table. Pass *cost* to accumulate the cost of multiple root fields
+    """
+    cost = cost if cost is not None else QueryCost()
+
+    def visit(tree: ASTNode, multiplier: float, depth: int) -> None:
+        return_type = tree.return_type
+
+        if isinstance(return_type, ConnectionType):
+            reltuples = get_reltuples(return_type.sqla_model)
+            page_size = to_limit(tree)
+            rows = min(page_size, reltuples) if reltuples is not None else page_size
+
+            cost.depth = max(cost.depth, depth)
+            cost.node_count += 1
+            cost.estimated_rows += multiplier * rows
+            if any(x.name == "totalCount" for x in tree.fields):
+                cost.estimated_rows += multiplier * (reltuples if reltuples is not None else rows)
+
+            for edges in [x for x in tree.fields if x.name == "edges"]:
+                for node in [x for x in edges.fields if x.name == "node"]:
+                    for subfield in node.fields:
+                        visit(subfield, multiplier * rows, depth + 1)
+
+        elif isinstance(return_type, TableType):
+            cost.depth = max(cost.depth, depth)
+            cost.node_count += 1
+            cost.estimated_rows += multiplier
+            for subfield in tree.fields:
+                visit(subfield, multiplier, depth + 1)
+
+        else:
+            # Scalars or containers e.g. mutation payloads
+            for subfield in tree.fields:
+                visit(subfield, multiplier, depth)
+
+    visit(tree, 1, 1)
+    return cost
+
+
+def get_operation_cost(
+    schema: Schema,
+    document: DocumentNode,
+    operation_name: typing.Optional[str],
+    variables: typing.Dict[str, typing.Any],
+) -> typing.Optional[QueryCost]:
+    """Estimate the cost of every root field of an operation
+
+    Returns None if the operation can not be parsed, e.g. due to invalid variables,
+    so the error is reported by the executor
+    """
+    operation = get_operation_ast(document, operation_name)
+    if operation is None:
+        return None
+
+    try:
+        trees = parse_operation(schema, document, operation, variables)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    cost = QueryCost()
+    for tree in trees:
+        estimate_cost(tree, cost)
+    return cost
@@ -3,12 +3,20 @@ from __future__ import annotations
 import typing
 from dataclasses import dataclass
 
+from graphql import OperationType
 from graphql.execution.execute import get_field_def
-from graphql.execution.values import get_argument_values
-from graphql.language import FieldNode, FragmentDefinitionNode, FragmentSpreadNode, InlineFragmentNode
+from graphql.execution.values import get_argument_values, get_variable_values
+from graphql.language import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+)
 from nebulo.gql.alias import Field, List, NonNull, ObjectType, ResolveInfo, Schema
 
-__all__ = ["parse_resolve_info"]
+__all__ = ["parse_resolve_info", "parse_operation"]
 
 
 def field_to_type(field):
@@ -151,3 +159,48 @@ def parse_resolve_info(info: ResolveInfo) -> ASTNode:
         fragments=fragments,
     )
     return parsed_info
+
+
+def parse_operation(
+    schema: Schema,
+    document: DocumentNode,
+    operation: OperationDefinitionNode,
+    raw_variable_values: typing.Dict[str, typing.Any],
+) -> typing.List[ASTNode]:
+    """Converts each root field of an operation into an ASTNode without
+    executing the operation
+
+    Raises a ValueError if the variables can not be coerced
+    """
+    fragments: typing.Dict[str, FragmentDefinitionNode] = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+
+    variable_values = get_variable_values(schema, operation.variable_definitions or [], raw_variable_values or {})
+    if isinstance(variable_values, list):
+        raise ValueError("Invalid variables")
+
+    def root_field_nodes(selection_set) -> typing.Generator[FieldNode, None, None]:
+        for selection in selection_set.selections:
+            if isinstance(selection, FragmentSpreadNode):
+                yield from root_field_nodes(fragments[selection.name.value].selection_set)
+            elif isinstance(selection, InlineFragmentNode):
+                yield from root_field_nodes(selection.selection_set)
+            elif not selection.name.value.startswith("__"):
+                yield selection
+
+    parent_type = schema.mutation_type if operation.operation == OperationType.MUTATION else schema.query_type
+    return [
+        ASTNode(
+            field_node,
+            parent_type.fields[field_node.name.value],
+            schema,
+            parent=None,
+            variable_values=variable_values,
+            parent_type=parent_type,
+            fragments=fragments,
+        )
+        for field_node in root_field_nodes(operation.selection_set)
+    ]
@@ -34,7 +34,10 @@ class CursorStructure(typing.NamedTuple):
         return cls.from_dict(contents)
 
 
-def serialize(value: typing.Union[CursorStructure, typing.Dict]):
+def serialize(value: typing.Union[CursorStructure, typing.Dict, str]):
+    # Already serialized by SQL e.g. to_serialized_node_id_sql
+    if isinstance(value, str):
+        return value
     node_id = CursorStructure.from_dict(value) if isinstance(value, dict) else value
     return node_id.serialize()
 
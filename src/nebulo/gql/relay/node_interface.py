@@ -6,8 +6,9 @@ import typing
 from nebulo.gql.alias import Field, InterfaceType, NonNull, ScalarType
 from nebulo.sql.inspect import get_primary_key_columns, get_table_name
 from nebulo.sql.statement_helpers import literal_string
-from nebulo.text_utils.base64 import from_base64, to_base64
-from sqlalchemy import func
+from nebulo.text_utils.base64 import from_base64, to_base64, to_base64_sql
+from sqlalchemy import Integer, String, Text, case, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.sql.selectable import Alias
 
 
@@ -33,7 +34,10 @@ class NodeIdStructure(typing.NamedTuple):
         return cls.from_dict(contents)
 
 
-def serialize(value: typing.Union[NodeIdStructure, typing.Dict]):
+def serialize(value: typing.Union[NodeIdStructure, typing.Dict, str]):
+    # Already serialized by SQL e.g. to_serialized_node_id_sql
+    if isinstance(value, str):
+        return value
     node_id = NodeIdStructure.from_dict(value) if isinstance(value, dict) else value
     return node_id.serialize()
 
@@ -57,6 +61,65 @@ def to_node_id_sql(sqla_model, query_elem: Alias):
     )
 
 
+def to_ascii_json_sql(json_text):
+    """Escape non-ASCII characters in JSON text as json.dumps does, e.g. 'é' -> '\\u00e9'
+
+    Characters outside the Basic Multilingual Plane are escaped as a UTF-16 surrogate pair
+    """
+    chars = (
+        func.regexp_split_to_table(json_text, literal_string(""))
+        .table_valued("c", with_ordinality="n")
+        .render_derived()
+    )
+    code = func.ascii(chars.c.c)
+    escape = literal_column("'\\u'")
+
+    def integer(value: int):
+        return literal_column(str(value), Integer())
+
+    # Offset of a supplementary character, split into the high and low 10 bits of its surrogates
+    offset = code - integer(0x10000)
+    escaped = case(
+        (code < integer(0x80), chars.c.c),
+        (code < integer(0x10000), escape.op("||")(func.lpad(func.to_hex(code), integer(4), literal_string("0")))),
+        else_=escape.op("||")(func.to_hex(integer(0xD800) + offset / integer(0x400)))
+        .op("||")(escape)
+        .op("||")(func.to_hex(integer(0xDC00) + func.mod(offset, integer(0x400)))),
+    )
+    return select([func.string_agg(escaped, aggregate_order_by(literal_string(""), chars.c.n))]).scalar_subquery()
+
+
+def to_serialized_node_id_sql(sqla_model, query_elem: Alias):
+    """SQL equivalent of NodeIdStructure.serialize
+
+    Produces the same base64 encoded text as serializing the result of to_node_id_sql in python,
+    including for primary key values with non-ASCII characters
+    """
+    table_name = get_table_name(sqla_model)
+
+    pkey_cols = get_primary_key_columns(sqla_model)
+
+    # Columns selected from query element
+    vals = []
+    for col in pkey_cols:
+        col_name = str(col.name)
+        vals.extend([literal_string(col_name), query_elem.c[col_name]])
+
+    # jsonb text uses the same separators as json.dumps, but does not escape non-ASCII characters,
+    # which only text columns may contain
+    values_text = cast(func.jsonb_build_object(*vals), Text())
+    if any(isinstance(col.type, String) for col in pkey_cols):
+        values_text = to_ascii_json_sql(values_text)
+
+    # Matches the output of json.dumps(NodeIdStructure.to_dict())
+    node_id_text = (
+        literal_string(f'{{"table_name": "{table_name}", "values": ')
+        .op("||")(values_text)
+        .op("||")(literal_string("}"))
+    )
+    return to_base64_sql(node_id_text)
+
+
 ID = ScalarType(
     "ID",
     description="Unique ID for node",
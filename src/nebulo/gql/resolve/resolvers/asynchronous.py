@@ -4,14 +4,30 @@ import typing
 
 from flupy import flu
 from nebulo.config import Config
-from nebulo.gql.alias import FunctionPayloadType, MutationPayloadType, ObjectType, ResolveInfo, ScalarType
+from nebulo.gql.alias import (
+    BulkMutationPayloadType,
+    FunctionPayloadType,
+    MutationPayloadType,
+    ObjectType,
+    ResolveInfo,
+    ScalarType,
+    UpdateManyPayloadType,
+)
 from nebulo.gql.parse_info import parse_resolve_info
-from nebulo.gql.relay.node_interface import NodeIdStructure, to_node_id_sql
-from nebulo.gql.resolve.resolvers.claims import build_claims
-from nebulo.gql.resolve.transpile.mutation_builder import build_mutation
-from nebulo.gql.resolve.transpile.query_builder import sql_builder, sql_finalize
+from nebulo.gql.relay.node_interface import NodeIdStructure
+from nebulo.gql.resolve.resolvers.transaction import begin
+from nebulo.gql.resolve.transpile.mutation_builder import (
+    build_bulk_mutation,
+    build_function_with_readback,
+    build_mutation_with_readback,
+)
+from nebulo.gql.resolve.transpile.plan_cache import get_statement
+from nebulo.gql.resolve.transpile.query_builder import sql_builder, sql_finalize, to_strategy
+from nebulo.gql.resolve.transpile.text_builder import to_operation_text, use_text_builder
+from nebulo.sql.inspect import get_primary_key_columns
 from nebulo.sql.table_base import TableProtocol
-from sqlalchemy import literal_column, select
+from nebulo.text_utils import to_plural
+from sqlalchemy import select
 
 
 async def async_resolver(_, info: ResolveInfo, **kwargs) -> typing.Any:
@@ -21,18 +37,25 @@ async def async_resolver(_, info: ResolveInfo, **kwargs) -> typing.Any:
         info.context['engine'] to contain an sqlalchemy.ext.asyncio.AsyncEngine
     """
     context = info.context
-    engine = context["engine"]
-    default_role = context["default_role"]
-    jwt_claims = context["jwt_claims"]
+
+    # The statement fetching every root field together failed. Report its error for each root field
+    # rather than executing them again
+    prefetch_error = context.get("prefetch_error")
+    if prefetch_error is not None and info.path.prev is None:
+        raise prefetch_error
+
+    # Root fields fetched together by prefetch_root_fields
+    prefetched = context.get("prefetched")
+    if prefetched is not None and info.path.key in prefetched:
+        context["result"] = prefetched
+        return prefetched[info.path.key]
 
     tree = parse_resolve_info(info)
 
-    async with engine.begin() as trans:
-        # Set claims for transaction
-        if jwt_claims or default_role:
-            claims_stmt = build_claims(jwt_claims, default_role)
-            await trans.execute(claims_stmt)
+    # Queries return only json, so they may be executed on the native backend
+    is_query = not isinstance(tree.return_type, (FunctionPayloadType, BulkMutationPayloadType, MutationPayloadType))
 
+    async with begin(context, native=is_query) as trans:
         result: typing.Dict[str, typing.Any]
 
         if isinstance(tree.return_type, FunctionPayloadType):
@@ -42,25 +65,11 @@ async def async_resolver(_, info: ResolveInfo, **kwargs) -> typing.Any:
 
             # Function returning table row
             if isinstance(sql_function.return_sqla_type, TableProtocol):
-                # Unpack the table row to columns
-                return_sqla_model = sql_function.return_sqla_type
-                core_table = return_sqla_model.__table__
-                func_alias = func_call.alias("named_alias")
-                stmt = select([literal_column(c.name).label(c.name) for c in core_table.c]).select_from(func_alias)  # type: ignore
-                stmt_alias = stmt.alias()
-                node_id_stmt = select([to_node_id_sql(return_sqla_model, stmt_alias).label("nodeId")]).select_from(stmt_alias)  # type: ignore
-                ((row,),) = await trans.execute(node_id_stmt)
-                node_id = NodeIdStructure.from_dict(row)
-
-                # Add nodeId to AST and query
+                # Call the function and read back its row in one statement
                 query_tree = next(iter([x for x in tree.fields if x.name == "result"]), None)
-                if query_tree is not None:
-                    query_tree.args["nodeId"] = node_id
-                    base_query = sql_builder(query_tree)
-                    query = sql_finalize(query_tree.alias, base_query)
-                    ((stmt_result,),) = await trans.execute(query)
-                else:
-                    stmt_result = {}
+                stmt = build_function_with_readback(func_call, sql_function.return_sqla_type, query_tree)
+                ((row_json,),) = await trans.execute(stmt)
+                stmt_result = {query_tree.alias: row_json} if query_tree is not None else {}
             else:
                 stmt = select([func_call.label("result")])
                 (stmt_result,) = await trans.execute(stmt)
@@ -72,9 +81,61 @@ async def async_resolver(_, info: ResolveInfo, **kwargs) -> typing.Any:
             )
             result = {tree.alias: {**stmt_result, **{mutation_id_alias: maybe_mutation_id}}}
 
+        elif isinstance(tree.return_type, BulkMutationPayloadType):
+            output_rows_name = to_plural(Config.table_name_mapper(tree.return_type.sqla_model))
+            query_tree = next(iter([x for x in tree.fields if x.name == output_rows_name]), None)
+            pkey_names = [str(col.name) for col in get_primary_key_columns(tree.return_type.sqla_model)]
+            node_ids: typing.List[NodeIdStructure] = []
+            rows: typing.List[typing.Any] = []
+            order_keys: typing.List[typing.Any] = []
+            # One statement per chunk of rows, all in the same transaction
+            for stmt, indices in build_bulk_mutation(tree, query_tree, Config.BULK_MUTATION_CHUNK_SIZE):
+                ((chunk_ordinals, chunk_node_ids, chunk_rows),) = await trans.execute(stmt)
+                chunk_node_ids = [NodeIdStructure.from_dict(x) for x in chunk_node_ids]
+                node_ids.extend(chunk_node_ids)
+                rows.extend(chunk_rows)
+                # Rows are returned in input order, or by primary key when there is none, as for deletes
+                if indices is not None:
+                    order_keys.extend(indices[x - 1] for x in chunk_ordinals)
+                else:
+                    order_keys.extend([x.values[name] for name in pkey_names] for x in chunk_node_ids)
+
+            if isinstance(tree.return_type, UpdateManyPayloadType):
+                # As for updateX, a nodeId without a row fails the mutation and its transaction is rolled back
+                updated_keys = {tuple(x.values[name] for name in pkey_names) for x in node_ids}
+                missing = [
+                    patch["nodeId"].serialize()
+                    for patch in tree.args["input"][output_rows_name]
+                    if tuple(patch["nodeId"].values[name] for name in pkey_names) not in updated_keys
+                ]
+                if missing:
+                    raise Exception(f"No rows found for nodeIds {', '.join(missing)}")
+
+            # Merge the statements' rows, each ordered within its chunk
+            order = sorted(range(len(node_ids)), key=lambda ix: order_keys[ix])
+            node_ids = [node_ids[ix] for ix in order]
+            rows = [rows[ix] for ix in order] if query_tree else rows
+
+            maybe_mutation_id = tree.args["input"].get("clientMutationId")
+            mutation_id_alias = next(
+                iter([x.alias for x in tree.fields if x.name == "clientMutationId"]),
+                "clientMutationId",
+            )
+            node_ids_alias = next(iter([x.alias for x in tree.fields if x.name == "nodeIds"]), "nodeIds")
+            result = {
+                tree.alias: {
+                    mutation_id_alias: maybe_mutation_id,
+                    node_ids_alias: node_ids,
+                    **({query_tree.alias: rows} if query_tree else {}),
+                }
+            }
+
         elif isinstance(tree.return_type, MutationPayloadType):
-            stmt = build_mutation(tree)
-            ((row,),) = await trans.execute(stmt)
+            output_row_name: str = Config.table_name_mapper(tree.return_type.sqla_model)
+            query_tree = next(iter([x for x in tree.fields if x.name == output_row_name]), None)
+            # Write the row and read it back in one statement
+            stmt = build_mutation_with_readback(tree, query_tree)
+            ((row, row_json),) = await trans.execute(stmt)
             node_id = NodeIdStructure.from_dict(row)
 
             maybe_mutation_id = tree.args["input"].get("clientMutationId")
@@ -83,25 +144,26 @@ async def async_resolver(_, info: ResolveInfo, **kwargs) -> typing.Any:
                 "clientMutationId",
             )
             node_id_alias = next(iter([x.alias for x in tree.fields if x.name == "nodeId"]), "nodeId")
-            output_row_name: str = Config.table_name_mapper(tree.return_type.sqla_model)
-            query_tree = next(iter([x for x in tree.fields if x.name == output_row_name]), None)
-            sql_result = {}
-            if query_tree:
-                # Set the nodeid of the newly created record as an arg
-                query_tree.args["nodeId"] = node_id
-                base_query = sql_builder(query_tree)
-                query = sql_finalize(query_tree.alias, base_query)
-                ((sql_result,),) = await trans.execute(query)
+            sql_result = {query_tree.alias: row_json} if query_tree else {}
             result = {
-                tree.alias: {**sql_result, mutation_id_alias: maybe_mutation_id},
+                tree.alias: {**sql_result, mutation_id_alias: maybe_mutation_id, node_id_alias: node_id},
                 mutation_id_alias: maybe_mutation_id,
                 node_id_alias: node_id,
             }
 
         elif isinstance(tree.return_type, (ObjectType, ScalarType)):
-            base_query = sql_builder(tree)
-            query = sql_finalize(tree.name, base_query)
-            ((query_json_result,),) = await trans.execute(query)
+            strategy = to_strategy(context.get("relationship_strategy"))
+            if use_text_builder([tree], strategy):
+                text_query = to_operation_text([tree], as_text=False)
+                ((query_json_result,),) = await trans.exec_driver_sql(text_query.sql, text_query.params)
+            else:
+                query, params = get_statement(
+                    context,
+                    f"field_{strategy}",
+                    [tree],
+                    lambda: sql_finalize(tree.alias, sql_builder(tree, strategy=strategy)),
+                )
+                ((query_json_result,),) = await trans.execute(query, params)
 
             if isinstance(tree.return_type, ScalarType):
                 # If its a scalar, unwrap the top level name
@@ -114,4 +176,5 @@ async def async_resolver(_, info: ResolveInfo, **kwargs) -> typing.Any:
 
     # Stash result on context to enable dumb resolvers to not fail
     context["result"] = result
-    return result
+    # Child fields are resolved from the value returned for this field
+    return result if isinstance(tree.return_type, ScalarType) else result[tree.alias]
@@ -1,6 +1,7 @@
 import typing
 
 from sqlalchemy import Text, func, literal, select
+from sqlalchemy.engine import Dialect
 from sqlalchemy.sql.selectable import Select
 
 
@@ -42,3 +43,35 @@ def build_claims(jwt_claims: typing.Dict[str, typing.Any], default_role: typing.
             )
 
     return select(claims)
+
+
+def to_transaction_modes(read_only: bool = False, snapshot: bool = False) -> str:
+    """Transaction modes for BEGIN or SET TRANSACTION
+
+    A *snapshot* transaction is REPEATABLE READ and READ ONLY so all of its statements see the same data
+    """
+    if snapshot:
+        return "isolation level repeatable read, read only"
+    return "read only" if read_only else ""
+
+
+def to_begin_script(
+    dialect: Dialect,
+    jwt_claims: typing.Dict[str, typing.Any],
+    default_role: typing.Optional[str],
+    read_only: bool = False,
+    snapshot: bool = False,
+) -> str:
+    """Render BEGIN and the claims statement as a single script
+
+    The script is sent to the driver as is, so it must not be escaped for the dialect's paramstyle
+    """
+    statements = [" ".join(["begin", to_transaction_modes(read_only, snapshot)]).strip()]
+    if jwt_claims or default_role:
+        claims_stmt = build_claims(jwt_claims, default_role)
+        claims_sql = str(claims_stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+        if dialect.identifier_preparer._double_percents:  # pylint: disable=protected-access
+            # Undo the escaping of '%' in literals for format paramstyles, as the DBAPI cursor would
+            claims_sql = claims_sql % ()
+        statements.append(claims_sql)
+    return "; ".join(statements)
@@ -4,16 +4,32 @@ from graphql.pyutils import Path
 from nebulo.gql.alias import ResolveInfo
 
 
-def default_resolver(_, info: ResolveInfo, **kwargs) -> typing.Any:
-    """Expects the final, complete result to exist in context['result']
-    and uses the current path to retrieve and return the expected result for
-    the current location in the query
+def default_resolver(parent: typing.Any, info: ResolveInfo, **kwargs) -> typing.Any:
+    """Resolves a field from its parent's value
+
+    Root resolvers return the JSON built by PostgreSQL for their field, keyed by
+    response key, so each field is a single lookup on the value of its parent
+
+    Falls back to resolve_from_path if the parent's value does not hold the field
+    e.g. when a custom root resolver only stashes its result on the context
 
     Why TF would you do this?
     - To avoid writing a custom executor
     - To keep the resolver tree extensible for end users
     - To keep everything as default as possible
     """
+    if isinstance(parent, dict):
+        key = info.path.key
+        if key in parent:
+            return parent[key]
+    return resolve_from_path(info)
+
+
+def resolve_from_path(info: ResolveInfo) -> typing.Any:
+    """Expects the final, complete result to exist in context['result']
+    and uses the current path to retrieve and return the expected result for
+    the current location in the query
+    """
     path: Path = info.path
     context = info.context
     final_result = context["result"]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import typing
+from contextlib import asynccontextmanager
+
+import asyncpg
+from nebulo.gql.resolve.resolvers.claims import build_claims, to_begin_script
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.compiler import Compiled
+from sqlalchemy.sql.expression import Executable
+
+__all__ = ["NativeBackend", "NativeConnection", "begin_native"]
+
+
+def to_json_text(value: typing.Any) -> str:
+    """Encode a json/jsonb parameter. Values bound through SQLAlchemy are already serialized"""
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+async def init_connection(connection: asyncpg.Connection) -> None:
+    """Decode json and jsonb once per pooled connection, rather than per statement"""
+    for type_name in ["json", "jsonb"]:
+        await connection.set_type_codec(
+            type_name, encoder=to_json_text, decoder=json.loads, schema="pg_catalog", format="text"
+        )
+
+
+def to_native_sql(sql: str, count: int) -> str:
+    """Replace the %s placeholders of the asyncpg dialect with asyncpg's $1, $2, ..."""
+    return sql % tuple(f"${ix}" for ix in range(1, count + 1))
+
+
+class NativeConnection:
+    """An asyncpg connection executing statements compiled by SQLAlchemy
+
+    Exposes the subset of AsyncConnection used by query resolvers. Rows are asyncpg Records,
+    which unpack like SQLAlchemy rows. asyncpg prepares each statement with the extended query
+    protocol, transfers values in binary and caches the prepared statement on the connection.
+    No result processors are applied, so statements must return json, jsonb or text
+    """
+
+    def __init__(self, connection: asyncpg.Connection, dialect: Dialect):
+        self.connection = connection
+        self.dialect = dialect
+
+    async def execute(
+        self,
+        statement: typing.Union[Executable, Compiled],
+        parameters: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    ) -> typing.List[asyncpg.Record]:
+        compiled = statement if isinstance(statement, Compiled) else statement.compile(dialect=self.dialect)
+        params = compiled.construct_params(parameters)
+        processors = compiled._bind_processors  # pylint: disable=protected-access
+        args = [processors[name](params[name]) if name in processors else params[name] for name in compiled.positiontup]
+        return await self.connection.fetch(to_native_sql(compiled.string, len(args)), *args)
+
+    async def exec_driver_sql(
+        self, sql: str, parameters: typing.Sequence[typing.Any] = ()
+    ) -> typing.List[asyncpg.Record]:
+        return await self.connection.fetch(to_native_sql(sql, len(parameters)), *parameters)
+
+
+class NativeBackend:
+    """asyncpg pools, one per engine, for executing query statements without SQLAlchemy's
+    connection pool and DBAPI adaption
+
+    Pools connect to the same databases as the engines they are created for, and are opened by
+    start(). Each pooled connection is initialized with json and jsonb codecs when it connects
+    """
+
+    def __init__(
+        self,
+        engines: typing.List[AsyncEngine],
+        min_size: int = 5,
+        max_size: int = 15,
+        timeout: float = 30,
+        statement_cache_size: int = 100,
+        command_timeout: typing.Optional[float] = None,
+    ):
+        self.engines = engines
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.statement_cache_size = statement_cache_size
+        self.command_timeout = command_timeout
+        self._pools: typing.Dict[AsyncEngine, asyncpg.Pool] = {}
+
+    async def start(self) -> None:
+        """Open a pool for each engine"""
+        for engine in self.engines:
+            self._pools[engine] = await asyncpg.create_pool(
+                engine.url.set(drivername="postgresql").render_as_string(hide_password=False),
+                min_size=self.min_size,
+                max_size=self.max_size,
+                statement_cache_size=self.statement_cache_size,
+                command_timeout=self.command_timeout,
+                init=init_connection,
+            )
+
+    async def stop(self) -> None:
+        for pool in self._pools.values():
+            await pool.close()
+        self._pools.clear()
+
+    def get_pool(self, engine: AsyncEngine) -> typing.Optional[asyncpg.Pool]:
+        """Pool connecting to the database of *engine*, or None before start()"""
+        return self._pools.get(engine)
+
+
+@asynccontextmanager
+async def begin_native(
+    pool: asyncpg.Pool,
+    dialect: Dialect,
+    jwt_claims: typing.Dict[str, typing.Any],
+    default_role: typing.Optional[str],
+    read_only: bool = False,
+    fold_claims: bool = False,
+    timeout: typing.Optional[float] = None,
+    snapshot: bool = False,
+) -> typing.AsyncIterator[NativeConnection]:
+    """Yield a pooled asyncpg connection with an open transaction and claims set
+
+    Claims are set exactly as with begin: as a statement of their own, or sent with BEGIN
+    in one round trip when *fold_claims* is enabled. A *snapshot* transaction is REPEATABLE READ READ ONLY
+    """
+    async with pool.acquire(timeout=timeout) as driver_connection:
+        connection = NativeConnection(driver_connection, dialect)
+
+        if fold_claims:
+            try:
+                await driver_connection.execute(to_begin_script(dialect, jwt_claims, default_role, read_only, snapshot))
+                yield connection
+            except BaseException:
+                if driver_connection.is_in_transaction():
+                    await driver_connection.execute("rollback")
+                raise
+            await driver_connection.execute("commit")
+            return
+
+        isolation = "repeatable_read" if snapshot else None
+        async with driver_connection.transaction(isolation=isolation, readonly=read_only or snapshot):
+            if jwt_claims or default_role:
+                await connection.execute(build_claims(jwt_claims, default_role))
+            yield connection
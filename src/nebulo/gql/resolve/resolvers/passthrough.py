@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import typing
+from contextlib import AsyncExitStack
+
+from graphql import DocumentNode, OperationType
+from graphql.language import FieldNode, FragmentDefinitionNode, FragmentSpreadNode, InlineFragmentNode, SelectionSetNode
+from graphql.utilities import get_operation_ast
+from nebulo.gql.alias import ConnectionType, EnumType, ScalarType, Schema, String, TableType
+from nebulo.gql.convert.column import convert_type
+from nebulo.gql.parse_info import ASTNode, parse_operation
+from nebulo.gql.relay.node_interface import ID
+from nebulo.gql.resolve.resolvers.transaction import begin
+from nebulo.gql.resolve.transpile.plan_cache import get_statement
+from nebulo.gql.resolve.transpile.query_builder import (
+    connection_block,
+    field_name_to_column,
+    sql_connection_edges,
+    sql_finalize_operation,
+    to_strategy,
+)
+from nebulo.gql.resolve.transpile.text_builder import to_operation_text, use_text_builder
+from sqlalchemy import Column, Text, cast, select, types
+from sqlalchemy.dialects import postgresql
+
+__all__ = ["execute_passthrough", "stream_passthrough"]
+
+logger = logging.getLogger(__name__)
+
+
+def to_extensions_suffix(extensions: typing.Optional[typing.Dict[str, typing.Any]]) -> bytes:
+    """Response extensions to append to a serialized body, if any"""
+    if not extensions:
+        return b""
+    return b',"extensions":' + json.dumps(extensions, separators=(",", ":")).encode("utf-8")
+
+
+def is_passthrough_column(column: Column) -> bool:
+    """Check if Postgres' JSON encoding of the column matches the GraphQL serialization
+
+    Columns of unmapped types (e.g. json, smallint) are served as strings by the executor so they are excluded
+    """
+    sqla_type = column.type
+    while isinstance(sqla_type, postgresql.ARRAY):
+        sqla_type = sqla_type.item_type
+    if convert_type(sqla_type) is String:
+        return isinstance(sqla_type, types.String)
+    return True
+
+
+def is_passthrough_selection_set(
+    selection_set: SelectionSetNode, fragments: typing.Dict[str, FragmentDefinitionNode]
+) -> bool:
+    """Check a selection set for directives, introspection and response keys selected more than once,
+    none of which are handled by the query builder"""
+    response_keys: typing.Set[str] = set()
+
+    def check(selection_set: SelectionSetNode) -> bool:
+        for selection in selection_set.selections:
+            if selection.directives:
+                return False
+
+            if isinstance(selection, FragmentSpreadNode):
+                fragment = fragments.get(selection.name.value)
+                if fragment is None or fragment.directives or not check(fragment.selection_set):
+                    return False
+
+            elif isinstance(selection, InlineFragmentNode):
+                if not check(selection.selection_set):
+                    return False
+
+            elif isinstance(selection, FieldNode):
+                if selection.name.value.startswith("__"):
+                    return False
+                response_key = (selection.alias or selection.name).value
+                if response_key in response_keys:
+                    return False
+                response_keys.add(response_key)
+                if selection.selection_set is not None and not is_passthrough_selection_set(
+                    selection.selection_set, fragments
+                ):
+                    return False
+        return True
+
+    return check(selection_set)
+
+
+def is_passthrough_tree(tree: ASTNode) -> bool:
+    """Check if the SQL built for *tree* produces the same JSON the executor would"""
+    return_type = tree.return_type
+
+    if isinstance(return_type, ConnectionType):
+        for edges in [x for x in tree.fields if x.name == "edges"]:
+            for node in [x for x in edges.fields if x.name == "node"]:
+                if not is_passthrough_tree(node):
+                    return False
+        return True
+
+    if isinstance(return_type, TableType):
+        for subfield in tree.fields:
+            if subfield.return_type == ID:
+                continue
+            if isinstance(subfield.return_type, (TableType, ConnectionType)):
+                if not is_passthrough_tree(subfield):
+                    return False
+            elif isinstance(subfield.return_type, (ScalarType, EnumType)):
+                column = field_name_to_column(return_type.sqla_model, subfield.name)
+                if not is_passthrough_column(column):
+                    return False
+            else:
+                return False
+        return True
+
+    return False
+
+
+def to_passthrough_trees(
+    schema: Schema,
+    document: DocumentNode,
+    operation_name: typing.Optional[str],
+    variables: typing.Dict[str, typing.Any],
+) -> typing.Optional[typing.List[ASTNode]]:
+    """Parse the operation's root fields if the whole response can be built by Postgres, otherwise None"""
+    operation = get_operation_ast(document, operation_name)
+    if operation is None or operation.operation != OperationType.QUERY or operation.directives:
+        return None
+
+    if not all(isinstance(x, FieldNode) for x in operation.selection_set.selections):
+        return None
+
+    fragments = {x.name.value: x for x in document.definitions if isinstance(x, FragmentDefinitionNode)}
+    if not is_passthrough_selection_set(operation.selection_set, fragments):
+        return None
+
+    trees = parse_operation(schema, document, operation, variables)
+    if not all(
+        isinstance(tree.return_type, (TableType, ConnectionType)) and is_passthrough_tree(tree) for tree in trees
+    ):
+        return None
+    return trees
+
+
+def parse_passthrough_trees(
+    schema: Schema,
+    document: DocumentNode,
+    operation_name: typing.Optional[str],
+    variables: typing.Dict[str, typing.Any],
+) -> typing.Optional[typing.List[ASTNode]]:
+    """to_passthrough_trees, or None if the operation can not be parsed, e.g. for a malformed cursor,
+    so the executor reports the error"""
+    try:
+        return to_passthrough_trees(schema, document, operation_name, variables)
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Operation is not eligible for passthrough", exc_info=True)
+        return None
+
+
+async def execute_passthrough(
+    schema: Schema,
+    document: DocumentNode,
+    operation_name: typing.Optional[str],
+    variables: typing.Dict[str, typing.Any],
+    context: typing.Dict[str, typing.Any],
+    extensions: typing.Optional[typing.Dict[str, typing.Any]] = None,
+) -> typing.Optional[bytes]:
+    """Execute a query operation as a single SQL statement and return the response body
+    exactly as Postgres serialized it, skipping the GraphQL executor
+
+    Returns None if the operation is not eligible or fails, in which case it should be
+    executed normally so errors are reported by the executor. When the statement fails, its
+    error is stored in context['prefetch_error'] and reported for each root field without
+    executing them again
+    """
+    if context.get("prefetch_error") is not None:
+        return None
+    trees = parse_passthrough_trees(schema, document, operation_name, variables)
+    if trees is None:
+        return None
+
+    try:
+        strategy = to_strategy(context.get("relationship_strategy"))
+        if use_text_builder(trees, strategy):
+            text_query = to_operation_text(trees)
+            async with begin(context, native=True) as trans:
+                ((data,),) = await trans.exec_driver_sql(text_query.sql, text_query.params)
+        else:
+            query, params = get_statement(
+                context, f"operation_text_{strategy}", trees, lambda: sql_finalize_operation(trees, strategy=strategy)
+            )
+            async with begin(context, native=True) as trans:
+                ((data,),) = await trans.execute(query, params)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.warning("Passthrough statement failed", exc_info=True)
+        context["prefetch_error"] = error
+        return None
+
+    return b'{"data":' + data.encode("utf-8") + b',"errors":[]' + to_extensions_suffix(extensions) + b"}"
+
+
+async def stream_passthrough(
+    schema: Schema,
+    document: DocumentNode,
+    operation_name: typing.Optional[str],
+    variables: typing.Dict[str, typing.Any],
+    context: typing.Dict[str, typing.Any],
+    extensions: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    chunk_size: int = 64 * 1024,
+) -> typing.Optional[typing.AsyncIterator[bytes]]:
+    """Execute a query operation selecting a single connection and return the response body
+    as an async iterator, writing edges as they are read from a server-side cursor
+
+    The envelope and the edges are read by separate statements in one REPEATABLE READ transaction,
+    so totalCount and pageInfo agree with the edges. The transaction stays open until the iterator
+    is exhausted or closed. Returns None if the operation is not eligible or fails before any output
+    is produced. A failure after the response has started ends the body with the error
+    """
+    trees = parse_passthrough_trees(schema, document, operation_name, variables)
+    if trees is None or len(trees) != 1:
+        return None
+    tree = trees[0]
+    edges_field = next(iter([x for x in tree.fields if x.name == "edges"]), None)
+    if not isinstance(tree.return_type, ConnectionType) or edges_field is None:
+        return None
+
+    stack = AsyncExitStack()
+    try:
+        trans = await stack.enter_async_context(begin(context, snapshot=True))
+        strategy = to_strategy(context.get("relationship_strategy"))
+        # totalCount and pageInfo. Without them the envelope block selects a row per edge
+        envelope = "{}"
+        if any(x is not edges_field for x in tree.fields):
+            envelope_block = connection_block(tree, None, include_edges=False, strategy=strategy)
+            ((envelope,),) = await trans.execute(select([cast(envelope_block.c.ret_json, Text())]))
+        edges = await trans.stream(sql_connection_edges(tree, strategy))
+    except Exception as error:  # pylint: disable=broad-except
+        await stack.__aexit__(*sys.exc_info())
+        logger.warning("Streaming %s failed", tree.alias, exc_info=True)
+        context["prefetch_error"] = error
+        return None
+
+    # e.g. '{"totalCount": 3}' -> '{"totalCount": 3, "edges":['
+    envelope = envelope[:-1] + (", " if envelope != "{}" else "")
+    prefix = f'{{"data":{{"{tree.alias}":{envelope}"{edges_field.alias}":['
+
+    async def body() -> typing.AsyncIterator[bytes]:
+        buffer = [prefix.encode("utf-8")]
+        buffer_size = 0
+        try:
+            async with stack:
+                separator = b""
+                async for (edge,) in edges:
+                    chunk = separator + edge.encode("utf-8")
+                    separator = b","
+                    buffer.append(chunk)
+                    buffer_size += len(chunk)
+                    if buffer_size >= chunk_size:
+                        yield b"".join(buffer)
+                        buffer, buffer_size = [], 0
+        except Exception as error:  # pylint: disable=broad-except
+            # A 200 status and part of the body have been sent. Complete the document with the error
+            # so clients do not take the edges sent so far for the whole connection
+            logger.exception("Streaming %s failed", tree.alias)
+            errors = [{"message": str(error), "path": [tree.alias, edges_field.alias]}]
+            buffer.append(
+                b']}},"errors":' + json.dumps(errors).encode("utf-8") + to_extensions_suffix(extensions) + b"}"
+            )
+            yield b"".join(buffer)
+            return
+        buffer.append(b']}},"errors":[]' + to_extensions_suffix(extensions) + b"}")
+        yield b"".join(buffer)
+
+    return body()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import logging
+import typing
+
+from graphql import DocumentNode, OperationType
+from graphql.language import FieldNode
+from graphql.utilities import get_operation_ast
+from nebulo.gql.alias import ConnectionType, Schema, TableType
+from nebulo.gql.parse_info import ASTNode, parse_operation
+from nebulo.gql.resolve.resolvers.transaction import begin
+from nebulo.gql.resolve.transpile.plan_cache import get_statement
+from nebulo.gql.resolve.transpile.query_builder import sql_finalize_operation, to_strategy
+from nebulo.gql.resolve.transpile.text_builder import to_operation_text, use_text_builder
+
+__all__ = ["prefetch_root_fields"]
+
+logger = logging.getLogger(__name__)
+
+
+def to_prefetch_trees(
+    schema: Schema,
+    document: DocumentNode,
+    operation_name: typing.Optional[str],
+    variables: typing.Dict[str, typing.Any],
+) -> typing.Optional[typing.List[ASTNode]]:
+    """Parse the root fields of a query operation selecting more than one table, connection
+    or function, otherwise None"""
+    operation = get_operation_ast(document, operation_name)
+    if operation is None or operation.operation != OperationType.QUERY or operation.directives:
+        return None
+
+    response_keys: typing.Set[str] = set()
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, FieldNode) or selection.directives:
+            return None
+        if selection.name.value.startswith("__"):
+            continue
+        response_key = (selection.alias or selection.name).value
+        if response_key in response_keys:
+            return None
+        response_keys.add(response_key)
+
+    if len(response_keys) < 2:
+        return None
+
+    trees = parse_operation(schema, document, operation, variables)
+    for tree in trees:
+        if not isinstance(tree.return_type, (TableType, ConnectionType)) and not hasattr(
+            tree.return_type, "sql_function"
+        ):
+            return None
+    return trees
+
+
+async def prefetch_root_fields(
+    schema: Schema,
+    document: DocumentNode,
+    operation_name: typing.Optional[str],
+    variables: typing.Dict[str, typing.Any],
+    context: typing.Dict[str, typing.Any],
+) -> bool:
+    """Fetch every root field of a query operation with one statement in one transaction
+
+    The result, keyed by response key, is stored in context['prefetched'] for async_resolver
+    to serve root fields from. Returns False if the operation is not eligible or the statement
+    fails, in which case each root field is resolved separately so errors are reported per field
+
+    If the transaction can not be started, e.g. the connection or claims fail, resolving each root
+    field would fail the same way. The error is stored in context['prefetch_error'] and reported
+    for each root field instead
+    """
+    # A passthrough statement for the same root fields already failed
+    if context.get("prefetch_error") is not None:
+        return False
+    try:
+        trees = to_prefetch_trees(schema, document, operation_name, variables)
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Operation is not eligible for prefetching", exc_info=True)
+        return False
+    if trees is None:
+        return False
+
+    started = False
+    try:
+        strategy = to_strategy(context.get("relationship_strategy"))
+        if use_text_builder(trees, strategy):
+            text_query = to_operation_text(trees, as_text=False)
+            async with begin(context, native=True) as trans:
+                started = True
+                ((data,),) = await trans.exec_driver_sql(text_query.sql, text_query.params)
+        else:
+            query, params = get_statement(
+                context,
+                f"operation_{strategy}",
+                trees,
+                lambda: sql_finalize_operation(trees, as_text=False, strategy=strategy),
+            )
+            async with begin(context, native=True) as trans:
+                started = True
+                ((data,),) = await trans.execute(query, params)
+    except Exception as error:  # pylint: disable=broad-except
+        if not started:
+            logger.warning("Prefetch transaction failed", exc_info=True)
+            context["prefetch_error"] = error
+            return False
+        logger.info("Prefetch statement failed, resolving root fields separately", exc_info=True)
+        return False
+
+    context["prefetched"] = data
+    return True
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import typing
+from contextlib import asynccontextmanager
+
+from nebulo.gql.resolve.resolvers.claims import build_claims, to_begin_script, to_transaction_modes
+from nebulo.gql.resolve.resolvers.native import NativeBackend, NativeConnection, begin_native
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+__all__ = ["SharedTransaction", "begin", "begin_with_claims", "shared_transaction"]
+
+
+class SharedTransaction:
+    """An open transaction, with claims already set, shared by every
+    operation in a batched request
+
+    Statements are serialized with a lock because a single connection
+    can not execute concurrently
+    """
+
+    def __init__(self, connection: AsyncConnection):
+        self.connection = connection
+        self.lock = asyncio.Lock()
+
+
+async def set_claims(
+    connection: AsyncConnection, jwt_claims: typing.Dict[str, typing.Any], default_role: typing.Optional[str]
+) -> None:
+    """Set claims and role for the current transaction"""
+    if jwt_claims or default_role:
+        claims_stmt = build_claims(jwt_claims, default_role)
+        await connection.execute(claims_stmt)
+
+
+@asynccontextmanager
+async def begin_with_claims(
+    engine: AsyncEngine,
+    jwt_claims: typing.Dict[str, typing.Any],
+    default_role: typing.Optional[str],
+    read_only: bool = False,
+    snapshot: bool = False,
+) -> typing.AsyncIterator[AsyncConnection]:
+    """Yield a connection with an open transaction and claims set, sending BEGIN and
+    the claims in one round trip
+
+    asyncpg sends a statement without parameters using the simple query protocol, which
+    accepts several statements at once. SQLAlchemy's own BEGIN/COMMIT is disabled with
+    AUTOCOMMIT so the transaction is managed here. set_config(..., true) remains
+    transaction-local, so role and claims are applied before the query's statement starts
+    """
+    async with engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        try:
+            # Inside the try: a failing claim, e.g. an unknown role, leaves the transaction open and
+            # aborted, and the connection is returned to the pool without SQLAlchemy's reset
+            await driver_connection.execute(
+                to_begin_script(connection.dialect, jwt_claims, default_role, read_only, snapshot)
+            )
+            yield connection
+        except BaseException:
+            if driver_connection.is_in_transaction():
+                await driver_connection.execute("rollback")
+            raise
+        await driver_connection.execute("commit")
+
+
+@asynccontextmanager
+async def begin(
+    context: typing.Dict[str, typing.Any], native: bool = False, snapshot: bool = False
+) -> typing.AsyncIterator[typing.Union[AsyncConnection, NativeConnection]]:
+    """Yield a connection with an open transaction and claims set for a resolver
+
+    Expects:
+        info.context['engine'] to contain an sqlalchemy.ext.asyncio.AsyncEngine
+
+    The transaction is READ ONLY when info.context['read_only'] is set, e.g. on a replica. When
+    *snapshot* is set, it is also REPEATABLE READ so every statement sees the same snapshot
+
+    When info.context['fold_claims'] is set, BEGIN and the claims are sent in one round trip
+
+    When *native* is set and info.context['native_backend'] holds a started NativeBackend, the
+    transaction is opened on its asyncpg pool for the engine. Only statements returning json, jsonb
+    or text may be executed on the yielded NativeConnection
+
+    If the request is part of a batch, the batch's shared transaction is used and
+    the work is wrapped in a savepoint so a failing operation does not abort the
+    remainder of the batch
+    """
+    shared: typing.Optional[SharedTransaction] = context.get("transaction")
+
+    if shared is not None:
+        async with shared.lock:
+            async with shared.connection.begin_nested():
+                yield shared.connection
+        return
+
+    engine: AsyncEngine = context["engine"]
+    native_backend: typing.Optional[NativeBackend] = context.get("native_backend") if native else None
+    pool = native_backend.get_pool(engine) if native_backend is not None else None
+    if native_backend is not None and pool is not None:
+        async with begin_native(
+            pool,
+            engine.dialect,
+            context["jwt_claims"],
+            context["default_role"],
+            read_only=bool(context.get("read_only")),
+            fold_claims=bool(context.get("fold_claims")),
+            timeout=native_backend.timeout,
+            snapshot=snapshot,
+        ) as connection:
+            yield connection
+        return
+
+    if context.get("fold_claims"):
+        async with begin_with_claims(
+            engine,
+            context["jwt_claims"],
+            context["default_role"],
+            read_only=bool(context.get("read_only")),
+            snapshot=snapshot,
+        ) as connection:
+            yield connection
+        return
+
+    async with engine.begin() as trans:
+        transaction_modes = to_transaction_modes(bool(context.get("read_only")), snapshot)
+        if transaction_modes:
+            await trans.exec_driver_sql(f"set transaction {transaction_modes}")
+        await set_claims(trans, context["jwt_claims"], context["default_role"])
+        yield trans
+
+
+@asynccontextmanager
+async def shared_transaction(
+    engine: AsyncEngine,
+    jwt_claims: typing.Dict[str, typing.Any],
+    default_role: typing.Optional[str],
+    fold_claims: bool = False,
+) -> typing.AsyncIterator[SharedTransaction]:
+    """Open a transaction on a single pooled connection and set claims once"""
+    if fold_claims:
+        async with begin_with_claims(engine, jwt_claims, default_role) as connection:
+            yield SharedTransaction(connection)
+        return
+
+    async with engine.begin() as trans:
+        await set_claims(trans, jwt_claims, default_role)
+        yield SharedTransaction(trans)
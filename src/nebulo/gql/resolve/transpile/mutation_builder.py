@@ -1,26 +1,110 @@
 # pylint: disable=invalid-name
 from __future__ import annotations
 
+import typing
+
 from nebulo.config import Config
-from nebulo.gql.alias import CreatePayloadType, DeletePayloadType, UpdatePayloadType
+from nebulo.gql.alias import (
+    CreateManyPayloadType,
+    CreatePayloadType,
+    DeleteManyPayloadType,
+    DeletePayloadType,
+    UpdateManyPayloadType,
+    UpdatePayloadType,
+    UpsertManyPayloadType,
+    UpsertPayloadType,
+)
 from nebulo.gql.parse_info import ASTNode
 from nebulo.gql.relay.node_interface import to_node_id_sql
-from nebulo.gql.resolve.transpile.query_builder import field_name_to_column
-from nebulo.sql.inspect import get_primary_key_columns
+from nebulo.gql.resolve.transpile.query_builder import field_name_to_column, row_block
+from nebulo.sql.inspect import get_primary_key_columns, get_unique_constraints
+from nebulo.sql.table_base import TableProtocol
+from nebulo.text_utils import to_plural
+from sqlalchemy import Column, Integer, and_, any_, cast, func, literal, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.postgresql.dml import Insert as PGInsert
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.expression import column, values
+from sqlalchemy.sql.functions import FunctionElement
 
 
 def build_mutation(tree: ASTNode):
     """Dispatch for Mutation Types
 
-    Returns an executable sqlalchemy statment and a result post-processor
+    Returns an executable sqlalchemy statment returning the nodeId of the row
     """
+    sqla_model = tree.return_type.sqla_model
+    return to_dml(tree).returning(to_node_id_sql(sqla_model, sqla_model.__table__).label("nodeId"))
+
+
+def build_mutation_with_readback(tree: ASTNode, query_tree: typing.Optional[ASTNode]) -> Select:
+    """Compile a mutation and the read back of its row into a single statement
+
+    The INSERT/UPDATE/DELETE is a CTE returning the row's columns, from which the JSON for
+    *query_tree* is built. The statement selects the row's 'nodeId' and 'ret_json', which
+    is null when *query_tree* is None
+
+    All parts of a statement see the same snapshot, so the row is read from the CTE rather
+    than from its table. Relationships are read from their tables as of the statement start
+    """
+    sqla_model = tree.return_type.sqla_model
+    core_table = sqla_model.__table__
+
+    written = (
+        to_dml(tree)
+        .returning(*core_table.c, to_node_id_sql(sqla_model, core_table).label("_nodeId"))
+        .cte(f"{tree.alias}_written".lower())
+    )
+
+    if query_tree is None:
+        row_json = literal(None).label("ret_json")
+    else:
+        block = row_block(query_tree, source=written)
+        row_json = select([block.c.ret_json]).as_scalar().label("ret_json")
+
+    return select([written.c["_nodeId"].label("nodeId"), row_json]).select_from(written)
+
+
+def build_function_with_readback(
+    func_call: FunctionElement, sqla_model: TableProtocol, query_tree: typing.Optional[ASTNode]
+) -> Select:
+    """Call a function returning a table row and read back its row in a single statement
 
+    The function is called once in a CTE, from which the JSON for *query_tree* is built.
+    The statement selects 'ret_json', which is null if the function returned null
+    """
+    core_table = sqla_model.__table__
+    func_alias = func_call.alias("named_alias")
+    pkey_cols = get_primary_key_columns(sqla_model)
+
+    returned = (
+        select([literal_column(c.name).label(c.name) for c in core_table.c])
+        .select_from(func_alias)
+        .where(and_(*[literal_column(col.name).isnot(None) for col in pkey_cols]))
+        .cte("function_returned")
+    )
+
+    if query_tree is None:
+        # The CTE must be referenced for the function to be called
+        row_json = select([literal(None)]).select_from(returned).limit(1).as_scalar()
+    else:
+        block = row_block(query_tree, source=returned)
+        row_json = select([block.c.ret_json]).as_scalar()
+
+    return select([row_json.label("ret_json")])
+
+
+def to_dml(tree: ASTNode) -> UpdateBase:
     if isinstance(tree.return_type, CreatePayloadType):
         return build_insert(tree)
     elif isinstance(tree.return_type, UpdatePayloadType):
         return build_update(tree)
     elif isinstance(tree.return_type, DeletePayloadType):
         return build_delete(tree)
+    elif isinstance(tree.return_type, UpsertPayloadType):
+        return build_upsert(tree)
     else:
         raise Exception("Unknown mutation type")
 
@@ -38,11 +122,7 @@ def build_insert(tree: ASTNode):
 
     core_table = return_sqla_model.__table__
 
-    query = (
-        core_table.insert()
-        .values(**col_name_to_value)
-        .returning(to_node_id_sql(return_sqla_model, core_table).label("nodeId"))
-    )
+    query = core_table.insert().values(**col_name_to_value)
     return query
 
 
@@ -66,12 +146,7 @@ def build_update(tree: ASTNode):
 
     core_table = return_sqla_model.__table__
 
-    query = (
-        core_table.update()
-        .where(*pkey_clause)
-        .values(**col_name_to_value)
-        .returning(to_node_id_sql(return_sqla_model, core_table).label("nodeId"))
-    )
+    query = core_table.update().where(*pkey_clause).values(**col_name_to_value)
     return query
 
 
@@ -88,7 +163,312 @@ def build_delete(tree: ASTNode):
     return_sqla_model = return_type.sqla_model
     core_table = return_sqla_model.__table__
 
-    query = (
-        core_table.delete().where(*pkey_clause).returning(to_node_id_sql(return_sqla_model, core_table).label("nodeId"))
-    )
+    query = core_table.delete().where(*pkey_clause)
     return query
+
+
+def build_upsert(tree: ASTNode):
+    return_type = tree.return_type
+    sqla_model = return_type.sqla_model
+    table_input_arg_name = Config.table_name_mapper(sqla_model)
+    input_values = tree.args["input"][table_input_arg_name]
+    col_name_to_value = {}
+    for arg_name, arg_value in input_values.items():
+        col = field_name_to_column(sqla_model, arg_name)
+        col_name_to_value[col.name] = arg_value
+
+    return to_upsert(sqla_model, [col_name_to_value], tree.args["input"]["onConflict"])
+
+
+def get_conflict_target(sqla_model: TableProtocol, on_conflict: str) -> typing.List[Column]:
+    """Columns of the unique constraint named *on_conflict*"""
+    constraint = next(iter([x for x in get_unique_constraints(sqla_model) if x.name == on_conflict]), None)
+    if constraint is None:
+        raise Exception(f"No unique constraint named {on_conflict}")
+    return list(constraint.columns)
+
+
+def to_upsert(sqla_model: TableProtocol, rows: typing.List[typing.Dict[str, typing.Any]], on_conflict: str) -> PGInsert:
+    """INSERT ... ON CONFLICT (...) DO UPDATE of *rows*, which must set the same columns
+
+    Columns set by the rows, other than the conflict target and those excluded from updates,
+    are updated on conflict. If there are none, the conflict target is set to itself so the
+    existing row is still returned
+    """
+    core_table = sqla_model.__table__
+    target_cols = get_conflict_target(sqla_model, on_conflict)
+
+    query = pg_insert(core_table)
+    if rows[0]:
+        query = query.values(rows)
+
+    update_names = [
+        x for x in rows[0] if x not in {col.name for col in target_cols} and not Config.exclude_update(core_table.c[x])
+    ]
+    set_values = {x: query.excluded[x] for x in update_names} or {
+        col.name: query.excluded[col.name] for col in target_cols
+    }
+    return query.on_conflict_do_update(index_elements=target_cols, set_=set_values)
+
+
+# PostgreSQL's wire protocol allows at most this many bind parameters in a statement
+MAX_BIND_PARAMS = 32767
+
+DEFAULT = literal_column("DEFAULT")
+
+
+def to_chunk_size(params_per_row: int, chunk_size: int) -> int:
+    """Rows per statement, limited so a statement stays within MAX_BIND_PARAMS"""
+    return max(1, min(chunk_size, MAX_BIND_PARAMS // max(params_per_row, 1)))
+
+
+def chunks(items: typing.List[typing.Any], size: int) -> typing.Iterator[typing.List[typing.Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def group_by_columns(
+    rows: typing.List[typing.Dict[str, typing.Any]],
+) -> typing.Dict[typing.Tuple[str, ...], typing.List[typing.Tuple[int, typing.Dict[str, typing.Any]]]]:
+    """Group rows, with their positions, by the columns they set, so every row of a statement has the same columns"""
+    groups: typing.Dict[typing.Tuple[str, ...], typing.List[typing.Tuple[int, typing.Dict[str, typing.Any]]]] = {}
+    for ix, row in enumerate(rows):
+        groups.setdefault(tuple(sorted(row)), []).append((ix, row))
+    return groups
+
+
+class BulkStatement(typing.NamedTuple):
+    """A statement writing a chunk of a bulk mutation's rows
+
+    *indices* are the positions of the chunk's rows in the mutation's input, or None when the rows have no
+    input order, as for deletes. *ordinal* is returned by the statement with the 1-based position of each row
+    in the chunk. Without it, rows are returned in the order of the chunk, as INSERT does for its VALUES
+    """
+
+    dml: UpdateBase
+    indices: typing.Optional[typing.List[int]]
+    ordinal: typing.Optional[typing.Any] = None
+
+
+def build_bulk_mutation(
+    tree: ASTNode, query_tree: typing.Optional[ASTNode], chunk_size: int
+) -> typing.List[typing.Tuple[Select, typing.Optional[typing.List[int]]]]:
+    """Compile a createMany*, updateMany* or deleteMany* mutation to one statement per chunk of rows
+
+    Each statement selects 'ordinals', 'nodeIds' and 'ret_json', arrays of the written rows' 1-based
+    positions in their chunk, of their nodeIds and of the JSON for *query_tree*, all in that order.
+    It is returned with the positions of the chunk's rows in the input, or None for deletes, whose rows
+    are ordered by primary key
+    """
+    return_type = tree.return_type
+    sqla_model = return_type.sqla_model
+    input_values = tree.args["input"]
+
+    if isinstance(return_type, CreateManyPayloadType):
+        rows = input_values[to_plural(Config.table_name_mapper(sqla_model))]
+        stmts = build_insert_many(sqla_model, rows, chunk_size)
+    elif isinstance(return_type, UpdateManyPayloadType):
+        patches = input_values[to_plural(Config.table_name_mapper(sqla_model))]
+        stmts = build_update_many(sqla_model, patches, chunk_size)
+    elif isinstance(return_type, DeleteManyPayloadType):
+        stmts = build_delete_many(sqla_model, input_values["nodeIds"], chunk_size)
+    elif isinstance(return_type, UpsertManyPayloadType):
+        rows = input_values[to_plural(Config.table_name_mapper(sqla_model))]
+        stmts = build_upsert_many(sqla_model, rows, input_values["onConflict"], chunk_size)
+    else:
+        raise Exception("Unknown bulk mutation type")
+
+    cte_name = f"{tree.alias}_written".lower()
+    return [(to_bulk_readback(sqla_model, stmt, query_tree, cte_name), stmt.indices) for stmt in stmts]
+
+
+def to_bulk_readback(
+    sqla_model: TableProtocol, stmt: BulkStatement, query_tree: typing.Optional[ASTNode], cte_name: str
+) -> Select:
+    core_table = sqla_model.__table__
+    pkey_col_names = [col.name for col in get_primary_key_columns(sqla_model)]
+
+    returning = [*core_table.c, to_node_id_sql(sqla_model, core_table).label("_nodeId")]
+    if stmt.ordinal is not None:
+        returning.append(stmt.ordinal.label("_ordinal"))
+    written = stmt.dml.returning(*returning).cte(cte_name)
+
+    # Number the written rows by their position in the chunk
+    if stmt.ordinal is not None:
+        ordinal = written.c["_ordinal"]
+    elif stmt.indices is not None:
+        ordinal = func.row_number().over()
+    else:
+        ordinal = func.row_number().over(order_by=[written.c[x] for x in pkey_col_names])
+    numbered = select([*[written.c[x] for x in [*pkey_col_names, "_nodeId"]], ordinal.label("_ordinal")]).cte(
+        f"{cte_name}_numbered"
+    )
+    ordinals = func.jsonb_agg(aggregate_order_by(numbered.c["_ordinal"], numbered.c["_ordinal"]))
+    node_ids = func.jsonb_agg(aggregate_order_by(numbered.c["_nodeId"], numbered.c["_ordinal"]))
+
+    if query_tree is None:
+        rows_json = literal(None)
+    else:
+        block = row_block(query_tree, source=written)
+        rows_json = (
+            select([func.jsonb_agg(aggregate_order_by(block.c.ret_json, numbered.c["_ordinal"]))])
+            .select_from(block.join(numbered, and_(*[block.c[x] == numbered.c[x] for x in pkey_col_names])))
+            .correlate(None)
+            .as_scalar()
+        )
+
+    return select(
+        [
+            func.coalesce(ordinals, cast(literal("[]"), JSONB)).label("ordinals"),
+            func.coalesce(node_ids, cast(literal("[]"), JSONB)).label("nodeIds"),
+            func.coalesce(rows_json, cast(literal("[]"), JSONB)).label("ret_json"),
+        ]
+    ).select_from(numbered)
+
+
+def build_insert_many(
+    sqla_model: TableProtocol, rows: typing.List[typing.Dict[str, typing.Any]], chunk_size: int
+) -> typing.List[BulkStatement]:
+    """Multi-row INSERTs, one per chunk of rows"""
+    core_table = sqla_model.__table__
+    col_rows = [
+        {field_name_to_column(sqla_model, arg_name).name: arg_value for arg_name, arg_value in row.items()}
+        for row in rows
+    ]
+    col_names = sorted({col_name for row in col_rows for col_name in row})
+
+    stmts: typing.List[BulkStatement] = []
+    for chunk in chunks(list(enumerate(col_rows)), to_chunk_size(len(col_names), chunk_size)):
+        indices = [ix for ix, _ in chunk]
+        if col_names:
+            # Columns a row does not set take their server defaults
+            chunk_values = [{x: row.get(x, DEFAULT) for x in col_names} for _, row in chunk]
+            stmts.append(BulkStatement(core_table.insert().values(chunk_values), indices))
+        else:
+            stmts.extend(BulkStatement(core_table.insert(), [ix]) for ix in indices)
+    return stmts
+
+
+def build_update_many(
+    sqla_model: TableProtocol, patches: typing.List[typing.Dict[str, typing.Any]], chunk_size: int
+) -> typing.List[BulkStatement]:
+    """UPDATE ... FROM (VALUES ...), one per chunk of rows patching the same columns
+
+    Each nodeId may only be patched once. The VALUES list numbers its rows, as UPDATE returns them in no
+    particular order
+    """
+    core_table = sqla_model.__table__
+    pkey_cols = get_primary_key_columns(sqla_model)
+    input_object_name = Config.table_name_mapper(sqla_model)
+
+    # Columns of the VALUES list, by name. Primary keys are prefixed as they may also be patched
+    pkey_names = [f"_pkey_{col.name}" for col in pkey_cols]
+    name_to_col = {**{col.name: col for col in core_table.c}, **dict(zip(pkey_names, pkey_cols))}
+
+    rows = []
+    patched_keys: typing.Set[typing.Tuple[typing.Any, ...]] = set()
+    for patch in patches:
+        node_id = patch["nodeId"]
+        # UPDATE ... FROM would apply only one of several patches of a row, chosen arbitrarily
+        key = tuple(node_id.values[str(col.name)] for col in pkey_cols)
+        if key in patched_keys:
+            raise Exception(f"nodeId {node_id.serialize()} is patched more than once")
+        patched_keys.add(key)
+
+        row = {
+            field_name_to_column(sqla_model, arg_name).name: arg_value
+            for arg_name, arg_value in patch[input_object_name].items()
+        }
+        row.update({name: node_id.values[str(col.name)] for name, col in zip(pkey_names, pkey_cols)})
+        rows.append(row)
+
+    stmts: typing.List[BulkStatement] = []
+    for value_names, group in group_by_columns(rows).items():
+        value_cols = [name_to_col[x] for x in value_names]
+        patched_names = [x for x in value_names if x not in pkey_names]
+
+        # One more column numbers the rows
+        for chunk in chunks(group, to_chunk_size(len(value_names) + 1, chunk_size)):
+            # Casts type the VALUES list's columns, which PostgreSQL would otherwise resolve to text
+            data = [
+                (
+                    *[cast(literal(row[x], col.type), col.type) for x, col in zip(value_names, value_cols)],
+                    cast(literal(ordinal), Integer),
+                )
+                for ordinal, (_, row) in enumerate(chunk, start=1)
+            ]
+            patch_values = values(
+                *[column(x, col.type) for x, col in zip(value_names, value_cols)],
+                column("_ordinal", Integer),
+                name="patch_values",
+            ).data(data)
+
+            # A patch without columns changes nothing but still returns its row
+            set_values = {x: patch_values.c[x] for x in patched_names} or {col.name: col for col in pkey_cols}
+            dml = (
+                core_table.update()
+                .where(and_(*[col == patch_values.c[name] for name, col in zip(pkey_names, pkey_cols)]))
+                .values(**set_values)
+            )
+            stmts.append(BulkStatement(dml, [ix for ix, _ in chunk], patch_values.c["_ordinal"]))
+    return stmts
+
+
+def build_delete_many(
+    sqla_model: TableProtocol, node_ids: typing.List[typing.Any], chunk_size: int
+) -> typing.List[BulkStatement]:
+    """DELETE ... WHERE pkey = ANY(...), one per chunk of rows"""
+    core_table = sqla_model.__table__
+    pkey_cols = get_primary_key_columns(sqla_model)
+
+    stmts: typing.List[BulkStatement] = []
+    for chunk in chunks(node_ids, to_chunk_size(len(pkey_cols), chunk_size)):
+        if len(pkey_cols) == 1:
+            (pkey_col,) = pkey_cols
+            pkey_values = [node_id.values[str(pkey_col.name)] for node_id in chunk]
+            # A single array parameter
+            where_clause = pkey_col == any_(cast(literal(pkey_values, ARRAY(pkey_col.type)), ARRAY(pkey_col.type)))
+        else:
+            where_clause = tuple_(*pkey_cols).in_(
+                [tuple(node_id.values[str(col.name)] for col in pkey_cols) for node_id in chunk]
+            )
+        stmts.append(BulkStatement(core_table.delete().where(where_clause), None))
+    return stmts
+
+
+def build_upsert_many(
+    sqla_model: TableProtocol, rows: typing.List[typing.Dict[str, typing.Any]], on_conflict: str, chunk_size: int
+) -> typing.List[BulkStatement]:
+    """INSERT ... ON CONFLICT DO UPDATE, one per chunk of rows setting the same columns
+
+    Rows are not filled with DEFAULT, as for inserts, since a conflicting row would then be updated with it.
+    PostgreSQL can not update a row twice in one statement, so rows repeating a value of the conflict target
+    are rejected
+    """
+    col_rows = [
+        {field_name_to_column(sqla_model, arg_name).name: arg_value for arg_name, arg_value in row.items()}
+        for row in rows
+    ]
+
+    # Rows not setting every column of the conflict target take defaults, e.g. from a sequence
+    target_names = [col.name for col in get_conflict_target(sqla_model, on_conflict)]
+    seen_keys: typing.Set[typing.Tuple[typing.Any, ...]] = set()
+    for row in col_rows:
+        if not all(x in row for x in target_names):
+            continue
+        key = tuple(row[x] for x in target_names)
+        if key in seen_keys:
+            raise Exception(
+                f"Key ({', '.join(target_names)})=({', '.join(str(x) for x in key)}) of {on_conflict} "
+                "is set by more than one row"
+            )
+        seen_keys.add(key)
+
+    stmts: typing.List[BulkStatement] = []
+    for col_names, group in group_by_columns(col_rows).items():
+        # Rows without columns insert DEFAULT VALUES, one statement each
+        size = to_chunk_size(len(col_names), chunk_size) if col_names else 1
+        for chunk in chunks(group, size):
+            dml = to_upsert(sqla_model, [row for _, row in chunk], on_conflict)
+            stmts.append(BulkStatement(dml, [ix for ix, _ in chunk]))
+    return stmts
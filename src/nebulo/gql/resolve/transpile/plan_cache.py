@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import typing
+
+from cachetools import LRUCache
+from nebulo.gql.parse_info import ASTNode
+from nebulo.gql.resolve.transpile.query_builder import ArgumentBind
+from sqlalchemy.engine import Dialect
+from sqlalchemy.sql.compiler import Compiled
+from sqlalchemy.sql.expression import Executable
+
+__all__ = ["PlanCache", "PlanCacheInfo", "QueryPlan", "get_statement", "to_shape"]
+
+
+class PlanCacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class QueryPlan(typing.NamedTuple):
+    """A compiled statement and, for each of its bind parameters, how to compute its value"""
+
+    compiled: Compiled
+    # (bind name, locator of the field the value is read from, getter)
+    binds: typing.Tuple[typing.Tuple[str, typing.Tuple[typing.Any, ...], typing.Callable[[ASTNode], typing.Any]], ...]
+
+    @classmethod
+    def from_compiled(cls, compiled: Compiled) -> typing.Optional[QueryPlan]:
+        """Plan for *compiled*, or None if it binds a value that is not an ArgumentBind"""
+        binds = []
+        for bind, name in compiled.bind_names.items():
+            if not isinstance(bind, ArgumentBind):
+                return None
+            binds.append((name, bind.locator, bind.getter))
+        return cls(compiled=compiled, binds=tuple(binds))
+
+    def to_params(self, trees: typing.List[ASTNode]) -> typing.Dict[str, typing.Any]:
+        """Bind parameter values for *trees*, which must have the shape the plan was compiled for"""
+        roots = {tree.alias: tree for tree in trees}
+        params = {}
+        for name, locator, getter in self.binds:
+            field = roots[locator[0]]
+            for index in locator[1:]:
+                field = field.fields[index]
+            params[name] = getter(field)
+        return params
+
+
+def to_value_shape(value: typing.Any) -> typing.Hashable:
+    """Structure of an argument value with scalars replaced by their type"""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return tuple((key, to_value_shape(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(to_value_shape(x) for x in value))
+    return type(value).__name__
+
+
+def to_shape(tree: ASTNode) -> typing.Hashable:
+    """Everything about *tree* that the SQL generated for it depends on
+
+    Argument values only contribute their structure, their nullness and the names of their keys
+    """
+    return (
+        tree.name,
+        tree.alias,
+        tree.return_type.name,
+        to_value_shape(tree.args),
+        tuple(to_shape(x) for x in tree.fields),
+    )
+
+
+class _LRUCache(LRUCache):
+    """LRUCache counting the entries evicted to make room for new ones"""
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize=maxsize)
+        self.evictions = 0
+
+    def popitem(self):
+        self.evictions += 1
+        return super().popitem()
+
+
+class PlanCache:
+    """Bounded LRU cache of compiled SQL for query operations, keyed by the shape of their root fields
+
+    Building and compiling the SQLAlchemy expression for a nested query costs about as much CPU as
+    the database spends executing it. A request with the same selections and arguments as an earlier
+    one, differing only in argument values, skips both: the cached statement is executed with values
+    read from the new tree by each bind parameter's getter.
+
+    Statements binding values that are not ArgumentBinds are never cached. The cache belongs to one
+    schema, clear it if models are rebuilt
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        self._cache: _LRUCache = _LRUCache(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, kind: str, trees: typing.List[ASTNode], build: typing.Callable[[], Executable], dialect: Dialect
+    ) -> typing.Tuple[typing.Union[Executable, Compiled], typing.Optional[typing.Dict[str, typing.Any]]]:
+        """Statement and parameters to execute for *trees*
+
+        *build* returns the statement for *trees*, and is only called on a cache miss. *kind* names
+        the statement built, to distinguish the different statements built for the same trees
+        """
+        key = (kind, *(to_shape(tree) for tree in trees))
+        plan = self._cache.get(key)
+        if plan is not None:
+            self.hits += 1
+            return plan.compiled, plan.to_params(trees)
+
+        self.misses += 1
+        statement = build()
+        if self._cache.maxsize > 0:
+            plan = QueryPlan.from_compiled(statement.compile(dialect=dialect))
+            if plan is not None:
+                self._cache[key] = plan
+                return plan.compiled, None
+        return statement, None
+
+    def cache_info(self) -> PlanCacheInfo:
+        """Report cache statistics"""
+        return PlanCacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self._cache.evictions,
+            maxsize=int(self._cache.maxsize),
+            currsize=int(self._cache.currsize),
+        )
+
+    def cache_clear(self) -> None:
+        """Clear the cache and statistics"""
+        self._cache.clear()
+        self._cache.evictions = 0
+        self.hits = 0
+        self.misses = 0
+
+
+def get_statement(
+    context: typing.Dict[str, typing.Any],
+    kind: str,
+    trees: typing.List[ASTNode],
+    build: typing.Callable[[], Executable],
+) -> typing.Tuple[typing.Union[Executable, Compiled], typing.Optional[typing.Dict[str, typing.Any]]]:
+    """Statement and parameters to execute for *trees*, from context['plan_cache'] when present"""
+    plan_cache: typing.Optional[PlanCache] = context.get("plan_cache")
+    if plan_cache is None:
+        return build(), None
+    return plan_cache.get(kind, trees, build, context["engine"].dialect)
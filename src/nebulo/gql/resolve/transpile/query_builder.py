@@ -9,15 +9,42 @@ from flupy import flu
 from nebulo.config import Config
 from nebulo.gql.alias import CompositeType, ConnectionType, EnumType, ScalarType, TableType
 from nebulo.gql.parse_info import ASTNode
-from nebulo.gql.relay.cursor import to_cursor_sql
-from nebulo.gql.relay.node_interface import ID, to_node_id_sql
+from nebulo.gql.relay.node_interface import ID, to_serialized_node_id_sql
 from nebulo.sql.inspect import get_columns, get_primary_key_columns, get_relationships, get_table_name
 from nebulo.sql.table_base import TableProtocol
-from sqlalchemy import Column, Integer, and_, asc, cast, desc, func, literal, literal_column, select, tuple_
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Integer, Text, and_, asc, cast, desc, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.orm import RelationshipProperty
-from sqlalchemy.sql import Alias, Select
-from sqlalchemy.sql.elements import BinaryExpression, Label
+from sqlalchemy.sql import Alias, FromClause, Select
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, Label
+from sqlalchemy.sql.selectable import Lateral
+
+
+class ArgumentBind(BindParameter):
+    """Bind parameter for a value computed from the arguments of *field* by *getter*
+
+    The field is located by its *locator*, the alias of its root field followed by its index in
+    each parent's fields. A statement binding only ArgumentBinds can be compiled once and
+    re-executed for any tree of the same shape, by calling each getter on the new tree
+    """
+
+    inherit_cache = True
+
+    def __init__(
+        self, field: ASTNode, name: str, getter: typing.Callable[[ASTNode], typing.Any], type_: typing.Any = None
+    ):
+        self.locator = to_locator(field)
+        self.getter = getter
+        super().__init__(name, getter(field), type_=type_, unique=True)
+
+
+def to_locator(field: ASTNode) -> typing.Tuple[typing.Any, ...]:
+    """Alias of the root field followed by the index of *field* in each parent's fields"""
+    indexes = []
+    while field.parent is not None:
+        indexes.append(next(ix for ix, sibling in enumerate(field.parent.fields) if sibling is field))
+        field = field.parent
+    return (field.alias, *reversed(indexes))
 
 
 @lru_cache(maxsize=5000)
@@ -26,19 +53,23 @@ def slugify_path(path: typing.List[str]) -> str:
     return "_".join(path).lower()
 
 
-def sql_builder(tree: ASTNode, parent_name: typing.Optional[str] = None) -> Alias:
+def sql_builder(
+    tree: ASTNode, parent_name: typing.Optional[str] = None, strategy: typing.Optional[str] = None
+) -> Alias:
     return_type = tree.return_type
 
     if isinstance(return_type, TableType):
-        return row_block(field=tree, parent_name=parent_name)
+        return row_block(field=tree, parent_name=parent_name, strategy=strategy)
 
     if isinstance(return_type, ConnectionType):
-        return connection_block(field=tree, parent_name=parent_name)
+        return connection_block(field=tree, parent_name=parent_name, strategy=strategy)
 
     # SQL Function handler for immutable functions
     if hasattr(return_type, "sql_function"):
         # Immutable function
-        sql_func_callable = return_type.sql_function.to_executable(tree.args.values())
+        sql_func_callable = return_type.sql_function.to_executable(
+            [ArgumentBind(tree, key, lambda field, key=key: field.args[key]) for key in tree.args]
+        )
         return select([sql_func_callable.label("ret_json")]).alias()
 
     raise Exception("sql builder could not match return type")
@@ -81,15 +112,47 @@ def to_join_clause(field: ASTNode, parent_block_name: str) -> typing.List[Binary
 def to_limit(field: ASTNode) -> int:
     args = field.args
     default = Config.DEFAULT_PAGE_SIZE
-    first = int(args.get("first", default))
-    last = int(args.get("last", default))
+    # Null variables are treated as absent
+    first = int(args["first"]) if args.get("first") is not None else default
+    last = int(args["last"]) if args.get("last") is not None else default
     limit = min(first, last, default)
     return limit
 
 
+def to_page_cursor(field: ASTNode) -> typing.Optional[typing.Any]:
+    """The "after" or "before" cursor of a connection, if any
+
+    Raises a ValueError for invalid combinations of pagination arguments
+    """
+    args = field.args
+    after_cursor = args.get("after", None)
+    before_cursor = args.get("before", None)
+    first = args.get("first", None)
+    last = args.get("last", None)
+
+    if first is not None and last is not None:
+        raise ValueError('only one of "first" and "last" may be provided')
+
+    if after_cursor is None and before_cursor is None:
+        return None
+
+    if after_cursor is not None and before_cursor is not None:
+        raise ValueError('only one of "before" and "after" may be provided')
+
+    if after_cursor is not None and last is not None:
+        raise ValueError('"after" is not compatible with "last". Use "first"')
+
+    if before_cursor is not None and first is not None:
+        raise ValueError('"before" is not compatible with "first". Use "last"')
+
+    cursor = before_cursor if before_cursor is not None else after_cursor
+    if cursor.table_name != get_table_name(field.return_type.sqla_model):
+        raise ValueError("Invalid cursor for entity type")
+    return cursor
+
+
 def to_conditions_clause(field: ASTNode) -> typing.List[BinaryExpression]:
     return_sqla_model = field.return_type.sqla_model
-    local_table_name = get_table_name(return_sqla_model)
     args = field.args
 
     conditions = args.get("condition")
@@ -100,12 +163,71 @@ def to_conditions_clause(field: ASTNode) -> typing.List[BinaryExpression]:
     res = []
     for field_name, val in conditions.items():
         column = field_name_to_column(return_sqla_model, field_name)
-        res.append(column == val)
+        if val is None:
+            res.append(column.is_(None))
+        else:
+            res.append(column == ArgumentBind(field, column.name, lambda x, key=field_name: x.args["condition"][key]))
     return res
 
 
-def build_relationship(field: ASTNode, block_name: str) -> Label:
-    return sql_builder(field, block_name).as_scalar().label(field.alias)
+RELATIONSHIP_STRATEGIES = ("subquery", "lateral", "auto")
+
+
+def to_strategy(strategy: typing.Optional[str] = None) -> str:
+    """*strategy* for building relationships, defaulting to Config.RELATIONSHIP_STRATEGY"""
+    strategy = strategy or Config.RELATIONSHIP_STRATEGY
+    if strategy not in RELATIONSHIP_STRATEGIES:
+        raise ValueError(f"Unknown relationship strategy {strategy}")
+    return strategy
+
+
+def is_lateral(field: ASTNode, strategy: typing.Optional[str] = None) -> bool:
+    """Should relationship *field* be joined LATERAL to its parent, rather than selected as a
+    correlated scalar subquery
+
+    Depends only on the shape of the query, so a cached plan remains valid for any argument values
+    """
+    strategy = to_strategy(strategy)
+    if strategy == "auto":
+        # A to-one relationship is pulled up into a join of its parent, where PostgreSQL can memoize
+        # lookups of the same row or hash join. A nested connection aggregates a page per parent row
+        # either way, and its generic plan is slower as a lateral join
+        return isinstance(field.return_type, TableType)
+    return strategy == "lateral"
+
+
+def uses_lateral(tree: ASTNode, strategy: typing.Optional[str] = None) -> bool:
+    """Does the statement for *tree* join any of its relationships LATERAL"""
+    return any(
+        (isinstance(x.return_type, (TableType, ConnectionType)) and is_lateral(x, strategy))
+        or uses_lateral(x, strategy)
+        for x in tree.fields
+    )
+
+
+def build_relationship(
+    field: ASTNode, block_name: str, strategy: typing.Optional[str] = None
+) -> typing.Tuple[Label, typing.Optional[Lateral]]:
+    """Select the JSON of relationship *field* from its parent block *block_name*
+
+    Returns the labeled JSON and, when *field* is joined LATERAL, the subquery that the parent
+    must LEFT JOIN. Otherwise the JSON is a correlated scalar subquery and no join is needed
+    """
+    block = sql_builder(field, block_name, strategy)
+    if is_lateral(field, strategy):
+        lateral = block.element.lateral(slugify_path(field.path) + "_lat")
+        return lateral.c.ret_json.label(field.alias), lateral
+    return block.as_scalar().label(field.alias), None
+
+
+def join_laterals(from_clause: FromClause, laterals: typing.List[Lateral]) -> FromClause:
+    """LEFT JOIN LATERAL each of *laterals* to *from_clause*
+
+    A to-one relationship without a related row is null, as it is when selected as a subquery
+    """
+    for lateral in laterals:
+        from_clause = from_clause.outerjoin(lateral, TRUE)
+    return from_clause
 
 
 def literal_string(text):
@@ -113,23 +235,52 @@ def literal_string(text):
 
 
 def sql_finalize(return_name: str, expr: Alias) -> Select:
-    final = select([func.jsonb_build_object(literal_string(return_name), expr.c.ret_json).label("json")]).select_from(
+    final = select([func.json_build_object(literal_string(return_name), expr.c.ret_json).label("json")]).select_from(
         expr
     )
     return final
 
 
-def row_block(field: ASTNode, parent_name: typing.Optional[str] = None) -> Alias:
+def sql_finalize_operation(
+    trees: typing.List[ASTNode], as_text: bool = True, strategy: typing.Optional[str] = None
+) -> Select:
+    """Combine every root field of an operation into a single statement returning
+    the `data` object, keyed by response key, serialized as text unless *as_text* is False"""
+    root_selects = []
+    for tree in trees:
+        expr = sql_builder(tree, strategy=strategy)
+        root_selects.extend([literal_string(tree.alias), select([expr.c.ret_json]).as_scalar()])
+    data = func.json_build_object(*root_selects)
+    return select([(cast(data, Text()) if as_text else data).label("json")])
+
+
+def row_block(
+    field: ASTNode,
+    parent_name: typing.Optional[str] = None,
+    source: typing.Optional[FromClause] = None,
+    strategy: typing.Optional[str] = None,
+) -> Alias:
+    """Build the JSON for a single row
+
+    The row is selected from *source*, e.g. the RETURNING of a data modifying CTE, when provided.
+    *source* may hold many rows, so the block also selects their primary key columns for ordering
+    """
     return_type = field.return_type
     sqla_model = return_type.sqla_model
     core_model = sqla_model.__table__
 
     block_name = slugify_path(field.path)
-    if parent_name is None:
+    if source is not None:
+        core_model = source
+        pkey_clause = [True]
+        join_clause = [True]
+    elif parent_name is None:
         # If there is no parent, nodeId is mandatory
         pkey_cols = get_primary_key_columns(sqla_model)
-        node_id = field.args["nodeId"]
-        pkey_clause = [col == node_id.values[str(col.name)] for col in pkey_cols]
+        pkey_clause = [
+            col == ArgumentBind(field, col.name, lambda x, key=str(col.name): x.args["nodeId"].values[key], col.type)
+            for col in pkey_cols
+        ]
         join_clause = [True]
     else:
         # If there is a parent no arguments are accepted
@@ -139,27 +290,35 @@ def row_block(field: ASTNode, parent_name: typing.Optional[str] = None) -> Alias
     core_model_ref = (select(core_model.c).where(and_(*pkey_clause, *join_clause))).alias(block_name)
 
     select_clause = []
+    laterals = []
     for subfield in field.fields:
 
         if subfield.return_type == ID:
-            elem = select([to_node_id_sql(sqla_model, core_model_ref)]).label(subfield.alias)
+            elem = select([to_serialized_node_id_sql(sqla_model, core_model_ref)]).label(subfield.alias)
             select_clause.append(elem)
         elif isinstance(subfield.return_type, (ScalarType, CompositeType, EnumType)):
             col_name = field_name_to_column(sqla_model, subfield.name).name
             elem = core_model_ref.c[col_name].label(subfield.alias)
             select_clause.append(elem)
         else:
-            elem = build_relationship(subfield, block_name)
+            elem, lateral = build_relationship(subfield, block_name, strategy)
             select_clause.append(elem)
+            if lateral is not None:
+                laterals.append(lateral)
+
+    pkey_selects = (
+        [core_model_ref.c[col.name] for col in get_primary_key_columns(sqla_model)] if source is not None else []
+    )
 
     block = (
         select(
             [
-                func.jsonb_build_object(
+                func.json_build_object(
                     *flu(select_clause).map(lambda x: (literal_string(x.key), x)).flatten().collect()
-                ).label("ret_json")
+                ).label("ret_json"),
+                *pkey_selects,
             ]
-        ).select_from(core_model_ref)
+        ).select_from(join_laterals(core_model_ref, laterals))
     ).alias()
 
     return block
@@ -186,7 +345,20 @@ TRUE = literal_column("true")
 FALSE = literal_column("false")
 
 
-def connection_block(field: ASTNode, parent_name: typing.Optional[str]) -> Alias:
+class ConnectionPage(typing.NamedTuple):
+    """The requested page of a connection, before aggregation to JSON"""
+
+    # Rows of the page with the requested node columns plus _nodeId, _row_num and _has_next_page
+    block: Alias
+    total_block: Alias
+    has_total: bool
+    is_page_after: bool
+    is_reversed: bool
+
+
+def connection_page(
+    field: ASTNode, parent_name: typing.Optional[str], strategy: typing.Optional[str] = None
+) -> ConnectionPage:
     return_type = field.return_type
     sqla_model = return_type.sqla_model
 
@@ -197,23 +369,12 @@ def connection_block(field: ASTNode, parent_name: typing.Optional[str]) -> Alias
         join_conditions = to_join_clause(field, parent_name)
 
     filter_conditions = to_conditions_clause(field)
-    limit = to_limit(field)
+    page_limit = ArgumentBind(field, "limit", to_limit, Integer())
     has_total = check_has_total(field)
 
-    is_page_after = "after" in field.args
-    is_page_before = "before" in field.args
-
-    totalCount_alias = field.get_subfield_alias(["totalCount"])
-
-    edges_alias = field.get_subfield_alias(["edges"])
-    node_alias = field.get_subfield_alias(["edges", "node"])
-    cursor_alias = field.get_subfield_alias(["edges", "cursor"])
-
-    pageInfo_alias = field.get_subfield_alias(["pageInfo"])
-    hasNextPage_alias = field.get_subfield_alias(["pageInfo", "hasNextPage"])
-    hasPreviousPage_alias = field.get_subfield_alias(["pageInfo", "hasPreviousPage"])
-    startCursor_alias = field.get_subfield_alias(["pageInfo", "startCursor"])
-    endCursor_alias = field.get_subfield_alias(["pageInfo", "endCursor"])
+    is_page_after = field.args.get("after") is not None
+    is_page_before = field.args.get("before") is not None
+    is_reversed = is_page_before or field.args.get("last") is not None
 
     # Apply Filters
     core_model = sqla_model.__table__
@@ -232,53 +393,37 @@ def connection_block(field: ASTNode, parent_name: typing.Optional[str]) -> Alias
 
     new_edge_node_selects = []
     new_relation_selects = []
+    laterals = []
 
     for subfield in get_edge_node_fields(field):
         # Does anything other than NodeID go here?
         if subfield.return_type == ID:
-            # elem = select([to_node_id_sql(sqla_model, core_model_ref)]).label(subfield.alias)
-            elem = to_node_id_sql(sqla_model, core_model_ref).label(subfield.alias)
+            elem = to_serialized_node_id_sql(sqla_model, core_model_ref).label(subfield.alias)
             new_edge_node_selects.append(elem)
         elif isinstance(subfield.return_type, (ScalarType, CompositeType, EnumType)):
             col_name = field_name_to_column(sqla_model, subfield.name).name
             elem = core_model_ref.c[col_name].label(subfield.alias)
             new_edge_node_selects.append(elem)
         else:
-            elem = build_relationship(subfield, block_name)
+            elem, lateral = build_relationship(subfield, block_name, strategy)
             new_relation_selects.append(elem)
+            if lateral is not None:
+                laterals.append(lateral)
 
     # Setup Pagination
-    args = field.args
-    after_cursor = args.get("after", None)
-    before_cursor = args.get("before", None)
-    first = args.get("first", None)
-    last = args.get("last", None)
-
-    if first is not None and last is not None:
-        raise ValueError('only one of "first" and "last" may be provided')
-
     pkey_cols = get_primary_key_columns(sqla_model)
 
-    if after_cursor or before_cursor:
-        local_table_name = get_table_name(field.return_type.sqla_model)
-        cursor_table_name = before_cursor.table_name if before_cursor else after_cursor.table_name
-        cursor_values = before_cursor.values if before_cursor else after_cursor.values
-
-        if after_cursor is not None and before_cursor is not None:
-            raise ValueError('only one of "before" and "after" may be provided')
-
-        if after_cursor is not None and last is not None:
-            raise ValueError('"after" is not compatible with "last". Use "first"')
-
-        if before_cursor is not None and first is not None:
-            raise ValueError('"before" is not compatible with "first". Use "last"')
-
-        if cursor_table_name != local_table_name:
-            raise ValueError("Invalid cursor for entity type")
-
+    if to_page_cursor(field) is not None:
         pagination_clause = tuple_(*[core_model_ref.c[col.name] for col in pkey_cols]).op(
-            ">" if after_cursor is not None else "<"
-        )(tuple_(*[cursor_values[col.name] for col in pkey_cols]))
+            ">" if is_page_after else "<"
+        )(
+            tuple_(
+                *[
+                    ArgumentBind(field, col.name, lambda x, key=col.name: to_page_cursor(x).values[key], col.type)
+                    for col in pkey_cols
+                ]
+            )
+        )
     else:
         pagination_clause = True
 
@@ -289,8 +434,7 @@ def connection_block(field: ASTNode, parent_name: typing.Optional[str]) -> Alias
         select([func.count(ONE).label("total_count")]).select_from(core_model_ref.alias()).where(has_total)
     ).alias(block_name + "_total")
 
-    node_id_sql = to_node_id_sql(sqla_model, core_model_ref)
-    cursor_sql = to_cursor_sql(sqla_model, core_model_ref)
+    node_id_sql = to_serialized_node_id_sql(sqla_model, core_model_ref)
 
     # Select the right stuff
     p1_block = (
@@ -300,64 +444,122 @@ def connection_block(field: ASTNode, parent_name: typing.Optional[str]) -> Alias
                 *new_relation_selects,
                 # For internal Use
                 node_id_sql.label("_nodeId"),
-                cursor_sql.label("_cursor"),
                 # For internal Use
                 func.row_number().over().label("_row_num"),
             ]
         )
-        .select_from(core_model_ref)
+        .select_from(join_laterals(core_model_ref, laterals))
         .where(pagination_clause)
-        .order_by(*(reverse_order_clause if (is_page_before or last is not None) else order_clause), *order_clause)
-        .limit(cast(limit + 1, Integer()))
+        .order_by(*(reverse_order_clause if is_reversed else order_clause), *order_clause)
+        .limit(ArgumentBind(field, "limit", lambda x: to_limit(x) + 1, Integer()))
     ).alias(block_name + "_p1")
 
     # Drop maybe extra row
     p2_block = (
-        select([*p1_block.c, (func.max(p1_block.c._row_num).over() > limit).label("_has_next_page")])
+        select([*p1_block.c, (func.max(p1_block.c._row_num).over() > page_limit).label("_has_next_page")])
         .select_from(p1_block)
-        .limit(limit)
+        .limit(page_limit)
     ).alias(block_name + "_p2")
 
-    ordering = (
-        desc(literal_column("_row_num")) if (is_page_before or last is not None) else asc(literal_column("_row_num"))
-    )
+    ordering = desc(literal_column("_row_num")) if is_reversed else asc(literal_column("_row_num"))
 
     p3_block = (select(p2_block.c).select_from(p2_block).order_by(ordering)).alias(block_name + "_p3")
 
-    final = (
-        select(
-            [
-                func.jsonb_build_object(
-                    literal_string(totalCount_alias),
-                    func.coalesce(func.min(total_block.c.total_count), ZERO) if has_total else None,
-                    literal_string(pageInfo_alias),
-                    func.jsonb_build_object(
-                        literal_string(hasNextPage_alias),
-                        func.coalesce(func.array_agg(p3_block.c._has_next_page)[ONE], FALSE),
-                        literal_string(hasPreviousPage_alias),
-                        TRUE if is_page_after else FALSE,
-                        literal_string(startCursor_alias),
-                        func.array_agg(p3_block.c._nodeId)[ONE],
-                        literal_string(endCursor_alias),
-                        func.array_agg(p3_block.c._nodeId)[func.array_upper(func.array_agg(p3_block.c._nodeId), ONE)],
-                    ),
-                    literal_string(edges_alias),
+    return ConnectionPage(
+        block=p3_block,
+        total_block=total_block,
+        has_total=has_total,
+        is_page_after=is_page_after,
+        is_reversed=is_reversed,
+    )
+
+
+def to_edge_selects(edges_field: ASTNode, p3_block: Alias) -> typing.List[typing.Any]:
+    """Key/value pairs for json_build_object describing a single edge"""
+    edge_selects = []
+    for edge_field in edges_field.fields:
+        if edge_field.name == "cursor":
+            elem = p3_block.c._nodeId
+        elif edge_field.name == "node":
+            # Keys in the order they were selected, without the columns for internal use
+            elem = func.json_build_object(
+                *flu(edge_field.fields)
+                .map(lambda x: (literal_string(x.alias), p3_block.c[x.alias]))
+                .flatten()
+                .collect()
+            )
+        else:
+            continue
+        edge_selects.extend([literal_string(edge_field.alias), elem])
+    return edge_selects
+
+
+def connection_block(
+    field: ASTNode,
+    parent_name: typing.Optional[str],
+    include_edges: bool = True,
+    strategy: typing.Optional[str] = None,
+) -> Alias:
+    page = connection_page(field, parent_name, strategy)
+    p3_block = page.block
+    total_block = page.total_block
+
+    # Only requested keys are included in the result
+    connection_selects = []
+    for subfield in field.fields:
+        if subfield.name == "totalCount":
+            connection_selects.extend(
+                [literal_string(subfield.alias), func.coalesce(func.min(total_block.c.total_count), ZERO)]
+            )
+
+        elif subfield.name == "pageInfo":
+            page_info_selects = []
+            for page_info_field in subfield.fields:
+                if page_info_field.name == "hasNextPage":
+                    elem = func.coalesce(func.array_agg(p3_block.c._has_next_page)[ONE], FALSE)
+                elif page_info_field.name == "hasPreviousPage":
+                    elem = TRUE if page.is_page_after else FALSE
+                elif page_info_field.name == "startCursor":
+                    elem = func.array_agg(p3_block.c._nodeId)[ONE]
+                elif page_info_field.name == "endCursor":
+                    elem = func.array_agg(p3_block.c._nodeId)[func.array_upper(func.array_agg(p3_block.c._nodeId), ONE)]
+                else:
+                    continue
+                page_info_selects.extend([literal_string(page_info_field.alias), elem])
+            connection_selects.extend([literal_string(subfield.alias), func.json_build_object(*page_info_selects)])
+
+        elif subfield.name == "edges" and include_edges:
+            edge_selects = to_edge_selects(subfield, p3_block)
+            connection_selects.extend(
+                [
+                    literal_string(subfield.alias),
                     func.coalesce(
-                        func.jsonb_agg(
-                            func.jsonb_build_object(
-                                literal_string(cursor_alias),
-                                p3_block.c._nodeId,
-                                literal_string(node_alias),
-                                func.cast(func.row_to_json(literal_column(p3_block.name)), JSONB()),
-                            )
-                        ),
-                        func.cast(literal("[]"), JSONB()),
+                        func.json_agg(func.json_build_object(*edge_selects)),
+                        func.cast(literal_column("'[]'"), JSON()),
                     ),
-                ).label("ret_json")
-            ]
-        )
+                ]
+            )
+
+    final = (
+        select([func.json_build_object(*connection_selects).label("ret_json")])
         .select_from(p3_block)
-        .select_from(total_block if has_total else select([1]).alias())
+        .select_from(total_block if page.has_total else select([ONE]).alias())
     ).alias()
 
     return final
+
+
+def sql_connection_edges(field: ASTNode, strategy: typing.Optional[str] = None) -> Select:
+    """Select each edge of a root connection as a row of JSON text, in page order
+
+    Used to stream large pages instead of aggregating them with json_agg
+    """
+    edges_field = next(x for x in field.fields if x.name == "edges")
+    page = connection_page(field, None, strategy)
+    p3_block = page.block
+    ordering = desc(p3_block.c._row_num) if page.is_reversed else asc(p3_block.c._row_num)
+    return (
+        select([cast(func.json_build_object(*to_edge_selects(edges_field, p3_block)), Text()).label("edge")])
+        .select_from(p3_block)
+        .order_by(ordering)
+    )
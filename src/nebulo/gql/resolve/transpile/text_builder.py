@@ -0,0 +1,324 @@
+# pylint: disable=invalid-name
+"""Build SQL text for query operations directly from an ASTNode tree
+
+An alternative to query_builder that skips constructing and compiling SQLAlchemy expressions.
+Statements have the same structure as those built by query_builder, so results are identical.
+Enabled by setting Config.SQL_COMPILER to "text"
+"""
+
+from __future__ import annotations
+
+import re
+import typing
+from functools import lru_cache
+
+from nebulo.config import Config
+from nebulo.gql.alias import CompositeType, ConnectionType, EnumType, ScalarType, TableType
+from nebulo.gql.parse_info import ASTNode
+from nebulo.gql.relay.node_interface import ID
+from nebulo.gql.resolve.transpile.query_builder import (
+    check_has_total,
+    field_name_to_column,
+    field_name_to_relationship,
+    get_edge_node_fields,
+    slugify_path,
+    to_limit,
+    to_page_cursor,
+    uses_lateral,
+)
+from nebulo.sql.inspect import get_columns, get_primary_key_columns, get_table_name
+from nebulo.sql.table_base import TableProtocol
+from sqlalchemy import Column, String
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+
+__all__ = ["TextQuery", "is_text_buildable", "use_text_builder", "to_operation_text"]
+
+DIALECT = PGDialect_asyncpg()
+PREPARER = DIALECT.identifier_preparer
+
+# Bind parameters are numbered as they are created and renumbered in order of appearance
+PLACEHOLDER = re.compile("\x00([0-9]+)\x00")
+
+
+class TextQuery(typing.NamedTuple):
+    """SQL text in the driver's paramstyle and its parameters"""
+
+    sql: str
+    params: typing.Tuple[typing.Any, ...]
+
+
+class Params:
+    """Collects bind parameter values while SQL text is built"""
+
+    def __init__(self):
+        self.values: typing.List[typing.Any] = []
+
+    def bind(self, value: typing.Any, column: typing.Optional[Column] = None) -> str:
+        processor = to_bind_processor(column) if column is not None else None
+        self.values.append(processor(value) if processor is not None else value)
+        return f"\x00{len(self.values) - 1}\x00"
+
+    def finalize(self, sql: str) -> TextQuery:
+        params: typing.List[typing.Any] = []
+
+        def to_placeholder(match: typing.Match) -> str:
+            params.append(self.values[int(match.group(1))])
+            return "%s"
+
+        return TextQuery(sql=PLACEHOLDER.sub(to_placeholder, sql), params=tuple(params))
+
+
+@lru_cache()
+def to_bind_processor(column: Column) -> typing.Optional[typing.Callable[[typing.Any], typing.Any]]:
+    return column.type.bind_processor(DIALECT)
+
+
+def quote(name: str) -> str:
+    """Quoted identifier, escaped for the driver's paramstyle"""
+    return PREPARER.quote(name).replace("%", "%%")
+
+
+def literal_string(text: str) -> str:
+    """SQL string literal, escaped for the driver's paramstyle"""
+    return "'" + text.replace("'", "''").replace("%", "%%") + "'"
+
+
+class TableFragments(typing.NamedTuple):
+    """Precomputed SQL for a table"""
+
+    # Schema qualified table
+    table: str
+    # Unqualified table name, how columns of the table are referenced
+    name: str
+    # Every column of the table, e.g. `public.account.id AS id, ...`
+    columns: str
+    # (column, quoted name) of the primary key
+    pkey: typing.List[typing.Tuple[Column, str]]
+    # Opening of a serialized node id, matching json.dumps(NodeIdStructure.to_dict())
+    node_id_prefix: str
+
+
+@lru_cache()
+def get_table_fragments(sqla_model: TableProtocol) -> TableFragments:
+    table = PREPARER.format_table(sqla_model.__table__).replace("%", "%%")
+    table_name = get_table_name(sqla_model)
+    return TableFragments(
+        table=table,
+        name=quote(table_name),
+        columns=", ".join(f"{table}.{quote(col.name)} AS {quote(col.name)}" for col in get_columns(sqla_model)),
+        pkey=[(col, quote(col.name)) for col in get_primary_key_columns(sqla_model)],
+        node_id_prefix=literal_string(f'{{"table_name": "{table_name}", "values": '),
+    )
+
+
+# Text of to_ascii_json_sql
+ASCII_JSON_TEXT = (
+    "(SELECT string_agg(CASE WHEN ascii(chars.c) < 128 THEN chars.c "
+    "WHEN ascii(chars.c) < 65536 THEN '\\u' || lpad(to_hex(ascii(chars.c)), 4, '0') "
+    "ELSE '\\u' || to_hex(55296 + (ascii(chars.c) - 65536) / 1024) "
+    "|| '\\u' || to_hex(56320 + mod(ascii(chars.c) - 65536, 1024)) END, '' ORDER BY chars.n) "
+    "FROM regexp_split_to_table({json_text}, '') WITH ORDINALITY AS chars(c, n))"
+)
+
+
+def to_serialized_node_id_text(fragments: TableFragments, block: str) -> str:
+    """Text of to_serialized_node_id_sql for the primary key columns of *block*"""
+    values = ", ".join(f"{literal_string(str(col.name))}, {block}.{name}" for col, name in fragments.pkey)
+    values_text = f"CAST(jsonb_build_object({values}) AS TEXT)"
+    if any(isinstance(col.type, String) for col, _ in fragments.pkey):
+        values_text = ASCII_JSON_TEXT.format(json_text=values_text)
+    node_id = f"({fragments.node_id_prefix} || {values_text}) || '}}'"
+    return f"translate(encode(convert_to({node_id}, 'utf8'), 'base64'), E'\\n', '')"
+
+
+def to_join_text(field: ASTNode, parent_block: str) -> typing.List[str]:
+    parent_field = field.parent
+    assert parent_field is not None
+    relation_from_parent = field_name_to_relationship(parent_field.return_type.sqla_model, field.name)
+    local_table_name = get_table_fragments(field.return_type.sqla_model).name
+    return [
+        f"{parent_block}.{quote(parent_col.name)} = {local_table_name}.{quote(local_col.name)}"
+        for parent_col, local_col in relation_from_parent.local_remote_pairs
+    ]
+
+
+def to_conditions_text(field: ASTNode, params: Params) -> typing.List[str]:
+    sqla_model = field.return_type.sqla_model
+    table = get_table_fragments(sqla_model).table
+    res = []
+    for field_name, val in (field.args.get("condition") or {}).items():
+        column = field_name_to_column(sqla_model, field_name)
+        if val is None:
+            res.append(f"{table}.{quote(column.name)} IS NULL")
+        else:
+            res.append(f"{table}.{quote(column.name)} = {params.bind(val, column)}")
+    return res
+
+
+def text_builder(tree: ASTNode, params: Params, parent_block: typing.Optional[str] = None) -> str:
+    """Select of a single `ret_json` column for *tree*, as sql_builder"""
+    if isinstance(tree.return_type, TableType):
+        return row_text(tree, params, parent_block)
+
+    if isinstance(tree.return_type, ConnectionType):
+        return connection_text(tree, params, parent_block)
+
+    raise Exception("text builder could not match return type")
+
+
+def to_field_text(field: ASTNode, subfield: ASTNode, block: str, params: Params) -> str:
+    """Value of a node's *subfield* selected from *block*"""
+    sqla_model = field.return_type.sqla_model
+    if subfield.return_type == ID:
+        return to_serialized_node_id_text(get_table_fragments(sqla_model), block)
+    if isinstance(subfield.return_type, (ScalarType, CompositeType, EnumType)):
+        return f"{block}.{quote(field_name_to_column(sqla_model, subfield.name).name)}"
+    return f"({text_builder(subfield, params, block)})"
+
+
+def row_text(field: ASTNode, params: Params, parent_block: typing.Optional[str]) -> str:
+    fragments = get_table_fragments(field.return_type.sqla_model)
+    block = quote(slugify_path(field.path))
+
+    if parent_block is None:
+        # If there is no parent, nodeId is mandatory
+        node_id = field.args["nodeId"]
+        where = [
+            f"{fragments.table}.{name} = {params.bind(node_id.values[str(col.name)], col)}"
+            for col, name in fragments.pkey
+        ]
+    else:
+        where = to_join_text(field, parent_block)
+
+    source = f"(SELECT {fragments.columns} FROM {fragments.table} WHERE {' AND '.join(where)}) AS {block}"
+    selects = ", ".join(
+        f"{literal_string(subfield.alias)}, {to_field_text(field, subfield, block, params)}"
+        for subfield in field.fields
+    )
+    return f"SELECT json_build_object({selects}) AS ret_json FROM {source}"
+
+
+def connection_text(field: ASTNode, params: Params, parent_block: typing.Optional[str]) -> str:
+    sqla_model = field.return_type.sqla_model
+    fragments = get_table_fragments(sqla_model)
+    block_name = slugify_path(field.path)
+    block = quote(block_name)
+    p1, p2, p3, total = (quote(block_name + x) for x in ("_p1", "_p2", "_p3", "_total"))
+
+    conditions = [*(to_join_text(field, parent_block) if parent_block is not None else []), "true"]
+    conditions.extend(to_conditions_text(field, params))
+    source = f"(SELECT {fragments.columns} FROM {fragments.table} WHERE {' AND '.join(conditions)})"
+
+    cursor = to_page_cursor(field)
+    is_page_after = field.args.get("after") is not None
+    is_reversed = field.args.get("before") is not None or field.args.get("last") is not None
+    limit = to_limit(field)
+
+    # Page of rows with the requested node fields
+    node_selects = [
+        f"{to_field_text(field, subfield, block, params)} AS {quote(subfield.alias)}"
+        for subfield in get_edge_node_fields(field)
+    ]
+    pkey = [f"{block}.{name}" for _, name in fragments.pkey]
+    if cursor is not None:
+        cursor_values = ", ".join(params.bind(cursor.values[col.name], col) for col, _ in fragments.pkey)
+        pagination = f"({', '.join(pkey)}) {'>' if is_page_after else '<'} ({cursor_values})"
+    else:
+        pagination = "true"
+    order = ", ".join(f"{x} ASC" for x in pkey)
+    reverse_order = ", ".join(f"{x} DESC" for x in pkey)
+
+    p1_block = (
+        f"SELECT {', '.join([*node_selects, ''])}{to_serialized_node_id_text(fragments, block)} AS \"_nodeId\", "
+        f"row_number() OVER () AS _row_num FROM {source} AS {block} WHERE {pagination} "
+        f"ORDER BY {reverse_order if is_reversed else order}, {order} LIMIT {params.bind(limit + 1)}"
+    )
+    p2_block = (
+        f"SELECT {p1}.*, max({p1}._row_num) OVER () > {params.bind(limit)} AS _has_next_page "
+        f"FROM ({p1_block}) AS {p1} LIMIT {params.bind(limit)}"
+    )
+    p3_block = f"SELECT {p2}.* FROM ({p2_block}) AS {p2} ORDER BY _row_num {'DESC' if is_reversed else 'ASC'}"
+
+    total_block = (
+        f"(SELECT count(1) AS total_count FROM {source} AS {quote(block_name + '_count')}) AS {total}"
+        if check_has_total(field)
+        else "(SELECT 1) AS anon"
+    )
+
+    # Only requested keys are included in the result
+    connection_selects = []
+    for subfield in field.fields:
+        if subfield.name == "totalCount":
+            connection_selects.append(f"{literal_string(subfield.alias)}, coalesce(min({total}.total_count), 0)")
+
+        elif subfield.name == "pageInfo":
+            page_info_selects = []
+            for page_info_field in subfield.fields:
+                if page_info_field.name == "hasNextPage":
+                    elem = f"coalesce((array_agg({p3}._has_next_page))[1], false)"
+                elif page_info_field.name == "hasPreviousPage":
+                    elem = "true" if is_page_after else "false"
+                elif page_info_field.name == "startCursor":
+                    elem = f'(array_agg({p3}."_nodeId"))[1]'
+                elif page_info_field.name == "endCursor":
+                    elem = f'(array_agg({p3}."_nodeId"))[array_upper(array_agg({p3}."_nodeId"), 1)]'
+                else:
+                    continue
+                page_info_selects.append(f"{literal_string(page_info_field.alias)}, {elem}")
+            connection_selects.append(
+                f"{literal_string(subfield.alias)}, json_build_object({', '.join(page_info_selects)})"
+            )
+
+        elif subfield.name == "edges":
+            edge_selects = []
+            for edge_field in subfield.fields:
+                if edge_field.name == "cursor":
+                    elem = f'{p3}."_nodeId"'
+                elif edge_field.name == "node":
+                    # Keys in the order they were selected, without the columns for internal use
+                    node_selects = ", ".join(
+                        f"{literal_string(x.alias)}, {p3}.{quote(x.alias)}" for x in edge_field.fields
+                    )
+                    elem = f"json_build_object({node_selects})"
+                else:
+                    continue
+                edge_selects.append(f"{literal_string(edge_field.alias)}, {elem}")
+            connection_selects.append(
+                f"{literal_string(subfield.alias)}, "
+                f"coalesce(json_agg(json_build_object({', '.join(edge_selects)})), CAST('[]' AS JSON))"
+            )
+
+    return (
+        f"SELECT json_build_object({', '.join(connection_selects)}) AS ret_json "
+        f"FROM ({p3_block}) AS {p3}, {total_block}"
+    )
+
+
+def is_text_buildable(tree: ASTNode) -> bool:
+    """Can the text builder build *tree*, a root field"""
+    return isinstance(tree.return_type, (TableType, ConnectionType))
+
+
+def use_text_builder(trees: typing.List[ASTNode], strategy: typing.Optional[str] = None) -> bool:
+    """Should *trees*, the root fields of a statement, be built by the text builder
+
+    The text builder selects relationships as subqueries, so statements joining any LATERAL with
+    relationship *strategy* are built with SQLAlchemy
+    """
+    return (
+        Config.SQL_COMPILER == "text"
+        and all(is_text_buildable(x) for x in trees)
+        and not any(uses_lateral(x, strategy) for x in trees)
+    )
+
+
+def to_operation_text(trees: typing.List[ASTNode], as_text: bool = True) -> TextQuery:
+    """Text of sql_finalize_operation: a single statement returning the `data` object for every
+    root field in *trees*, keyed by response key, serialized as text unless *as_text* is False"""
+    params = Params()
+    root_selects = ", ".join(
+        f"{literal_string(tree.alias)}, (SELECT anon.ret_json FROM ({text_builder(tree, params)}) AS anon)"
+        for tree in trees
+    )
+    data = f"json_build_object({root_selects})"
+    return params.finalize(f"SELECT {f'CAST({data} AS TEXT)' if as_text else data} AS json")
@@ -5,15 +5,16 @@ import typing
 from nebulo.config import Config
 from nebulo.gql.alias import ObjectType, Schema
 from nebulo.gql.convert.connection import connection_field_factory
-from nebulo.gql.convert.create import create_entrypoint_factory
-from nebulo.gql.convert.delete import delete_entrypoint_factory
+from nebulo.gql.convert.create import create_entrypoint_factory, create_many_entrypoint_factory
+from nebulo.gql.convert.delete import delete_entrypoint_factory, delete_many_entrypoint_factory
 from nebulo.gql.convert.function import (
     immutable_function_entrypoint_factory,
     is_jwt_function,
     mutable_function_entrypoint_factory,
 )
 from nebulo.gql.convert.table import table_field_factory
-from nebulo.gql.convert.update import update_entrypoint_factory
+from nebulo.gql.convert.update import update_entrypoint_factory, update_many_entrypoint_factory
+from nebulo.gql.convert.upsert import get_conflict_targets, upsert_entrypoint_factory, upsert_many_entrypoint_factory
 from nebulo.gql.resolve.resolvers.asynchronous import async_resolver as resolver
 from nebulo.sql.inspect import get_table_name
 from nebulo.sql.reflection.function import SQLFunction
@@ -60,14 +61,30 @@ def sqla_models_to_graphql_schema(
         if not Config.exclude_create(sqla_model):
             # e.g. createAccount(input: CreateAccountInput)
             mutation_fields.update(create_entrypoint_factory(sqla_model, resolver=resolver))
+            # e.g. createManyAccounts(input: CreateManyAccountsInput)
+            mutation_fields.update(create_many_entrypoint_factory(sqla_model, resolver=resolver))
 
         if not Config.exclude_update(sqla_model):
             # e.g. updateAccount(input: UpdateAccountInput)
             mutation_fields.update(update_entrypoint_factory(sqla_model, resolver=resolver))
+            # e.g. updateManyAccounts(input: UpdateManyAccountsInput)
+            mutation_fields.update(update_many_entrypoint_factory(sqla_model, resolver=resolver))
+
+        if (
+            not Config.exclude_create(sqla_model)
+            and not Config.exclude_update(sqla_model)
+            and get_conflict_targets(sqla_model)
+        ):
+            # e.g. upsertAccount(input: UpsertAccountInput)
+            mutation_fields.update(upsert_entrypoint_factory(sqla_model, resolver=resolver))
+            # e.g. upsertManyAccounts(input: UpsertManyAccountsInput)
+            mutation_fields.update(upsert_many_entrypoint_factory(sqla_model, resolver=resolver))
 
         if not Config.exclude_delete(sqla_model):
             # e.g. deleteAccount(input: DeleteAccountInput)
             mutation_fields.update(delete_entrypoint_factory(sqla_model, resolver=resolver))
+            # e.g. deleteManyAccounts(input: DeleteManyAccountsInput)
+            mutation_fields.update(delete_many_entrypoint_factory(sqla_model, resolver=resolver))
     # Functions
     for sql_function in sql_functions:
         if is_jwt_function(sql_function, jwt_identifier):
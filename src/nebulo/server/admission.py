@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+import typing
+
+from starlette.exceptions import HTTPException
+
+__all__ = ["AdmissionController", "AdmissionStats", "ServiceUnavailable", "get_tenant"]
+
+
+class ServiceUnavailable(HTTPException):
+    """Returned with a Retry-After header when a request can not be admitted"""
+
+    def __init__(self, detail: str, retry_after: float):
+        super().__init__(503, detail)
+        self.headers = {"Retry-After": str(max(1, math.ceil(retry_after)))}
+
+
+class AdmissionStats(typing.NamedTuple):
+    # Requests currently holding a slot
+    in_flight: int
+    # Requests currently waiting for a slot
+    queued: int
+    admitted: int
+    # Rejected because the queue was full
+    rejected: int
+    # Rejected because no slot became available within max_wait
+    timed_out: int
+    # Seconds admitted requests spent waiting, in total and the longest
+    total_wait: float
+    max_wait: float
+
+
+def get_tenant(
+    jwt_claims: typing.Dict[str, typing.Any], default_role: typing.Optional[str], claim: str = "role"
+) -> str:
+    """The tenant a request's concurrency quota is counted against, e.g. its role or JWT subject"""
+    return str(jwt_claims.get(claim) or default_role or "anonymous")
+
+
+class Ticket(typing.NamedTuple):
+    tenant: str
+    wait: float
+
+
+class AdmissionController:
+    """Limits the number of GraphQL requests executing at once so a burst queues in
+    front of the connection pool rather than inside it
+
+    * **max_concurrency** = Requests allowed to execute at once. Should not exceed the pool's capacity
+    * **max_queue** = Requests allowed to wait for a slot. Further requests are rejected immediately.
+        Requests admitted without waiting are not counted
+    * **max_wait** = Seconds a request may wait for a slot before it is rejected
+    * **max_per_tenant** = Requests a single tenant (role or JWT subject) may execute at once so one
+        tenant can not starve the others. Disabled if None
+
+    Rejected requests receive a 503 with a Retry-After header
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int = 100,
+        max_wait: float = 5.0,
+        max_per_tenant: typing.Optional[int] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.max_per_tenant = max_per_tenant
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._tenant_slots: typing.Dict[str, asyncio.Semaphore] = {}
+        # Requests waiting for or holding each tenant's semaphore, to discard idle semaphores
+        self._tenant_users: typing.Dict[str, int] = {}
+        self._in_flight = 0
+        self._queued = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            in_flight=self._in_flight,
+            queued=self._queued,
+            admitted=self._admitted,
+            rejected=self._rejected,
+            timed_out=self._timed_out,
+            total_wait=self._total_wait,
+            max_wait=self._max_wait,
+        )
+
+    async def acquire(self, tenant: str) -> Ticket:
+        """Wait for a slot for *tenant*. Must be followed by a call to release
+
+        Raises ServiceUnavailable if the queue is full or no slot frees up in time
+        """
+        tenant_slots = self._get_tenant_slots(tenant)
+        start = time.monotonic()
+        if not self._slots.locked() and (tenant_slots is None or not tenant_slots.locked()):
+            # A free slot is taken without waiting, so only requests that wait count against max_queue
+            await self._acquire_slots(tenant_slots)
+        else:
+            await self._wait_for_slots(tenant, tenant_slots)
+
+        wait = time.monotonic() - start
+        self._in_flight += 1
+        self._admitted += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        return Ticket(tenant=tenant, wait=wait)
+
+    def release(self, ticket: Ticket) -> None:
+        self._in_flight -= 1
+        self._slots.release()
+        tenant_slots = self._tenant_slots.get(ticket.tenant)
+        if tenant_slots is not None:
+            tenant_slots.release()
+        self._release_tenant(ticket.tenant)
+
+    async def _wait_for_slots(self, tenant: str, tenant_slots: typing.Optional[asyncio.Semaphore]) -> None:
+        if self._queued >= self.max_queue:
+            self._rejected += 1
+            self._release_tenant(tenant)
+            raise ServiceUnavailable("Server is busy, request queue is full", retry_after=self.max_wait)
+
+        self._queued += 1
+        try:
+            await asyncio.wait_for(self._acquire_slots(tenant_slots), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            self._release_tenant(tenant)
+            raise ServiceUnavailable("Server is busy, timed out waiting to execute", retry_after=self.max_wait)
+        except BaseException:
+            self._release_tenant(tenant)
+            raise
+        finally:
+            self._queued -= 1
+
+    async def _acquire_slots(self, tenant_slots: typing.Optional[asyncio.Semaphore]) -> None:
+        # Wait on the tenant's quota first so a tenant at its limit does not hold a global slot
+        if tenant_slots is not None:
+            await tenant_slots.acquire()
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            if tenant_slots is not None:
+                tenant_slots.release()
+            raise
+
+    def _get_tenant_slots(self, tenant: str) -> typing.Optional[asyncio.Semaphore]:
+        if self.max_per_tenant is None:
+            return None
+        self._tenant_users[tenant] = self._tenant_users.get(tenant, 0) + 1
+        if tenant not in self._tenant_slots:
+            self._tenant_slots[tenant] = asyncio.Semaphore(self.max_per_tenant)
+        return self._tenant_slots[tenant]
+
+    def _release_tenant(self, tenant: str) -> None:
+        if self.max_per_tenant is None:
+            return
+        self._tenant_users[tenant] -= 1
+        if self._tenant_users[tenant] == 0:
+            del self._tenant_users[tenant]
+            del self._tenant_slots[tenant]
@@ -7,4 +7,25 @@ APP = create_app(
     jwt_identifier=Config.JWT_IDENTIFIER,
     jwt_secret=Config.JWT_SECRET,
     default_role=Config.DEFAULT_ROLE,
+    cache_control_max_age=Config.CACHE_CONTROL_MAX_AGE,
+    json_passthrough=Config.JSON_PASSTHROUGH,
+    stream_connections=Config.STREAM_CONNECTIONS,
+    compression_minimum_size=Config.COMPRESSION_MINIMUM_SIZE,
+    result_cache_ttl=Config.RESULT_CACHE_TTL,
+    result_cache_stale_while_revalidate=Config.RESULT_CACHE_STALE_WHILE_REVALIDATE,
+    expose_query_cost=Config.EXPOSE_QUERY_COST,
+    pool_size=Config.POOL_SIZE,
+    max_overflow=Config.MAX_OVERFLOW,
+    pool_timeout=Config.POOL_TIMEOUT,
+    pool_recycle=Config.POOL_RECYCLE,
+    pool_pre_ping=Config.POOL_PRE_PING,
+    prepared_statement_cache_size=Config.PREPARED_STATEMENT_CACHE_SIZE,
+    command_timeout=Config.COMMAND_TIMEOUT,
+    reflection_snapshot=Config.REFLECTION_SNAPSHOT,
+    replicas=Config.REPLICAS,
+    read_your_writes=Config.READ_YOUR_WRITES,
+    warmup=Config.WARMUP,
+    warmup_queries=Config.WARMUP_QUERIES,
+    fold_claims=Config.FOLD_CLAIMS,
+    native_pool=Config.NATIVE_POOL,
 )
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+import typing
+
+from cachetools import LRUCache
+from graphql import DocumentNode, GraphQLError, parse, validate
+from nebulo.gql.alias import Schema
+
+__all__ = ["DocumentCache", "CacheInfo"]
+
+
+class CacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class DocumentCache:
+    """Bounded LRU cache of parsed and validated GraphQL documents
+
+    Documents are keyed by a hash of the query text so requests
+    for an operation the server has already seen skip lexing, parsing and
+    validation and go straight to execution. Only valid documents are cached.
+    """
+
+    def __init__(self, schema: Schema, maxsize: int = 1000):
+        self.schema = schema
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def to_key(query: str) -> str:
+        """Hash of the exact query text
+
+        Whitespace is not normalized. It ends comments and separates tokens, so documents that
+        differ only in whitespace may parse differently
+        """
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    def get(self, query: str) -> typing.Tuple[typing.Optional[DocumentNode], typing.List[GraphQLError]]:
+        """Retrieve the parsed and validated document for *query*
+
+        Returns a tuple of the document and a list of errors. The document is
+        None when the query could not be parsed or failed validation
+        """
+        key = self.to_key(query)
+        document = self._cache.get(key)
+        if document is not None:
+            self.hits += 1
+            return document, []
+
+        self.misses += 1
+        try:
+            document = parse(query)
+        except GraphQLError as error:
+            return None, [error]
+
+        errors = validate(self.schema, document)
+        if errors:
+            return None, errors
+
+        self._cache[key] = document
+        return document, []
+
+    def cache_info(self) -> CacheInfo:
+        """Report cache statistics"""
+        return CacheInfo(
+            hits=self.hits, misses=self.misses, maxsize=int(self._cache.maxsize), currsize=int(self._cache.currsize)
+        )
+
+    def cache_clear(self) -> None:
+        """Clear the cache and statistics"""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
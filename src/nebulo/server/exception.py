@@ -5,4 +5,6 @@ from starlette.responses import JSONResponse
 
 async def http_exception(request: Request, exc: HTTPException):
     """Starlette exception handler converting starlette.exceptions.HTTPException into GraphQL responses"""
-    return JSONResponse({"data": None, "errors": [exc.detail]}, status_code=exc.status_code)
+    return JSONResponse(
+        {"data": None, "errors": [exc.detail]}, status_code=exc.status_code, headers=getattr(exc, "headers", None)
+    )
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import typing
+from dataclasses import dataclass, field
+
+from nebulo.server.json_codec import JSONCodec
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+
+__all__ = ["GraphQLRequest", "get_graphql_request"]
+
+
+@dataclass
+class GraphQLRequest:
+    """A single GraphQL operation sent by a client"""
+
+    query: typing.Optional[str] = None
+    variables: typing.Dict[str, typing.Any] = field(default_factory=dict)
+    operation_name: typing.Optional[str] = None
+    extensions: typing.Dict[str, typing.Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, contents: typing.Any) -> GraphQLRequest:
+        """Validate and convert a decoded request body"""
+        if not isinstance(contents, dict):
+            raise HTTPException(400, "GraphQL request must be a JSON object")
+
+        query = contents.get("query")
+        variables = contents.get("variables") or {}
+        operation_name = contents.get("operationName")
+        extensions = contents.get("extensions") or {}
+
+        if query is not None and not isinstance(query, str):
+            raise HTTPException(400, "query must be a string")
+        if not isinstance(variables, dict):
+            raise HTTPException(400, "variables must be a JSON object")
+        if operation_name is not None and not isinstance(operation_name, str):
+            raise HTTPException(400, "operationName must be a string")
+        if not isinstance(extensions, dict):
+            raise HTTPException(400, "extensions must be a JSON object")
+
+        return cls(query=query, variables=variables, operation_name=operation_name, extensions=extensions)
+
+
+def decode(json_codec: JSONCodec, data: typing.Union[str, bytes]) -> typing.Any:
+    try:
+        return json_codec.loads(data)
+    except ValueError:
+        raise HTTPException(400, "Request body must be valid JSON")
+
+
+async def get_graphql_request(
+    request: Request, json_codec: JSONCodec
+) -> typing.Union[GraphQLRequest, typing.List[GraphQLRequest]]:
+    """Decode the Starlette Request once into a GraphQLRequest, or a list of them for batched requests"""
+
+    if request.method == "GET":
+        params = request.query_params
+        contents = {
+            "query": params.get("query"),
+            "operationName": params.get("operationName"),
+            "variables": decode(json_codec, params["variables"]) if "variables" in params else None,
+            "extensions": decode(json_codec, params["extensions"]) if "extensions" in params else None,
+        }
+        return GraphQLRequest.from_dict(contents)
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type == "application/graphql":
+        return GraphQLRequest(query=(await request.body()).decode("utf-8"))
+
+    if content_type == "application/json":
+        body = decode(json_codec, await request.body())
+        if isinstance(body, list):
+            return [GraphQLRequest.from_dict(operation) for operation in body]
+        return GraphQLRequest.from_dict(body)
+
+    raise HTTPException(400, "content-type header must be set")
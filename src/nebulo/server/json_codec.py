@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import typing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+__all__ = ["JSONCodec", "StdlibJSONCodec", "OrjsonCodec", "get_json_codec"]
+
+
+class JSONCodec:
+    """Decodes request bodies and encodes response bodies"""
+
+    name: str
+
+    def loads(self, data: typing.Union[str, bytes]) -> typing.Any:
+        raise NotImplementedError()
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        raise NotImplementedError()
+
+
+class StdlibJSONCodec(JSONCodec):
+    """Codec backed by the standard library json module"""
+
+    name = "json"
+
+    def loads(self, data: typing.Union[str, bytes]) -> typing.Any:
+        return json.loads(data)
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        # Matches starlette.responses.JSONResponse
+        return json.dumps(obj, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec backed by orjson, requires the optional orjson package"""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson to be installed")
+
+    def loads(self, data: typing.Union[str, bytes]) -> typing.Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        return orjson.dumps(obj)
+
+
+def get_json_codec(name: typing.Optional[str] = None) -> JSONCodec:
+    """Return the JSON codec named *name*, or the fastest available codec if not provided"""
+    if name is None:
+        name = "orjson" if orjson is not None else "json"
+
+    codecs: typing.Dict[str, typing.Type[JSONCodec]] = {"json": StdlibJSONCodec, "orjson": OrjsonCodec}
+    if name not in codecs:
+        raise ValueError(f"Unknown JSON codec {name}. Expected one of {list(codecs)}")
+    return codecs[name]()
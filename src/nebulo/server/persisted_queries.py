@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import typing
+
+from cachetools import LRUCache
+from graphql import GraphQLError
+from starlette.exceptions import HTTPException
+
+__all__ = ["PersistedQueryCache", "PersistedQueryNotFound"]
+
+
+class PersistedQueryNotFound(GraphQLError):
+    """Returned to clients when a hash is sent for an unknown query
+    so they can retry with the full query text to register it"""
+
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"})
+
+
+class PersistedQueryCache:
+    """Bounded store of query text keyed by sha256 hash for automatic persisted queries (APQ)
+
+    Protocol:
+        1. Client sends `extensions.persistedQuery.sha256Hash` without a query
+        2. On a miss, the server responds with a PersistedQueryNotFound error
+        3. Client retries with both the hash and the query, registering it
+    """
+
+    version = 1
+
+    def __init__(self, maxsize: int = 1000):
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def to_hash(query: str) -> str:
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    def get(self, query_hash: str) -> typing.Optional[str]:
+        return self._cache.get(query_hash)
+
+    def register(self, query_hash: str, query: str) -> None:
+        if self.to_hash(query) != query_hash:
+            raise HTTPException(400, "provided sha256Hash does not match query")
+        self._cache[query_hash] = query
+
+    def resolve(
+        self, query: typing.Optional[str], extensions: typing.Optional[typing.Dict[str, typing.Any]]
+    ) -> typing.Optional[str]:
+        """Return the query text for the request, registering it if a hash was provided
+
+        Returns None when the client sent a hash for a query that has not been registered
+        """
+        persisted_query = (extensions or {}).get("persistedQuery")
+        if persisted_query is None:
+            if query is None:
+                raise HTTPException(400, "query must be provided")
+            return query
+
+        if persisted_query.get("version", self.version) != self.version:
+            raise HTTPException(400, "Unsupported persisted query version")
+
+        query_hash = persisted_query.get("sha256Hash")
+        if not isinstance(query_hash, str):
+            raise HTTPException(400, "persistedQuery requires a sha256Hash")
+
+        if query is None:
+            return self.get(query_hash)
+
+        self.register(query_hash, query)
+        return query
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import itertools
+import typing
+
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = ["ReplicaRouter"]
+
+
+class ReplicaRouter:
+    """Routes query operations to read replicas and everything else to the primary
+
+    Replicas are used in turn. Operations executed on a replica run in a READ ONLY transaction.
+
+    When *read_your_writes* is greater than 0, a JWT subject (the `sub` claim) that executes
+    a mutation reads from the primary for that many seconds so it observes its own writes
+    despite replication lag
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: typing.List[AsyncEngine],
+        read_your_writes: float = 0,
+        maxsize: int = 10000,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.read_your_writes = read_your_writes
+        self._replica_cycle = itertools.cycle(replicas)
+        self._recent_writers: typing.Optional[TTLCache] = (
+            TTLCache(maxsize=maxsize, ttl=read_your_writes) if read_your_writes > 0 else None
+        )
+        self.primary_reads = 0
+        self.replica_reads = 0
+
+    @staticmethod
+    def to_subject(jwt_claims: typing.Dict[str, typing.Any]) -> typing.Optional[str]:
+        subject = jwt_claims.get("sub")
+        return str(subject) if subject is not None else None
+
+    def is_pinned(self, jwt_claims: typing.Dict[str, typing.Any]) -> bool:
+        """Check if reads for the claims' subject must go to the primary"""
+        subject = self.to_subject(jwt_claims)
+        return self._recent_writers is not None and subject is not None and subject in self._recent_writers
+
+    def record_write(self, jwt_claims: typing.Dict[str, typing.Any]) -> None:
+        """Pin the claims' subject to the primary for the read-your-writes window"""
+        subject = self.to_subject(jwt_claims)
+        if self._recent_writers is not None and subject is not None:
+            self._recent_writers[subject] = True
+
+    def get_engine(self, jwt_claims: typing.Dict[str, typing.Any], is_query: bool) -> typing.Tuple[AsyncEngine, bool]:
+        """Select the engine for an operation, returning it and whether its transaction must be read only"""
+        if not is_query or not self.replicas:
+            return self.primary, False
+
+        if self.is_pinned(jwt_claims):
+            self.primary_reads += 1
+            return self.primary, False
+
+        self.replica_reads += 1
+        return next(self._replica_cycle), True
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
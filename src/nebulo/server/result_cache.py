@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+import typing
+
+import asyncpg
+from cachetools import LRUCache
+from graphql import DocumentNode, OperationType
+from graphql.language import FieldNode
+from graphql.utilities import get_operation_ast
+from nebulo.gql.alias import ConnectionType, Schema, TableType
+from nebulo.gql.parse_info import ASTNode, field_to_type, parse_operation
+from nebulo.server.document_cache import CacheInfo
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = ["ResultCache", "get_referenced_tables"]
+
+T = typing.TypeVar("T")
+
+NOTIFY_CHANNEL = "nebulo_table_change"
+
+TRIGGER_NAME = "nebulo_result_cache"
+
+NOTIFY_FUNCTION_NAME = "nebulo_notify_table_change"
+
+
+class CacheEntry(typing.NamedTuple):
+    value: typing.Any
+    tables: typing.FrozenSet[str]
+    created_at: float
+
+
+def to_qualified_name(sqla_model) -> str:
+    table = sqla_model.__table__
+    return f"{table.schema}.{table.name}" if table.schema else table.name
+
+
+def get_referenced_tables(
+    schema: Schema,
+    document: DocumentNode,
+    operation_name: typing.Optional[str],
+    variables: typing.Dict[str, typing.Any],
+) -> typing.Optional[typing.FrozenSet[str]]:
+    """Qualified names of the tables an operation reads, or None if its result can not be cached
+
+    Only query operations made up of tables and connections are cacheable. Views and functions
+    may read from any table so writes to their sources can not be detected
+    """
+    operation = get_operation_ast(document, operation_name)
+    if operation is None or operation.operation != OperationType.QUERY:
+        return None
+
+    try:
+        trees = parse_operation(schema, document, operation, variables)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    tables: typing.Set[str] = set()
+
+    def collect(tree: ASTNode) -> bool:
+        return_type = tree.return_type
+        if isinstance(return_type, (TableType, ConnectionType)):
+            if getattr(return_type.sqla_model, "is_view", False):
+                return False
+            tables.add(to_qualified_name(return_type.sqla_model))
+        return all(collect(x) for x in tree.fields)
+
+    for tree in trees:
+        if not isinstance(tree.return_type, (TableType, ConnectionType)) or not collect(tree):
+            return None
+    return frozenset(tables)
+
+
+class ResultCache:
+    """Bounded cache of serialized query results invalidated by PostgreSQL
+
+    Entries are keyed by a hash of the document, variables, role and JWT claims so
+    results are never shared between users that row level security could distinguish.
+
+    Before a result is cached, a statement level trigger is installed on each table the
+    query reads that calls `pg_notify` on every write. A dedicated connection listens
+    for those notifications and evicts all entries depending on the written table.
+
+    Entries younger than *ttl* seconds are served directly. Older entries are served for
+    up to *stale_while_revalidate* more seconds while being refreshed in the background.
+
+    Requires privileges to create functions and triggers on the cached tables
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        dsn: str,
+        ttl: float,
+        stale_while_revalidate: float = 0,
+        maxsize: int = 1000,
+        schema: str = "public",
+    ):
+        self.engine = engine
+        self.dsn = dsn
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.schema = schema
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        self._watched: typing.Set[str] = set()
+        self._watch_lock = asyncio.Lock()
+        # Count of invalidations per table, used to discard results computed across a write
+        self._generations: typing.Dict[str, int] = {}
+        self._epoch = 0
+        self._refreshing: typing.Set[str] = set()
+        self._listener: typing.Optional[asyncpg.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def to_key(
+        query: str,
+        operation_name: typing.Optional[str],
+        variables: typing.Dict[str, typing.Any],
+        role: typing.Optional[str],
+        jwt_claims: typing.Dict[str, typing.Any],
+    ) -> str:
+        contents = json.dumps(
+            [query, operation_name, variables, role, jwt_claims], sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(contents.encode("utf-8")).hexdigest()
+
+    @property
+    def is_listening(self) -> bool:
+        return self._listener is not None and not self._listener.is_closed()
+
+    async def start(self) -> None:
+        """Open the connection that listens for table change notifications"""
+        self._listener = await asyncpg.connect(self.dsn)
+        await self._listener.add_listener(NOTIFY_CHANNEL, self._on_notify)
+        self._listener.add_termination_listener(self._on_termination)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+    def _on_notify(self, _connection, _pid, _channel, payload: str) -> None:
+        self.invalidate(payload)
+
+    def _on_termination(self, _connection) -> None:
+        # Notifications may be missed until reconnected
+        self._listener = None
+        self._epoch += 1
+        self._cache.clear()
+
+    def invalidate(self, table: str) -> None:
+        """Evict all entries that read from *table*"""
+        self._generations[table] = self._generations.get(table, 0) + 1
+        for key in [key for key, entry in self._cache.items() if table in entry.tables]:
+            self._cache.pop(key, None)
+
+    def invalidate_mutation(self, schema: Schema, document: DocumentNode, operation_name: typing.Optional[str]) -> None:
+        """Evict entries affected by a mutation executed by this process without waiting
+        for its notification to arrive"""
+        operation = get_operation_ast(document, operation_name)
+        if operation is None or operation.operation != OperationType.MUTATION:
+            return
+
+        for selection in operation.selection_set.selections:
+            field = schema.mutation_type.fields.get(selection.name.value) if isinstance(selection, FieldNode) else None
+            sqla_model = getattr(field_to_type(field), "sqla_model", None) if field is not None else None
+            if sqla_model is None:
+                # e.g. functions, which may write to any table
+                self._epoch += 1
+                self._cache.clear()
+                return
+            self.invalidate(to_qualified_name(sqla_model))
+
+    async def watch(self, tables: typing.Iterable[str]) -> None:
+        """Install change notification triggers on any of *tables* not yet watched"""
+        unwatched = [x for x in tables if x not in self._watched]
+        if not unwatched:
+            return
+
+        async with self._watch_lock:
+            unwatched = [x for x in unwatched if x not in self._watched]
+            if not unwatched:
+                return
+
+            quote = self.engine.dialect.identifier_preparer.quote
+            function_name = f"{quote(self.schema)}.{NOTIFY_FUNCTION_NAME}"
+
+            async with self.engine.begin() as conn:
+                # Serialize DDL across workers
+                await conn.exec_driver_sql(f"select pg_advisory_xact_lock(hashtext('{TRIGGER_NAME}'))")
+                await conn.exec_driver_sql(
+                    f"""
+                    create or replace function {function_name}() returns trigger
+                    language plpgsql as $$
+                    begin
+                        perform pg_notify('{NOTIFY_CHANNEL}', tg_table_schema || '.' || tg_table_name);
+                        return null;
+                    end;
+                    $$
+                    """
+                )
+                for table in unwatched:
+                    table_ref = ".".join(quote(x) for x in table.split(".", 1))
+                    await conn.exec_driver_sql(
+                        f"""
+                        do $$
+                        begin
+                            if not exists (
+                                select 1 from pg_trigger
+                                where tgname = '{TRIGGER_NAME}' and tgrelid = '{table_ref}'::regclass
+                            ) then
+                                create trigger {TRIGGER_NAME}
+                                after insert or update or delete or truncate on {table_ref}
+                                for each statement execute procedure {function_name}();
+                            end if;
+                        end;
+                        $$
+                        """
+                    )
+            self._watched.update(unwatched)
+
+    async def get_or_execute(
+        self,
+        key: str,
+        tables: typing.FrozenSet[str],
+        execute: typing.Callable[[], typing.Awaitable[typing.Tuple[T, bool]]],
+    ) -> T:
+        """Return the cached value for *key*, or await *execute* and cache its result
+
+        *execute* returns a tuple of the value and whether it may be cached, e.g. False
+        when the result contains errors
+        """
+        if not self.is_listening:
+            # Without notifications, cached results could be stale
+            try:
+                await self.start()
+            except (OSError, asyncpg.PostgresError):
+                value, _ = await execute()
+                return value
+
+        entry: typing.Optional[CacheEntry] = self._cache.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.created_at
+            if age < self.ttl:
+                self.hits += 1
+                return entry.value
+            if age < self.ttl + self.stale_while_revalidate:
+                self.hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    asyncio.ensure_future(self._refresh(key, tables, execute))
+                return entry.value
+
+        self.misses += 1
+        return await self._execute_and_store(key, tables, execute)
+
+    async def _refresh(self, key, tables, execute) -> None:
+        try:
+            await self._execute_and_store(key, tables, execute)
+        except Exception:  # pylint: disable=broad-except
+            # The stale entry expires and the next request reports the error
+            pass
+        finally:
+            self._refreshing.discard(key)
+
+    async def _execute_and_store(self, key, tables, execute):
+        await self.watch(tables)
+        epoch = self._epoch
+        generations = {x: self._generations.get(x, 0) for x in tables}
+        created_at = time.monotonic()
+
+        value, is_cacheable = await execute()
+
+        is_current = epoch == self._epoch and all(
+            self._generations.get(x, 0) == generation for x, generation in generations.items()
+        )
+        if is_cacheable and is_current:
+            self._cache[key] = CacheEntry(value=value, tables=tables, created_at=created_at)
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits, misses=self.misses, maxsize=int(self._cache.maxsize), currsize=int(self._cache.currsize)
+        )
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
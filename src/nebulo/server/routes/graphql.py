@@ -1,12 +1,31 @@
-from typing import Any, Awaitable, Dict, Optional
+import hashlib
+from inspect import isawaitable
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple, Union
 
-from graphql import graphql as graphql_exec
+from graphql import DocumentNode, ExecutionResult, GraphQLError, OperationType, execute
+from graphql.utilities import get_operation_ast
+from nebulo.config import Config
+from nebulo.exceptions import QueryCostError
 from nebulo.gql.alias import Schema
+from nebulo.gql.cost import QueryCostLimits, get_operation_cost
+from nebulo.gql.resolve.resolvers.native import NativeBackend
+from nebulo.gql.resolve.resolvers.passthrough import execute_passthrough, stream_passthrough
+from nebulo.gql.resolve.resolvers.prefetch import prefetch_root_fields
+from nebulo.gql.resolve.resolvers.transaction import SharedTransaction, shared_transaction
+from nebulo.gql.resolve.transpile.plan_cache import PlanCache
+from nebulo.gql.resolve.transpile.query_builder import RELATIONSHIP_STRATEGIES
+from nebulo.server.admission import AdmissionController, Ticket, get_tenant
+from nebulo.server.document_cache import DocumentCache
+from nebulo.server.graphql_request import GraphQLRequest, get_graphql_request
+from nebulo.server.json_codec import JSONCodec, get_json_codec
 from nebulo.server.jwt import get_jwt_claims_handler
+from nebulo.server.persisted_queries import PersistedQueryCache, PersistedQueryNotFound
+from nebulo.server.replicas import ReplicaRouter
+from nebulo.server.result_cache import ResultCache, get_referenced_tables
 from sqlalchemy.ext.asyncio import AsyncEngine
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import Response, StreamingResponse
 from starlette.routing import Route
 
 __all__ = ["get_graphql_route"]
@@ -19,9 +38,30 @@ def get_graphql_route(
     jwt_secret: Optional[str] = None,
     default_role: Optional[str] = None,
     name: Optional[str] = None,
+    document_cache: Optional[DocumentCache] = None,
+    plan_cache: Optional[PlanCache] = None,
+    persisted_queries: Optional[PersistedQueryCache] = None,
+    cache_control_max_age: Optional[int] = None,
+    json_codec: Optional[JSONCodec] = None,
+    json_passthrough: bool = False,
+    stream_connections: bool = False,
+    result_cache: Optional[ResultCache] = None,
+    query_cost_limits: Optional[QueryCostLimits] = None,
+    expose_query_cost: bool = False,
+    admission_controller: Optional[AdmissionController] = None,
+    admission_tenant_claim: str = "role",
+    replica_router: Optional[ReplicaRouter] = None,
+    fold_claims: bool = False,
+    native_backend: Optional[NativeBackend] = None,
 ) -> Route:
     """Create a Starlette Route to serve GraphQL requests
 
+    Accepts a single operation or a batch of operations as a JSON array. Batched
+    operations are executed in order in a single transaction and the response is an array
+
+    An operation may choose how nested relationships are built with the `relationshipStrategy`
+    extension: "subquery", "lateral" or "auto". Defaults to Config.RELATIONSHIP_STRATEGY
+
     **Parameters**
 
     * **schema**: _Schema_ = A GraphQL-core schema
@@ -30,59 +70,327 @@ def get_graphql_route(
     * **jwt_secret**: _str_ = secret key used to encrypt JWT contents
     * **default_role**: _str_ = Default SQL role to use when serving unauthenticated requests
     * **name**: _str_ = Name of the GraphQL serving Starlette route
+    * **document_cache**: _DocumentCache_ = Cache of parsed and validated GraphQL documents
+    * **plan_cache**: _PlanCache_ = Cache of compiled SQL for query operations, keyed by the shape of the query
+    * **persisted_queries**: _PersistedQueryCache_ = Store for automatic persisted queries
+    * **cache_control_max_age**: _int_ = When set, anonymous read-only GET requests are served with
+        public `Cache-Control` and `ETag` headers. Other responses are marked `no-store`
+    * **json_codec**: _JSONCodec_ = Codec for decoding requests and encoding responses. Defaults to orjson if installed
+    * **json_passthrough**: _bool_ = When enabled, eligible queries are answered with the JSON text produced
+        by PostgreSQL without passing through the GraphQL executor. Object keys follow the selection set
+    * **stream_connections**: _bool_ = When enabled, eligible queries selecting a single connection stream
+        their edges from a server-side cursor so memory use does not grow with page size
+    * **result_cache**: _ResultCache_ = Cache of query results, invalidated by writes to the tables they read
+    * **query_cost_limits**: _QueryCostLimits_ = Operations estimated to exceed these limits are rejected before
+        any SQL is generated. Defaults to limits from Config
+    * **expose_query_cost**: _bool_ = When enabled, the estimated cost of each operation is returned in the `cost`
+        response extension even if no limit is set. Costs are only estimated when a limit is set or this is enabled
+    * **admission_controller**: _AdmissionController_ = Limits concurrently executing requests. Requests that can
+        not be admitted receive a 503 with a Retry-After header. Disabled if None
+    * **admission_tenant_claim**: _str_ = JWT claim identifying the tenant for per-tenant concurrency quotas,
+        e.g. 'role' or 'sub'. Falls back to the default role
+    * **replica_router**: _ReplicaRouter_ = Routes query operations to read replicas. Mutations and batches are
+        executed on *engine*, the primary
+    * **fold_claims**: _bool_ = When enabled, BEGIN and the statement setting JWT claims and role are sent to
+        PostgreSQL in one round trip
+    * **native_backend**: _NativeBackend_ = asyncpg pools to execute query statements on, bypassing SQLAlchemy.
+        Mutations, batches and streamed connections are executed with *engine*
     """
 
     get_jwt_claims = get_jwt_claims_handler(jwt_secret)
 
-    async def graphql_endpoint(request: Request) -> Awaitable[JSONResponse]:
+    if document_cache is None:
+        document_cache = DocumentCache(gql_schema, maxsize=Config.DOCUMENT_CACHE_SIZE)
+
+    if plan_cache is None:
+        plan_cache = PlanCache(maxsize=Config.PLAN_CACHE_SIZE)
+
+    if json_codec is None:
+        json_codec = get_json_codec()
+
+    if persisted_queries is None:
+        persisted_queries = PersistedQueryCache(maxsize=Config.PERSISTED_QUERY_CACHE_SIZE)
+
+    if query_cost_limits is None:
+        query_cost_limits = QueryCostLimits(
+            max_depth=Config.MAX_QUERY_DEPTH,
+            max_node_count=Config.MAX_QUERY_NODE_COUNT,
+            max_estimated_rows=Config.MAX_QUERY_ESTIMATED_ROWS,
+        )
+
+    async def execute_operation(
+        request: Request,
+        graphql_request: GraphQLRequest,
+        jwt_claims: Dict[str, Any],
+        transaction: Optional[SharedTransaction] = None,
+    ) -> Tuple[Union[ExecutionResult, bytes, AsyncIterator[bytes]], Optional[DocumentNode]]:
+        """Execute a single GraphQL operation, returning the result and its document
+
+        The result is the serialized response body, or an iterator over it when streamed,
+        if it was produced directly by PostgreSQL
+        """
+
+        query = persisted_queries.resolve(graphql_request.query, graphql_request.extensions)
+        if query is None:
+            return ExecutionResult(data=None, errors=[PersistedQueryNotFound()]), None
+
+        relationship_strategy = graphql_request.extensions.get("relationshipStrategy")
+        if relationship_strategy is not None and relationship_strategy not in RELATIONSHIP_STRATEGIES:
+            strategy_error = GraphQLError(f"relationshipStrategy must be one of {', '.join(RELATIONSHIP_STRATEGIES)}")
+            return ExecutionResult(data=None, errors=[strategy_error]), None
+
+        document, document_errors = document_cache.get(query)
+        if document is None:
+            return ExecutionResult(data=None, errors=document_errors), None
+
+        if request.method == "GET" and not is_query_operation(document, graphql_request.operation_name):
+            raise HTTPException(405, "Only query operations may be sent using GET")
+
+        # Reject expensive operations before any SQL is generated
+        extensions = None
+        cost = (
+            get_operation_cost(gql_schema, document, graphql_request.operation_name, graphql_request.variables)
+            if query_cost_limits.is_enabled or expose_query_cost
+            else None
+        )
+        if cost is not None:
+            extensions = {"cost": cost.to_dict()}
+            try:
+                query_cost_limits.check(cost)
+            except QueryCostError as error:
+                cost_error = GraphQLError(str(error), extensions={"code": "QUERY_COST_EXCEEDED"})
+                return ExecutionResult(data=None, errors=[cost_error], extensions=extensions), document
+
+        cache_tables = None
+        if result_cache is not None and transaction is None:
+            cache_tables = get_referenced_tables(
+                gql_schema, document, graphql_request.operation_name, graphql_request.variables
+            )
+
+        operation_engine, read_only = engine, False
+        # Cacheable results are read from the primary. The cache is invalidated as writes commit there,
+        # so a miss executed on a lagging replica would cache rows that are already stale
+        if replica_router is not None and transaction is None and cache_tables is None:
+            operation_engine, read_only = replica_router.get_engine(
+                jwt_claims, is_query_operation(document, graphql_request.operation_name)
+            )
 
-        query = await get_query(request)
-        variables = await get_variables(request)
-        jwt_claims = await get_jwt_claims(request)
         request_context = {
             "request": request,
-            "engine": engine,
+            "engine": operation_engine,
+            "read_only": read_only,
+            "fold_claims": fold_claims,
+            "native_backend": native_backend,
+            "plan_cache": plan_cache,
+            "relationship_strategy": relationship_strategy,
             "query": query,
-            "variables": variables,
+            "variables": graphql_request.variables,
             "jwt_claims": jwt_claims,
             "default_role": default_role,
+            "transaction": transaction,
         }
-        result = await graphql_exec(
-            schema=gql_schema,
-            source=query,
-            context_value=request_context,
-            variable_values=variables,
-        )
-        errors = result.errors
-        result_dict = {
-            "data": result.data,
-            "errors": [error.formatted for error in errors or []],
-        }
-        return JSONResponse(result_dict)
 
-    graphql_route = Route(path=path, endpoint=graphql_endpoint, methods=["POST"], name=name)
+        if stream_connections and transaction is None:
+            body_iterator = await stream_passthrough(
+                gql_schema,
+                document,
+                graphql_request.operation_name,
+                graphql_request.variables,
+                request_context,
+                extensions=extensions,
+            )
+            if body_iterator is not None:
+                return body_iterator, document
+
+        # Only results stored in the result cache are serialized here. Operations in a batch and those
+        # that can not be cached return their ExecutionResult
+        is_cached = result_cache is not None and cache_tables is not None
+
+        async def run() -> Tuple[Union[ExecutionResult, bytes], bool]:
+            """Execute the operation, returning the result and whether it may be cached"""
+            if json_passthrough and transaction is None:
+                body = await execute_passthrough(
+                    gql_schema,
+                    document,
+                    graphql_request.operation_name,
+                    graphql_request.variables,
+                    request_context,
+                    extensions=extensions,
+                )
+                if body is not None:
+                    return body, True
+
+            # Fetch all root fields in one round trip rather than one transaction each
+            await prefetch_root_fields(
+                gql_schema, document, graphql_request.operation_name, graphql_request.variables, request_context
+            )
+
+            result = execute(
+                schema=gql_schema,
+                document=document,
+                context_value=request_context,
+                variable_values=graphql_request.variables,
+                operation_name=graphql_request.operation_name,
+            )
+            if isawaitable(result):
+                result = await result
+            result.extensions = extensions
+
+            if not is_cached or result.errors:
+                return result, False
+            return json_codec.dumps(format_result(result)), True
+
+        if is_cached:
+            key = result_cache.to_key(
+                query, graphql_request.operation_name, graphql_request.variables, default_role, jwt_claims
+            )
+            return await result_cache.get_or_execute(key, cache_tables, run), document
+
+        result, _ = await run()
+        return result, document
+
+    async def graphql_endpoint(request: Request) -> Awaitable[Response]:
+
+        jwt_claims = await get_jwt_claims(request)
+        graphql_request = await get_graphql_request(request, json_codec)
+
+        if admission_controller is None:
+            return await handle_graphql_request(request, graphql_request, jwt_claims)
+
+        # Wait for a free slot in front of the connection pool
+        tenant = get_tenant(jwt_claims, default_role, admission_tenant_claim)
+        ticket = await admission_controller.acquire(tenant)
+        try:
+            response = await handle_graphql_request(request, graphql_request, jwt_claims)
+        except BaseException:
+            admission_controller.release(ticket)
+            raise
+
+        response.headers["Server-Timing"] = f"admission;dur={ticket.wait * 1000:.1f}"
+        if isinstance(response, StreamingResponse):
+            # The connection is held until the body has been sent
+            response.body_iterator = release_after(response.body_iterator, admission_controller, ticket)
+        else:
+            admission_controller.release(ticket)
+        return response
+
+    async def handle_graphql_request(
+        request: Request,
+        graphql_request: Union[GraphQLRequest, List[GraphQLRequest]],
+        jwt_claims: Dict[str, Any],
+    ) -> Response:
+
+        if isinstance(graphql_request, list):
+            # Execute all operations on one connection in one transaction with claims set once
+            results = []
+            async with shared_transaction(engine, jwt_claims, default_role, fold_claims=fold_claims) as transaction:
+                documents = []
+                for operation in graphql_request:
+                    result, document = await execute_operation(request, operation, jwt_claims, transaction)
+                    assert isinstance(result, ExecutionResult)
+                    results.append(format_result(result))
+                    documents.append((document, operation.operation_name, not result.errors))
+
+            for document, operation_name, succeeded in documents:
+                if document is not None:
+                    on_executed(document, operation_name, jwt_claims, succeeded)
+            return json_response(results)
+
+        result, document = await execute_operation(request, graphql_request, jwt_claims)
+
+        if document is not None:
+            succeeded = not (isinstance(result, ExecutionResult) and result.errors)
+            on_executed(document, graphql_request.operation_name, jwt_claims, succeeded)
+
+        if isinstance(result, ExecutionResult):
+            response = json_response(format_result(result))
+            errors = result.errors
+        elif isinstance(result, bytes):
+            response = Response(result, media_type="application/json")
+            errors = None
+        else:
+            # Streamed responses have no body to compute an ETag from
+            streaming_response = StreamingResponse(result, media_type="application/json")
+            if cache_control_max_age is not None:
+                streaming_response.headers["Cache-Control"] = "no-store"
+            return streaming_response
+
+        if cache_control_max_age is not None:
+            is_cacheable = (
+                request.method == "GET"
+                and document is not None
+                and is_query_operation(document, graphql_request.operation_name)
+                and not jwt_claims
+                and not errors
+            )
+            return with_cache_headers(request, response, cache_control_max_age if is_cacheable else None)
+        return response
+
+    def on_executed(
+        document: DocumentNode, operation_name: Optional[str], jwt_claims: Dict[str, Any], succeeded: bool
+    ) -> None:
+        """Account for writes made by an executed operation"""
+        if result_cache is not None:
+            result_cache.invalidate_mutation(gql_schema, document, operation_name)
+        # A failed mutation is rolled back, leaving nothing for the subject to read back
+        if replica_router is not None and succeeded and not is_query_operation(document, operation_name):
+            replica_router.record_write(jwt_claims)
+
+    def json_response(content: Any) -> Response:
+        return Response(json_codec.dumps(content), media_type="application/json")
+
+    graphql_route = Route(path=path, endpoint=graphql_endpoint, methods=["GET", "POST"], name=name)
 
     return graphql_route
 
 
-async def get_query(request: Request) -> Awaitable[str]:
-    """Retrieve the GraphQL query from the Starlette Request"""
+async def release_after(
+    body_iterator: AsyncIterator[bytes], admission_controller: AdmissionController, ticket: Ticket
+) -> AsyncIterator[bytes]:
+    """Release an admission ticket once a streamed body is exhausted or closed"""
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        admission_controller.release(ticket)
 
-    content_type = request.headers.get("content-type", "")
-    if content_type == "application/graphql":
-        return await request.body()
-    if content_type == "application/json":
-        return (await request.json())["query"]
-    raise HTTPException(400, "content-type header must be set")
 
+def format_result(result: ExecutionResult) -> Dict[str, Any]:
+    """Convert an ExecutionResult to a JSON serializable response"""
+    formatted = {
+        "data": result.data,
+        "errors": [error.formatted for error in result.errors or []],
+    }
+    if result.extensions:
+        formatted["extensions"] = result.extensions
+    return formatted
+
+
+def is_query_operation(document: DocumentNode, operation_name: Optional[str] = None) -> bool:
+    """Check if the document's operation is a read-only query"""
+    operation = get_operation_ast(document, operation_name)
+    return operation is not None and operation.operation == OperationType.QUERY
+
+
+def with_cache_headers(request: Request, response: Response, max_age: Optional[int]) -> Response:
+    """Apply HTTP caching headers to a response
+
+    When *max_age* is None the response is marked as not cacheable. Otherwise a public
+    Cache-Control and an ETag are set, and a 304 is returned if the client's copy is current
+    """
+    if max_age is None:
+        response.headers["Cache-Control"] = "no-store"
+        return response
 
-async def get_variables(request) -> Awaitable[Dict[str, Any]]:
-    """Retrieve the GraphQL variables from the Starlette Request"""
+    # The ETag is computed from the uncompressed body, and compressed representations carry the same
+    # ETag, so it is a weak validator. If-None-Match uses the weak comparison
+    opaque_tag = '"' + hashlib.sha256(response.body).hexdigest() + '"'
+    etag = f"W/{opaque_tag}"
+    headers = {"Cache-Control": f"public, max-age={max_age}", "ETag": etag, "Vary": "Authorization"}
 
-    content_type = request.headers.get("content-type", "")
-    if content_type == "application/graphql":
-        raise NotImplementedError("Getting variables from graphql content type not known")
+    if_none_match = [x.strip() for x in request.headers.get("if-none-match", "").split(",")]
+    if opaque_tag in [x[2:] if x.startswith("W/") else x for x in if_none_match]:
+        return Response(status_code=304, headers=headers)
 
-    if content_type == "application/json":
-        return (await request.json()).get("variables", {})
-    raise HTTPException(400, "content-type header must be set")
+    response.headers.update(headers)
+    return response
@@ -1,16 +1,43 @@
-from typing import Optional
+import logging
+from typing import List, Optional
 
+from nebulo.config import Config
+from nebulo.gql.cost import QueryCostLimits
+from nebulo.gql.resolve.resolvers.native import NativeBackend
+from nebulo.gql.resolve.transpile.plan_cache import PlanCache
 from nebulo.gql.sqla_to_gql import sqla_models_to_graphql_schema
+from nebulo.server.admission import AdmissionController
+from nebulo.server.compression import CompressionMiddleware
+from nebulo.server.document_cache import DocumentCache
 from nebulo.server.exception import http_exception
+from nebulo.server.replicas import ReplicaRouter
+from nebulo.server.result_cache import ResultCache
 from nebulo.server.routes import get_graphiql_route, get_graphql_route
-from nebulo.sql.reflection.manager import reflect_sqla_models
+from nebulo.server.warmup import Warmup, get_custom_type_names
+from nebulo.sql.reflection.manager import reflect_sqla_models, sqla_models_from_snapshot
+from nebulo.sql.reflection.snapshot import load_snapshot
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from starlette.applications import Starlette
 from starlette.exceptions import HTTPException
 from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
 
+logger = logging.getLogger(__name__)
+
+
+def get_connection_budget(
+    pool_size: int, max_overflow: int, result_cache: bool = False, native_pool: bool = False, replicas: int = 0
+) -> int:
+    """Maximum database connections opened by one worker process
+
+    Each of *replicas* read replicas has pools of its own, sized like the primary's
+    """
+    # The native pool is sized like the SQLAlchemy pool
+    pools = (2 if native_pool else 1) * (1 + replicas)
+    # The result cache listens for notifications on a dedicated connection
+    return pools * (pool_size + max_overflow) + (1 if result_cache else 0)
+
 
 def create_app(
     connection: str,
@@ -18,17 +45,127 @@ def create_app(
     jwt_identifier: Optional[str] = None,
     jwt_secret: Optional[str] = None,
     default_role: Optional[str] = None,
+    cache_control_max_age: Optional[int] = None,
+    json_passthrough: bool = False,
+    stream_connections: bool = False,
+    compression_minimum_size: Optional[int] = 500,
+    result_cache_ttl: Optional[float] = None,
+    result_cache_stale_while_revalidate: float = 0,
+    query_cost_limits: Optional[QueryCostLimits] = None,
+    expose_query_cost: bool = False,
+    admission_controller: Optional[AdmissionController] = None,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30,
+    pool_recycle: int = -1,
+    pool_pre_ping: bool = False,
+    prepared_statement_cache_size: int = 100,
+    command_timeout: Optional[float] = None,
+    reflection_snapshot: Optional[str] = None,
+    replicas: Optional[List[str]] = None,
+    read_your_writes: float = 0,
+    warmup: bool = False,
+    warmup_queries: Optional[str] = None,
+    fold_claims: bool = False,
+    native_pool: bool = False,
 ) -> Starlette:
-    """Instantiate the Starlette app"""
+    """Instantiate the Starlette app
+
+    Responses of at least *compression_minimum_size* bytes are compressed. Pass None or a
+    negative value to disable compression
+
+    Query results are cached for *result_cache_ttl* seconds when it is set. Writes to the tables
+    a result was read from are detected with triggers that nebulo installs
+
+    The cost of each operation is estimated and checked against *query_cost_limits* when a limit is set.
+    The estimate is returned in the `cost` response extension then, or when *expose_query_cost* is enabled
+
+    Concurrently executing requests are limited by *admission_controller* when provided, or when
+    Config.MAX_CONCURRENCY is set. Admission is disabled by default
+
+    *prepared_statement_cache_size* and *command_timeout* are passed to the asyncpg driver
+
+    When *reflection_snapshot*, the path to a file written by dump_snapshot, is provided
+    models are built from it instead of reflecting the database
+
+    Query operations are executed on *replicas*, connection strings of read replicas, when provided.
+    After a mutation, a JWT subject reads from the primary for *read_your_writes* seconds
+
+    When *warmup* is enabled, *pool_size* connections are opened to each database and type codecs
+    are loaded before the app starts serving. *warmup_queries* is the path to a file of GraphQL
+    query operations to execute on each connection so their statements are prepared. Other operations
+    in the file are skipped. Only the SQLAlchemy pools are warmed: the asyncpg pools of *native_pool*
+    open their connections and load json codecs on startup, but their statements are not prepared
+
+    When *fold_claims* is enabled, BEGIN and the statement setting JWT claims and role are sent
+    in one round trip rather than one each
+
+    When *native_pool* is enabled, query statements are executed on asyncpg pools of *pool_size*
+    to *pool_size* + *max_overflow* connections per database, opened on startup alongside the
+    SQLAlchemy pools. Mutations and batches are still executed with SQLAlchemy
+    """
 
     if not (jwt_identifier is not None) == (jwt_secret is not None):
         raise Exception("jwt_token_identifier and jwt_secret must be provided together")
 
-    async_connection = connection.replace("postgresql://", "postgresql+asyncpg://")
-    engine = create_async_engine(async_connection)
+    if pool_size < 1:
+        raise ValueError("pool_size must be at least 1")
+    if max_overflow < 0:
+        raise ValueError("max_overflow must not be negative")
+    if prepared_statement_cache_size < 0:
+        raise ValueError("prepared_statement_cache_size must not be negative")
+
+    connect_args = {"prepared_statement_cache_size": prepared_statement_cache_size}
+    if command_timeout is not None:
+        connect_args["command_timeout"] = command_timeout
+
+    def to_async_engine(connection: str) -> AsyncEngine:
+        return create_async_engine(
+            connection.replace("postgresql://", "postgresql+asyncpg://"),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            connect_args=connect_args,
+        )
+
+    engine = to_async_engine(connection)
+    replica_router = (
+        ReplicaRouter(engine, [to_async_engine(x) for x in replicas], read_your_writes=read_your_writes)
+        if replicas
+        else None
+    )
+    native_backend = (
+        NativeBackend(
+            [engine, *(replica_router.replicas if replica_router else [])],
+            min_size=pool_size,
+            max_size=pool_size + max_overflow,
+            timeout=pool_timeout,
+            statement_cache_size=prepared_statement_cache_size,
+            command_timeout=command_timeout,
+        )
+        if native_pool
+        else None
+    )
+    logger.info(
+        "Connection budget per worker: %d (pool_size=%d, max_overflow=%d%s%s%s)",
+        get_connection_budget(
+            pool_size, max_overflow, result_cache_ttl is not None, native_pool, replicas=len(replicas or [])
+        ),
+        pool_size,
+        max_overflow,
+        ", native pool" if native_pool else "",
+        f", replicas={len(replicas)}" if replicas else "",
+        ", result cache listener=1" if result_cache_ttl is not None else "",
+    )
     # Reflect database to sqla models
-    sqla_engine = create_engine(connection)
-    sqla_models, sql_functions = reflect_sqla_models(engine=sqla_engine, schema=schema)
+    if reflection_snapshot is not None:
+        with open(reflection_snapshot, "rb") as snapshot_file:
+            sqla_models, sql_functions = sqla_models_from_snapshot(load_snapshot(snapshot_file.read()))
+    else:
+        sqla_engine = create_engine(connection)
+        sqla_models, sql_functions = reflect_sqla_models(engine=sqla_engine, schema=schema)
 
     # Convert sqla models to graphql schema
     gql_schema = sqla_models_to_graphql_schema(
@@ -40,6 +177,30 @@ def create_app(
 
     graphql_path = "/"
 
+    document_cache = DocumentCache(gql_schema, maxsize=Config.DOCUMENT_CACHE_SIZE)
+    plan_cache = PlanCache(maxsize=Config.PLAN_CACHE_SIZE)
+
+    if admission_controller is None and Config.MAX_CONCURRENCY is not None:
+        admission_controller = AdmissionController(
+            max_concurrency=Config.MAX_CONCURRENCY,
+            max_queue=Config.MAX_QUEUE,
+            max_wait=Config.MAX_QUEUE_WAIT,
+            max_per_tenant=Config.MAX_CONCURRENCY_PER_TENANT,
+        )
+
+    result_cache = (
+        ResultCache(
+            engine,
+            dsn=connection,
+            ttl=result_cache_ttl,
+            stale_while_revalidate=result_cache_stale_while_revalidate,
+            maxsize=Config.RESULT_CACHE_SIZE,
+            schema=schema,
+        )
+        if result_cache_ttl is not None
+        else None
+    )
+
     graphql_route = get_graphql_route(
         gql_schema=gql_schema,
         engine=engine,
@@ -47,16 +208,66 @@ def create_app(
         default_role=default_role,
         path=graphql_path,
         name="graphql",
+        document_cache=document_cache,
+        plan_cache=plan_cache,
+        cache_control_max_age=cache_control_max_age,
+        json_passthrough=json_passthrough,
+        stream_connections=stream_connections,
+        result_cache=result_cache,
+        query_cost_limits=query_cost_limits,
+        expose_query_cost=expose_query_cost,
+        admission_controller=admission_controller,
+        admission_tenant_claim=Config.TENANT_CLAIM,
+        replica_router=replica_router,
+        fold_claims=fold_claims,
+        native_backend=native_backend,
     )
 
+    startup = [*([native_backend.start] if native_backend else []), *([result_cache.start] if result_cache else [])]
+    _warmup = None
+    if warmup:
+        warmup_documents = None
+        if warmup_queries is not None:
+            with open(warmup_queries, "r") as warmup_file:
+                warmup_documents = Warmup.parse_documents(warmup_file.read())
+
+        _warmup = Warmup(
+            engines=[engine],
+            read_only_engines=replica_router.replicas if replica_router else [],
+            connections=pool_size,
+            gql_schema=gql_schema,
+            type_names=get_custom_type_names(sqla_models, sql_functions),
+            documents=warmup_documents,
+            default_role=default_role,
+            plan_cache=plan_cache,
+        )
+        startup.insert(0, _warmup.run)
+
     graphiql_route = get_graphiql_route(graphiql_path="/graphiql", graphql_path=graphql_path, name="graphiql")
 
+    middleware = [Middleware(CORSMiddleware, allow_origins=["*"])]
+    if compression_minimum_size is not None and compression_minimum_size >= 0:
+        middleware.append(Middleware(CompressionMiddleware, minimum_size=compression_minimum_size))
+
     _app = Starlette(
         routes=[graphql_route, graphiql_route],
-        middleware=[Middleware(CORSMiddleware, allow_origins=["*"])],
+        middleware=middleware,
         exception_handlers={HTTPException: http_exception},
-        on_startup=[engine.connect],
-        on_shutdown=[engine.dispose],
+        on_startup=startup,
+        on_shutdown=[
+            *([result_cache.stop] if result_cache else []),
+            *([native_backend.stop] if native_backend else []),
+            *([replica_router.dispose] if replica_router else []),
+            engine.dispose,
+        ],
     )
+    _app.state.engine = engine
+    _app.state.document_cache = document_cache
+    _app.state.plan_cache = plan_cache
+    _app.state.result_cache = result_cache
+    _app.state.admission_controller = admission_controller
+    _app.state.replica_router = replica_router
+    _app.state.native_backend = native_backend
+    _app.state.warmup = _warmup
 
     return _app
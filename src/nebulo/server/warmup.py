@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing
+from inspect import isawaitable
+
+from graphql import DocumentNode, OperationDefinitionNode, OperationType, execute, parse
+from nebulo.gql.alias import Schema
+from nebulo.gql.resolve.resolvers.transaction import SharedTransaction, set_claims
+from nebulo.gql.resolve.transpile.plan_cache import PlanCache
+from nebulo.sql.composite import CompositeType
+from nebulo.sql.reflection.function import SQLFunction
+from nebulo.sql.table_base import TableProtocol
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.sql.type_api import TypeEngine
+
+__all__ = ["Warmup", "get_custom_type_names"]
+
+logger = logging.getLogger(__name__)
+
+
+def to_custom_type_name(sqla_type: typing.Any, default_schema: typing.Optional[str]) -> typing.Optional[str]:
+    """Qualified name of an enum or composite type, or None for other types"""
+    while isinstance(sqla_type, postgresql.ARRAY):
+        sqla_type = sqla_type.item_type
+    # Function signatures hold type classes and columns hold type instances
+    if isinstance(sqla_type, CompositeType) or (isinstance(sqla_type, type) and issubclass(sqla_type, CompositeType)):
+        return f'"{sqla_type.pg_schema}"."{sqla_type.pg_name}"'
+    if isinstance(sqla_type, postgresql.ENUM) and sqla_type.name:
+        schema = sqla_type.schema or default_schema
+        return f'"{schema}"."{sqla_type.name}"' if schema else f'"{sqla_type.name}"'
+    return None
+
+
+def get_custom_type_names(
+    sqla_models: typing.List[TableProtocol], sql_functions: typing.List[SQLFunction]
+) -> typing.List[str]:
+    """Qualified names of the enum and composite types used by tables and functions"""
+    sqla_types: typing.List[typing.Tuple[typing.Union[TypeEngine, typing.Type[TypeEngine]], typing.Optional[str]]] = []
+    for sqla_model in sqla_models:
+        table = sqla_model.__table__
+        sqla_types.extend((column.type, table.schema) for column in table.columns)
+    for sql_function in sql_functions:
+        sqla_types.extend((x, sql_function.schema) for x in sql_function.arg_sqla_types)
+        sqla_types.append((sql_function.return_sqla_type, sql_function.schema))
+
+    type_names = [to_custom_type_name(sqla_type, schema) for sqla_type, schema in sqla_types]
+    return sorted({x for x in type_names if x is not None})
+
+
+class Warmup:
+    """Opens pool connections before the app starts serving requests
+
+    *connections* are opened on each of *engines* and *read_only_engines* (replicas).
+    On each connection, asyncpg's codecs for *type_names* are loaded and the statements
+    executed by *documents* (e.g. the most frequent queries) are prepared, with the
+    default role's claims. Work is rolled back. Their compiled SQL is stored in *plan_cache*.
+
+    Failures are logged rather than raised so an unreachable database does not stop the app
+    from starting
+    """
+
+    def __init__(
+        self,
+        engines: typing.List[AsyncEngine],
+        connections: int,
+        gql_schema: Schema,
+        type_names: typing.List[str],
+        documents: typing.Optional[typing.List[DocumentNode]] = None,
+        default_role: typing.Optional[str] = None,
+        timeout: float = 30,
+        read_only_engines: typing.Optional[typing.List[AsyncEngine]] = None,
+        plan_cache: typing.Optional[PlanCache] = None,
+    ):
+        self.engines = engines
+        self.read_only_engines = read_only_engines or []
+        self.connections = connections
+        self.gql_schema = gql_schema
+        self.type_names = type_names
+        self.documents = documents or []
+        self.default_role = default_role
+        self.timeout = timeout
+        self.plan_cache = plan_cache
+        self.is_complete = False
+
+    @staticmethod
+    def parse_documents(source: str) -> typing.List[DocumentNode]:
+        """Split a GraphQL document into one document per query operation
+
+        Mutations and subscriptions are skipped. Warmup must not write, even in a transaction that is rolled back
+        """
+        document = parse(source)
+        operations = [x for x in document.definitions if isinstance(x, OperationDefinitionNode)]
+        fragments = [x for x in document.definitions if not isinstance(x, OperationDefinitionNode)]
+        for operation in operations:
+            if operation.operation != OperationType.QUERY:
+                name = operation.name.value if operation.name else "anonymous"
+                logger.warning("Warmup skipped %s operation %s", operation.operation.value, name)
+        return [
+            DocumentNode(definitions=[operation, *fragments])
+            for operation in operations
+            if operation.operation == OperationType.QUERY
+        ]
+
+    async def run(self) -> None:
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    *[self.warm_engine(engine, read_only=False) for engine in self.engines],
+                    *[self.warm_engine(engine, read_only=True) for engine in self.read_only_engines],
+                ),
+                timeout=self.timeout,
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            logger.warning("Warmup did not complete: %s", error)
+        self.is_complete = True
+
+    async def warm_engine(self, engine: AsyncEngine, read_only: bool) -> None:
+        # Every connection is held until all are open so each task checks out a new one
+        opened: typing.List[None] = []
+        all_open = asyncio.Event()
+
+        async def warm() -> None:
+            try:
+                async with engine.connect() as connection:
+                    opened.append(None)
+                    if len(opened) == self.connections:
+                        all_open.set()
+                    await self.warm_connection(connection, read_only)
+                    await all_open.wait()
+            except BaseException:
+                # Don't leave the other connections waiting
+                all_open.set()
+                raise
+
+        await asyncio.gather(*[warm() for _ in range(self.connections)])
+
+    async def warm_connection(self, connection: AsyncConnection, read_only: bool) -> None:
+        async with connection.begin() as trans:
+            if read_only:
+                await connection.exec_driver_sql("set transaction read only")
+
+            if self.type_names:
+                try:
+                    async with connection.begin_nested():
+                        # Loads the codec for each type
+                        await connection.exec_driver_sql("select " + ", ".join(f"null::{x}" for x in self.type_names))
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.warning("Warmup could not load type codecs: %s", error)
+
+            jwt_claims: typing.Dict[str, typing.Any] = {}
+            await set_claims(connection, jwt_claims, self.default_role)
+            context = {
+                "engine": connection.engine,
+                "jwt_claims": jwt_claims,
+                "default_role": self.default_role,
+                "transaction": SharedTransaction(connection),
+                "plan_cache": self.plan_cache,
+            }
+            for document in self.documents:
+                result = execute(schema=self.gql_schema, document=document, context_value=dict(context))
+                if isawaitable(result):
+                    result = await result
+                for error in result.errors or []:
+                    logger.warning("Warmup query failed: %s", error)
+            await trans.rollback()
@@ -5,7 +5,7 @@ from functools import lru_cache
 from typing import Callable, List, Optional, Union
 
 from nebulo.sql.table_base import TableProtocol
-from sqlalchemy import Column, ForeignKeyConstraint, Table
+from sqlalchemy import Column, ForeignKeyConstraint, PrimaryKeyConstraint, Table, UniqueConstraint
 from sqlalchemy import inspect as sql_inspect
 from sqlalchemy.orm import Mapper, RelationshipProperty
 from sqlalchemy.sql.schema import Constraint
@@ -41,6 +41,13 @@ def get_constraints(entity: Union[TableProtocol, Table]) -> List[Constraint]:
     return list(to_table(entity).constraints)
 
 
+@lru_cache()
+def get_unique_constraints(entity: Union[TableProtocol, Table]) -> List[Union[PrimaryKeyConstraint, UniqueConstraint]]:
+    """Retrieve the primary key, first, and unique constraints from a table"""
+    constraints = [x for x in get_constraints(entity) if isinstance(x, (PrimaryKeyConstraint, UniqueConstraint))]
+    return sorted([x for x in constraints if len(x.columns) > 0], key=lambda x: not isinstance(x, PrimaryKeyConstraint))
+
+
 @lru_cache()
 def is_nullable(relationship: RelationshipProperty) -> bool:
     """Checks if a sqlalchemy orm relationship is nullable"""
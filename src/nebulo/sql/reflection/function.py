@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from itertools import zip_longest
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from nebulo.exceptions import SQLParseError
 from sqlalchemy import cast, func
@@ -56,6 +56,11 @@ class SQLFunction:
 
 def reflect_functions(engine: Engine, schema: str, type_map: Dict) -> List[SQLFunction]:
     """Get a list of functions available in the database"""
+    return to_sql_functions(reflect_function_rows(engine=engine, schema=schema), type_map=type_map)
+
+
+def reflect_function_rows(engine: Engine, schema: str) -> List[Tuple]:
+    """Get the catalog entries describing functions available in the database"""
 
     # TODO: Support default arguments
     # I haven't been able to find a way to get an array of default args
@@ -104,7 +109,11 @@ def reflect_functions(engine: Engine, schema: str, type_map: Dict) -> List[SQLFu
         and n.nspname like :schema
         """
     )
-    rows = engine.execute(sql, schema=schema).fetchall()
+    return [tuple(row) for row in engine.execute(sql, schema=schema).fetchall()]
+
+
+def to_sql_functions(rows: List[Tuple], type_map: Dict) -> List[SQLFunction]:
+    """Build SQLFunctions from catalog entries collected by reflect_function_rows"""
 
     functions: List[SQLFunction] = []
 
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import io
+import pickle
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from nebulo.sql.composite import CompositeType, composite_type_factory
+from nebulo.sql.inspect import get_constraints
+from nebulo.sql.reflection.constraint_comments import populate_constraint_comment
+from nebulo.sql.reflection.function import reflect_function_rows
+from nebulo.sql.reflection.statistics import populate_table_statistics
+from nebulo.sql.reflection.types import reflect_composites
+from nebulo.sql.reflection.views import reflect_view_tables
+from sqlalchemy import MetaData
+from sqlalchemy.dialects.postgresql import base as pg_base
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.type_api import TypeEngine
+
+__all__ = ["ReflectionSnapshot", "reflect_snapshot", "dump_snapshot", "load_snapshot"]
+
+
+# Incremented when the layout of ReflectionSnapshot changes
+SNAPSHOT_VERSION = 1
+
+
+class ReflectionSnapshot(NamedTuple):
+    """Everything read from the database's catalog during reflection
+
+    SQLAlchemy models and functions can be built from a snapshot without a database
+    connection, see nebulo.sql.reflection.manager.sqla_models_from_snapshot
+    """
+
+    schema: str
+    metadata: MetaData
+    composites: Dict[Tuple[str, str], TypeEngine]
+    # Keys of the Tables in metadata that are views
+    view_keys: List[str]
+    function_rows: List[Tuple]
+
+
+def reflect_snapshot(engine: Engine, schema: str = "public") -> ReflectionSnapshot:
+    """Read tables, views, composite types, functions, constraint comments and
+    table statistics from the database"""
+
+    metadata = MetaData()
+
+    # Reflect composite types (not supported by sqla)
+    composites = reflect_composites(engine, schema, pg_base.ischema_names.copy())
+
+    # Register composite types with SQLA to make them available during reflection
+    register_composites(composites)
+
+    # Reflect views as tables with virtual constraints
+    view_tables = reflect_view_tables(engine=engine, schema=schema, metadata=metadata)
+
+    # Equivalent to AutomapBase.prepare(engine, reflect=True)
+    metadata.reflect(engine, schema=schema, extend_existing=True, autoload_replace=False)
+
+    function_rows = reflect_function_rows(engine=engine, schema=schema)
+
+    # Populate constraint.info['comment'] for constraint comments becasue
+    # sqlalchemy does not support constraint comment reflection
+    # https://github.com/sqlalchemy/sqlalchemy/issues/5667
+    tables = list(metadata.tables.values())
+    for table in tables:
+        for constraint in get_constraints(table):
+            populate_constraint_comment(engine=engine, constraint=constraint)
+
+    # Populate table.info['reltuples'] with the planner's row estimate for query cost analysis
+    populate_table_statistics(engine=engine, schema=schema, tables=tables)
+
+    return ReflectionSnapshot(
+        schema=schema,
+        metadata=metadata,
+        composites=composites,
+        view_keys=[x.key for x in view_tables],
+        function_rows=function_rows,
+    )
+
+
+def register_composites(composites: Dict[Tuple[str, str], TypeEngine]) -> None:
+    """Register composite types with SQLA's type map"""
+    pg_base.ischema_names.update({type_name: type_ for (type_schema, type_name), type_ in composites.items()})
+
+
+class SnapshotPickler(pickle.Pickler):
+    """Pickles composite types, which are classes created at runtime, by their definition"""
+
+    def reducer_override(self, obj: Any) -> Any:
+        if isinstance(obj, type) and issubclass(obj, CompositeType) and obj is not CompositeType:
+            return composite_type_factory, (obj.name, obj.columns, obj.pg_name, obj.pg_schema)
+        return NotImplemented
+
+
+def dump_snapshot(snapshot: ReflectionSnapshot) -> bytes:
+    """Serialize a snapshot e.g. to share it with worker processes"""
+    buffer = io.BytesIO()
+    SnapshotPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump((SNAPSHOT_VERSION, snapshot))
+    return buffer.getvalue()
+
+
+def load_snapshot(data: bytes) -> ReflectionSnapshot:
+    """Deserialize a snapshot created by dump_snapshot
+
+    Only load snapshots from a trusted source. Unpickling can execute arbitrary code
+    """
+    version, snapshot = pickle.loads(data)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported reflection snapshot version {version}")
+    register_composites(snapshot.composites)
+    return snapshot
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Union
+
+from nebulo.sql.inspect import to_table
+from nebulo.sql.table_base import TableProtocol
+from sqlalchemy import Table
+from sqlalchemy import text as sql_text
+from sqlalchemy.engine import Engine
+
+__all__ = ["populate_table_statistics"]
+
+
+TableName = str
+
+
+def populate_table_statistics(engine: Engine, schema: str, tables: Iterable[Union[TableProtocol, Table]]) -> None:
+    """Adds the planner's estimated row count for each table to the
+    SQLAlchemy table's Table.info['reltuples'] dictionary
+
+    Tables that have never been vacuumed or analyzed have no estimate and are stored as None
+    """
+    reltuples_map = reflect_reltuples(engine=engine, schema=schema)
+
+    for table in tables:
+        core_table = to_table(table)
+        reltuples = reltuples_map.get(core_table.name)
+        # -1 (or 0 prior to PostgreSQL 14) indicates statistics have not been collected
+        core_table.info["reltuples"] = reltuples if reltuples is not None and reltuples > 0 else None
+
+
+def reflect_reltuples(engine: Engine, schema: str) -> Dict[TableName, float]:
+    """Collect a mapping of table name to estimated row count"""
+
+    sql = sql_text(
+        """
+    select
+            c.relname tablename,
+            c.reltuples
+    from pg_class c
+    where
+            c.relnamespace::regnamespace::text = :schema
+            and c.relkind in ('r', 'p', 'v', 'm', 'f')
+    """
+    )
+
+    results = engine.execute(sql, schema=schema).fetchall()
+    return {table_name: float(reltuples) for table_name, reltuples in results}
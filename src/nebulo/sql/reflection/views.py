@@ -6,7 +6,7 @@ from typing import List
 from nebulo.sql.reflection.names import rename_table
 from nebulo.sql.table_base import TableProtocol
 from parse import parse
-from sqlalchemy import ForeignKeyConstraint, PrimaryKeyConstraint, Table
+from sqlalchemy import ForeignKeyConstraint, MetaData, PrimaryKeyConstraint, Table
 from sqlalchemy import text as sql_text
 
 
@@ -18,6 +18,12 @@ class ViewMixin:
 
 def reflect_views(engine, schema, declarative_base) -> List[TableProtocol]:
     """Reflect SQLAlchemy ORM Tables from the database"""
+    view_tables = reflect_view_tables(engine=engine, schema=schema, metadata=declarative_base.metadata)
+    return [to_view_model(declarative_base, view_tab) for view_tab in view_tables]
+
+
+def reflect_view_tables(engine, schema, metadata: MetaData) -> List[Table]:
+    """Reflect SQLAlchemy Core Tables for each view in the database"""
 
     sql = sql_text(
         """
@@ -36,7 +42,7 @@ def reflect_views(engine, schema, declarative_base) -> List[TableProtocol]:
     )
     rows = engine.execute(sql, schema=schema).fetchall()
 
-    views: List[TableProtocol] = []
+    view_tables: List[Table] = []
 
     for view_name, view_comment in rows:
         primary_key_constraint = reflect_virtual_primary_key_constraint(view_comment)
@@ -45,28 +51,32 @@ def reflect_views(engine, schema, declarative_base) -> List[TableProtocol]:
         # Reflect view as base table
         view_tab = Table(
             view_name,
-            declarative_base.metadata,
+            metadata,
             schema=schema,
             autoload=True,
             autoload_with=engine,
             *[primary_key_constraint],
             *foreign_key_constraints,
         )
+        view_tables.append(view_tab)
 
-        class_name = rename_table(declarative_base, view_name, view_tab)
+    return view_tables
 
-        # ORM View Table
-        view_orm = type(
-            class_name,
-            (
-                declarative_base,
-                ViewMixin,
-            ),
-            {"__table__": view_tab},
-        )
-        views.append(view_orm)  # type: ignore
 
-    return views
+def to_view_model(declarative_base, view_tab: Table) -> TableProtocol:
+    """Map a view's Table to an ORM class"""
+    class_name = rename_table(declarative_base, view_tab.name, view_tab)
+
+    # ORM View Table
+    view_orm = type(
+        class_name,
+        (
+            declarative_base,
+            ViewMixin,
+        ),
+        {"__table__": view_tab},
+    )
+    return view_orm  # type: ignore
 
 
 def reflect_virtual_primary_key_constraint(comment: str) -> PrimaryKeyConstraint:
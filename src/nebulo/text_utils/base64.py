@@ -1,9 +1,7 @@
 from base64 import b64decode as _unbase64
 from base64 import b64encode as _base64
 
-import sqlalchemy
-from sqlalchemy import cast, func
-from sqlalchemy.dialects.postgresql import BYTEA
+from sqlalchemy import func, literal_column
 
 
 def to_base64(string):
@@ -15,5 +13,8 @@ def from_base64(string):
 
 
 def to_base64_sql(text_to_encode):
-    encoding = "base64"
-    return func.encode(cast(text_to_encode, BYTEA()), cast(encoding, sqlalchemy.Text()))
+    """SQL equivalent of to_base64"""
+    encoding = literal_column("'base64'")
+    encoded = func.encode(func.convert_to(text_to_encode, literal_column("'utf8'")), encoding)
+    # PostgreSQL wraps base64 output every 76 characters
+    return func.translate(encoded, literal_column("E'\\n'"), literal_column("''"))
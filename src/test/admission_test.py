@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from nebulo.server.admission import AdmissionController, ServiceUnavailable
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (id, name) VALUES
+(1, 'oliver');
+"""
+
+QUERY = "{ allAccounts { edges { node { name } } } }"
+
+
+def run_until_complete(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_admission_server_timing(client_builder):
+    admission_controller = AdmissionController(max_concurrency=1)
+    client = client_builder(SQL_UP, admission_controller=admission_controller)
+    resp = client.post("/", json={"query": QUERY})
+    assert resp.status_code == 200
+    assert resp.headers["Server-Timing"].startswith("admission;dur=")
+
+    stats = admission_controller.stats()
+    assert stats.admitted == 1
+    assert stats.in_flight == 0
+
+
+def test_admission_disabled_by_default(client_builder):
+    client = client_builder(SQL_UP)
+    resp = client.post("/", json={"query": QUERY})
+    assert resp.status_code == 200
+    assert "Server-Timing" not in resp.headers
+    assert client.app.state.admission_controller is None
+
+
+def test_admission_rejects_when_queue_full(client_builder):
+    admission_controller = AdmissionController(max_concurrency=1, max_queue=0, max_wait=2)
+    client = client_builder(SQL_UP, admission_controller=admission_controller)
+
+    # Requests admitted without waiting are not queued
+    resp = client.post("/", json={"query": QUERY})
+    assert resp.status_code == 200
+
+    # Hold the only slot so the next request would have to wait
+    ticket = run_until_complete(admission_controller.acquire("anonymous"))
+    resp = client.post("/", json={"query": QUERY})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "2"
+    admission_controller.release(ticket)
+
+    stats = admission_controller.stats()
+    assert stats.rejected == 1
+    assert stats.admitted == 2
+    assert stats.in_flight == 0
+
+
+def test_admission_times_out():
+    async def run():
+        admission_controller = AdmissionController(max_concurrency=1, max_queue=10, max_wait=0.01)
+        ticket = await admission_controller.acquire("anon")
+        with pytest.raises(ServiceUnavailable):
+            await admission_controller.acquire("anon")
+        admission_controller.release(ticket)
+        admission_controller.release(await admission_controller.acquire("anon"))
+        return admission_controller.stats()
+
+    stats = run_until_complete(run())
+    assert stats.timed_out == 1
+    assert stats.admitted == 2
+    assert stats.in_flight == 0
+    assert stats.queued == 0
+
+
+def test_admission_per_tenant_limit():
+    async def run():
+        admission_controller = AdmissionController(max_concurrency=3, max_queue=10, max_wait=0.01, max_per_tenant=1)
+        busy = await admission_controller.acquire("busy")
+        # The busy tenant is at its quota while others are still admitted
+        with pytest.raises(ServiceUnavailable):
+            await admission_controller.acquire("busy")
+        other = await admission_controller.acquire("other")
+        admission_controller.release(busy)
+        admission_controller.release(other)
+        return admission_controller
+
+    admission_controller = run_until_complete(run())
+    assert admission_controller.stats().in_flight == 0
+    # Idle tenants are discarded
+    assert not admission_controller._tenant_slots  # pylint: disable=protected-access
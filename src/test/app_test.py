@@ -3,6 +3,8 @@ from __future__ import annotations
 import json
 import typing
 
+import pytest
+
 if typing.TYPE_CHECKING:
     from starlette.applications import Starlette
 
@@ -84,3 +86,21 @@ def test_app_serves_mutation_function(client_builder):
     payload = json.loads(resp.text)
     assert "data" in payload
     assert payload["data"]["toLower"] == "abc"
+
+
+def test_app_pool_settings(client_builder):
+    client = client_builder(
+        SQL_UP, pool_size=2, max_overflow=1, prepared_statement_cache_size=0, command_timeout=10, pool_pre_ping=True
+    )
+    # Admission is opt-in
+    assert client.app.state.admission_controller is None
+
+    with client:
+        resp = client.post("/", json={"query": "{ allAccounts { totalCount } }"})
+    assert resp.status_code == 200
+    assert json.loads(resp.text)["data"]["allAccounts"]["totalCount"] == 4
+
+
+def test_app_rejects_invalid_pool_size(app_builder):
+    with pytest.raises(ValueError):
+        app_builder(SQL_UP, pool_size=0)
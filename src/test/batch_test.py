@@ -0,0 +1,75 @@
+import json
+
+import jwt
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (name) VALUES
+('oliver'),
+('rachel');
+
+CREATE FUNCTION whoami() returns text as
+$$ select current_setting('jwt.claims.email', true) $$ language sql immutable;
+"""
+
+QUERY = "{ allAccounts { totalCount } }"
+
+CREATE = 'mutation { createAccount(input: {account: {name: "Buddy"}}) { account { name } } }'
+
+CREATE_INVALID = "mutation { createAccount(input: {account: {name: null}}) { account { name } } }"
+
+
+def test_batch_executes_in_order(client_builder):
+    client = client_builder(SQL_UP)
+    batch = [
+        {"query": QUERY},
+        {"query": CREATE},
+        {"query": QUERY},
+        {"query": "{ notAField }"},
+    ]
+
+    with client:
+        resp = client.post("/", json=batch)
+    assert resp.status_code == 200
+    payload = json.loads(resp.text)
+    print(payload)
+
+    assert isinstance(payload, list)
+    assert len(payload) == 4
+    assert payload[0]["data"]["allAccounts"]["totalCount"] == 2
+    assert payload[1]["data"]["createAccount"]["account"]["name"] == "Buddy"
+    # Later operations see earlier writes
+    assert payload[2]["data"]["allAccounts"]["totalCount"] == 3
+    assert payload[3]["data"] is None
+    assert len(payload[3]["errors"]) == 1
+
+
+def test_batch_failed_operation_does_not_abort_batch(client_builder):
+    client = client_builder(SQL_UP)
+    batch = [{"query": CREATE_INVALID}, {"query": CREATE}, {"query": QUERY}]
+
+    with client:
+        resp = client.post("/", json=batch)
+        payload = json.loads(resp.text)
+        print(payload)
+        assert len(payload[0]["errors"]) == 1
+        assert payload[1]["errors"] == []
+        assert payload[2]["data"]["allAccounts"]["totalCount"] == 3
+
+        # Successful operations are committed
+        resp = client.post("/", json={"query": QUERY})
+        assert json.loads(resp.text)["data"]["allAccounts"]["totalCount"] == 3
+
+
+def test_batch_shares_claims(client_builder):
+    client = client_builder(SQL_UP, jwt_identifier="public.jwt_token", jwt_secret="secret")
+    token = jwt.encode({"email": "o@r.com"}, "secret", algorithm="HS256").decode("utf-8")
+
+    with client:
+        resp = client.post("/", json=[{"query": "{ whoami }"}] * 2, headers={"Authorization": f"Bearer {token}"})
+    payload = json.loads(resp.text)
+    assert [x["data"]["whoami"] for x in payload] == ["o@r.com", "o@r.com"]
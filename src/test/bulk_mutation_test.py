@@ -0,0 +1,170 @@
+import json
+
+from nebulo.config import Config
+from nebulo.gql.relay.node_interface import NodeIdStructure
+from nebulo.gql.resolve.transpile.mutation_builder import MAX_BIND_PARAMS, to_chunk_size
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null,
+    age int not null default 10
+);
+
+CREATE TABLE blog (
+    id serial primary key,
+    account_id int not null references account(id),
+    title text not null
+);
+
+INSERT INTO account (name) VALUES
+('oliver'),
+('rachel');
+
+INSERT INTO blog (account_id, title) VALUES
+(1, 'first');
+"""
+
+
+def to_node_id(account_id: int) -> str:
+    return NodeIdStructure(table_name="account", values={"id": account_id}).serialize()
+
+
+def test_create_many(client_builder, monkeypatch, capture_statements):
+    monkeypatch.setattr(Config, "BULK_MUTATION_CHUNK_SIZE", 2)
+    client = client_builder(SQL_UP)
+    statements = capture_statements(client)
+    query = """
+    mutation {
+        createManyAccounts(input: {
+            clientMutationId: "abc",
+            accounts: [{name: "sophie"}, {name: "buddy", age: 5}, {name: "ted"}, {name: "alice"}]
+        }) {
+            cid: clientMutationId
+            nodeIds
+            accounts { name age }
+        }
+    }
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query})
+    payload = json.loads(resp.text)
+    assert payload["errors"] == []
+    result = payload["data"]["createManyAccounts"]
+    assert result["cid"] == "abc"
+    assert result["nodeIds"] == [to_node_id(x) for x in range(3, 7)]
+    assert [(x["name"], x["age"]) for x in result["accounts"]] == [
+        ("sophie", 10),
+        ("buddy", 5),
+        ("ted", 10),
+        ("alice", 10),
+    ]
+    # Two chunks of two rows
+    assert len(statements) == 2
+
+
+def test_update_many(client_builder):
+    client = client_builder(SQL_UP)
+    query = f"""
+    mutation {{
+        updateManyAccounts(input: {{
+            accounts: [
+                {{nodeId: "{to_node_id(2)}", account: {{name: "RACHEL"}}}},
+                {{nodeId: "{to_node_id(1)}", account: {{name: "OLIVER", age: 30}}}}
+            ]
+        }}) {{
+            accounts {{
+                name
+                age
+                blogsByIdToAccountId {{ edges {{ node {{ title }} }} }}
+            }}
+        }}
+    }}
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query})
+    payload = json.loads(resp.text)
+    assert payload["errors"] == []
+    accounts = payload["data"]["updateManyAccounts"]["accounts"]
+    # In input order, not primary key order
+    assert [(x["name"], x["age"]) for x in accounts] == [("RACHEL", 10), ("OLIVER", 30)]
+    assert accounts[1]["blogsByIdToAccountId"]["edges"] == [{"node": {"title": "first"}}]
+
+
+def test_update_many_rejects_repeated_node_ids(client_builder):
+    client = client_builder(SQL_UP)
+    query = f"""
+    mutation {{
+        updateManyAccounts(input: {{
+            accounts: [
+                {{nodeId: "{to_node_id(1)}", account: {{name: "OLIVER"}}}},
+                {{nodeId: "{to_node_id(1)}", account: {{age: 30}}}}
+            ]
+        }}) {{
+            nodeIds
+        }}
+    }}
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query})
+    payload = json.loads(resp.text)
+    assert payload["data"]["updateManyAccounts"] is None
+    assert payload["errors"][0]["message"] == f"nodeId {to_node_id(1)} is patched more than once"
+
+
+def test_update_many_fails_for_missing_rows(client_builder):
+    client = client_builder(SQL_UP)
+    query = f"""
+    mutation {{
+        updateManyAccounts(input: {{
+            accounts: [
+                {{nodeId: "{to_node_id(1)}", account: {{name: "OLIVER"}}}},
+                {{nodeId: "{to_node_id(99)}", account: {{name: "MISSING"}}}}
+            ]
+        }}) {{
+            nodeIds
+        }}
+    }}
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query})
+        payload = json.loads(resp.text)
+        assert payload["data"]["updateManyAccounts"] is None
+        assert payload["errors"][0]["message"] == f"No rows found for nodeIds {to_node_id(99)}"
+
+        # The rows that were found are not updated either
+        resp = client.post("/", json={"query": "{ allAccounts { edges { node { name } } } }"})
+        names = [x["node"]["name"] for x in json.loads(resp.text)["data"]["allAccounts"]["edges"]]
+        assert names == ["oliver", "rachel"]
+
+
+def test_delete_many(client_builder):
+    client = client_builder(SQL_UP)
+    node_id = NodeIdStructure(table_name="blog", values={"id": 1}).serialize()
+    query = f"""
+    mutation {{
+        deleteManyBlogs(input: {{nodeIds: ["{node_id}"]}}) {{ nodeIds }}
+    }}
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query})
+        payload = json.loads(resp.text)
+        assert payload["errors"] == []
+        assert len(payload["data"]["deleteManyBlogs"]["nodeIds"]) == 1
+
+        resp = client.post("/", json={"query": "{ allBlogs { totalCount } }"})
+        assert json.loads(resp.text)["data"]["allBlogs"]["totalCount"] == 0
+
+        resp = client.post("/", json={"query": "mutation { deleteManyBlogs(input: {nodeIds: []}) { nodeIds } }"})
+        assert json.loads(resp.text)["data"]["deleteManyBlogs"]["nodeIds"] == []
+
+
+def test_chunk_size_within_bind_param_limit():
+    assert to_chunk_size(params_per_row=2, chunk_size=1000) == 1000
+    assert to_chunk_size(params_per_row=100, chunk_size=1000) * 100 <= MAX_BIND_PARAMS
+    assert to_chunk_size(params_per_row=MAX_BIND_PARAMS * 2, chunk_size=1000) == 1
@@ -25,3 +25,21 @@ def test_cli_schema_dump(app_builder, connection_str):
     assert resp.exit_code == 0
     print(resp.output)
     assert "Query" in resp.output
+
+
+def test_cli_run_rejects_connection_budget(connection_str):
+    runner = CliRunner()
+    resp = runner.invoke(
+        main, ["run", "-c", connection_str, "--workers", "4", "--pool-size", "5", "--max-db-connections", "50"]
+    )
+    assert resp.exit_code != 0
+    assert "60" in resp.output
+
+
+def test_cli_run_counts_replica_pools(connection_str):
+    runner = CliRunner()
+    # 2 databases x 2 pools x (5 + 10) connections
+    args = ["run", "-c", connection_str, "--native-pool", "--replica", connection_str, "--max-db-connections", "59"]
+    resp = runner.invoke(main, args)
+    assert resp.exit_code != 0
+    assert "60" in resp.output
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import importlib
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 import pytest
 from nebulo.gql.sqla_to_gql import sqla_models_to_graphql_schema
@@ -10,7 +10,7 @@ from nebulo.server.starlette import create_app
 from nebulo.sql import table_base
 from nebulo.sql.reflection.constraint_comments import reflect_all_constraint_comments
 from nebulo.sql.reflection.manager import reflect_sqla_models
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import scoped_session, sessionmaker
 from starlette.applications import Starlette
 from starlette.testclient import TestClient
@@ -79,28 +79,47 @@ def schema_builder(session, engine):
 
 
 @pytest.fixture
-def app_builder(connection_str, session) -> Callable[[str, Optional[str], Optional[str]], Starlette]:
-    def build(sql: str, jwt_identifier: Optional[str] = None, jwt_secret: Optional[str] = None) -> Starlette:
+def app_builder(connection_str, session) -> Callable[..., Starlette]:
+    def build(
+        sql: str, jwt_identifier: Optional[str] = None, jwt_secret: Optional[str] = None, **app_kwargs
+    ) -> Starlette:
         session.execute(sql)
         session.commit()
         # Create the schema
-        app = create_app(connection_str, jwt_identifier=jwt_identifier, jwt_secret=jwt_secret)
+        app = create_app(connection_str, jwt_identifier=jwt_identifier, jwt_secret=jwt_secret, **app_kwargs)
         return app
 
     return build
 
 
 @pytest.fixture
-def client_builder(
-    app_builder: Callable[[str, Optional[str], Optional[str]], Starlette]
-) -> Callable[[str, Optional[str], Optional[str]], TestClient]:
+def client_builder(app_builder: Callable[..., Starlette]) -> Callable[..., TestClient]:
     # NOTE: Client must be used as a context manager for on_startup and on_shutdown to execute
     # e.g. connect to the database
 
-    def build(sql: str, jwt_identifier: Optional[str] = None, jwt_secret: Optional[str] = None) -> TestClient:
+    def build(
+        sql: str, jwt_identifier: Optional[str] = None, jwt_secret: Optional[str] = None, **app_kwargs
+    ) -> TestClient:
         importlib.reload(table_base)
-        app = app_builder(sql, jwt_identifier, jwt_secret)
+        app = app_builder(sql, jwt_identifier, jwt_secret, **app_kwargs)
         client = TestClient(app)
         return client
 
     return build
+
+
+@pytest.fixture
+def capture_statements() -> Callable[[TestClient], List[str]]:
+    """Return a function that accepts a client and returns a list
+    the SQL statements executed by its app's engine are appended to"""
+
+    def capture(client: TestClient) -> List[str]:
+        statements: List[str] = []
+        event.listen(
+            client.app.state.engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        return statements
+
+    return capture
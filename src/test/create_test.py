@@ -44,3 +44,42 @@ mutation {
     assert payload["data"]["createAccount"]["account"]["dd"]
     assert payload["data"]["createAccount"]["account"]["name"] == "Buddy"
     assert len(payload["errors"]) == 0
+
+
+SQL_UP_RELATIONSHIP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+CREATE TABLE blog (
+    id serial primary key,
+    account_id int not null references account(id),
+    title text not null
+);
+
+INSERT INTO account (name) VALUES
+('oliver');
+"""
+
+
+def test_create_mutation_reads_back_in_one_statement(client_builder, capture_statements):
+    client = client_builder(SQL_UP_RELATIONSHIP)
+    statements = capture_statements(client)
+    query = """
+    mutation {
+        createBlog(input: {blog: {accountId: 1, title: "first"}}) {
+            blog {
+                title
+                accountByAccountIdToId { name }
+            }
+        }
+    }
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query})
+    payload = json.loads(resp.text)
+    assert payload["errors"] == []
+    assert payload["data"]["createBlog"]["blog"] == {"title": "first", "accountByAccountIdToId": {"name": "oliver"}}
+    assert len(statements) == 1
@@ -0,0 +1,93 @@
+import json
+
+from nebulo.server.document_cache import DocumentCache
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (id, name) VALUES
+(1, 'oliver'),
+(2, 'rachel');
+"""
+
+QUERY = """
+{
+    allAccounts {
+        edges {
+            node {
+                id
+                name
+            }
+        }
+    }
+}
+"""
+
+
+def test_document_cache_hit_and_miss(schema_builder):
+    schema = schema_builder(SQL_UP)
+    cache = DocumentCache(schema, maxsize=2)
+
+    document, errors = cache.get(QUERY)
+    assert document is not None
+    assert errors == []
+
+    cached_document, _ = cache.get(QUERY)
+    assert cached_document is document
+
+    info = cache.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+
+
+def test_document_cache_keeps_comments_apart(schema_builder):
+    schema = schema_builder(SQL_UP)
+    cache = DocumentCache(schema)
+
+    # The newline ending the comment is significant
+    document, _ = cache.get("{\n allAccounts { totalCount } # note\n allAccounts2: allAccounts { totalCount }\n}")
+    assert len(document.definitions[0].selection_set.selections) == 2
+
+    document, _ = cache.get("{ allAccounts { totalCount } # note allAccounts2: allAccounts { totalCount }\n}")
+    assert len(document.definitions[0].selection_set.selections) == 1
+    assert cache.cache_info().misses == 2
+
+
+def test_document_cache_does_not_cache_invalid(schema_builder):
+    schema = schema_builder(SQL_UP)
+    cache = DocumentCache(schema)
+
+    document, errors = cache.get("{ allAccounts { notAField } }")
+    assert document is None
+    assert len(errors) == 1
+
+    document, errors = cache.get("{ allAccounts ")
+    assert document is None
+    assert len(errors) == 1
+
+    assert cache.cache_info().currsize == 0
+
+
+def test_app_reuses_cached_document(client_builder):
+    client = client_builder(SQL_UP)
+
+    with client:
+        for _ in range(3):
+            resp = client.post("/", json={"query": QUERY})
+            assert resp.status_code == 200
+            payload = json.loads(resp.text)
+            assert payload["errors"] == []
+            assert len(payload["data"]["allAccounts"]["edges"]) == 2
+
+        resp = client.post("/", json={"query": "{ allAccounts { notAField } }"})
+        payload = json.loads(resp.text)
+        assert payload["data"] is None
+        assert len(payload["errors"]) == 1
+
+    info = client.app.state.document_cache.cache_info()
+    assert info.hits == 2
+    assert info.misses == 2
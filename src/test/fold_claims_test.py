@@ -0,0 +1,104 @@
+import json
+
+import jwt
+import pytest
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (name) VALUES
+('oliver');
+
+CREATE FUNCTION whoami() returns text as
+$$ select current_setting('jwt.claims.email', true) $$ language sql;
+
+CREATE VIEW whoami_view AS
+SELECT 1 AS id, current_setting('jwt.claims.email', true) AS email;
+
+COMMENT ON VIEW whoami_view IS E'@primary_key (id)';
+"""
+
+WHOAMI = "mutation { whoami(input: {}) { result } }"
+
+CREATE = 'mutation { createAccount(input: {account: {name: "rachel"}}) { account { name } } }'
+
+CREATE_INVALID = "mutation { createAccount(input: {account: {name: null}}) { account { name } } }"
+
+
+def test_fold_claims_sets_claims_without_a_statement(client_builder, capture_statements):
+    client = client_builder(SQL_UP, jwt_identifier="public.jwt_token", jwt_secret="secret", fold_claims=True)
+    statements = capture_statements(client)
+    token = jwt.encode({"email": "o@r.com"}, "secret", algorithm="HS256").decode("utf-8")
+
+    with client:
+        resp = client.post("/", json={"query": WHOAMI}, headers={"Authorization": f"Bearer {token}"})
+        assert json.loads(resp.text)["data"]["whoami"]["result"] == "o@r.com"
+        # Claims were sent with BEGIN rather than as a statement of their own
+        assert len(statements) == 1
+
+        # Claims are local to the transaction
+        resp = client.post("/", json={"query": WHOAMI})
+        assert json.loads(resp.text)["data"]["whoami"]["result"] in (None, "")
+
+
+@pytest.mark.parametrize("native_pool", [False, True])
+def test_fold_claims_preserves_percent_signs(client_builder, native_pool):
+    client = client_builder(
+        SQL_UP, jwt_identifier="public.jwt_token", jwt_secret="secret", fold_claims=True, native_pool=native_pool
+    )
+    token = jwt.encode({"email": "50%_off@x.com"}, "secret", algorithm="HS256").decode("utf-8")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with client:
+        resp = client.post("/", json={"query": WHOAMI}, headers=headers)
+        assert json.loads(resp.text)["data"]["whoami"]["result"] == "50%_off@x.com"
+
+        # Queries are executed on the native pool when it is enabled
+        resp = client.post("/", json={"query": "{ allWhoamiViews { edges { node { email } } } }"}, headers=headers)
+        assert json.loads(resp.text)["data"]["allWhoamiViews"]["edges"] == [{"node": {"email": "50%_off@x.com"}}]
+
+
+def test_fold_claims_commits_and_rolls_back(client_builder):
+    client = client_builder(SQL_UP, fold_claims=True)
+    query = "{ allAccounts { totalCount } }"
+
+    with client:
+        resp = client.post("/", json={"query": CREATE})
+        assert json.loads(resp.text)["data"]["createAccount"]["account"]["name"] == "rachel"
+
+        resp = client.post("/", json={"query": CREATE_INVALID})
+        assert len(json.loads(resp.text)["errors"]) == 1
+
+        resp = client.post("/", json=[{"query": CREATE_INVALID}, {"query": CREATE}, {"query": query}])
+        payload = json.loads(resp.text)
+        assert len(payload[0]["errors"]) == 1
+        assert payload[2]["data"]["allAccounts"]["totalCount"] == 3
+
+        resp = client.post("/", json={"query": query})
+        assert json.loads(resp.text)["data"]["allAccounts"]["totalCount"] == 3
+
+
+def test_fold_claims_rolls_back_failed_claims(client_builder):
+    # A single pooled connection, so the second request reuses the first's connection
+    client = client_builder(
+        SQL_UP,
+        jwt_identifier="public.jwt_token",
+        jwt_secret="secret",
+        fold_claims=True,
+        pool_size=1,
+        max_overflow=0,
+    )
+    query = "{ allAccounts { totalCount } }"
+    token = jwt.encode({"role": "no_such_role"}, "secret", algorithm="HS256").decode("utf-8")
+
+    with client:
+        resp = client.post("/", json={"query": query}, headers={"Authorization": f"Bearer {token}"})
+        assert len(json.loads(resp.text)["errors"]) == 1
+
+        resp = client.post("/", json={"query": query})
+        payload = json.loads(resp.text)
+        assert payload["errors"] == []
+        assert payload["data"]["allAccounts"]["totalCount"] == 1
@@ -57,3 +57,61 @@ def test_integration_function(client_builder):
     assert result["data"]["getAccount"]["out"]["id"] == 1
     assert result["data"]["getAccount"]["out"]["nodeId"] is not None
     assert result["data"]["getAccount"]["cmi"] == "abcdef"
+
+
+CREATE_FUNCTION_WRITES = """
+create table account(
+    id serial primary key,
+    name text not null
+);
+
+create table session(
+    id serial primary key,
+    account_id int not null references account(id)
+);
+
+insert into account (name)
+values ('oli');
+
+create function login(account_name text)
+returns session
+as $$
+    insert into session (account_id)
+    select id from account where name = account_name
+    returning *;
+$$ language sql;
+"""
+
+
+def test_function_returning_row_in_one_statement(client_builder, capture_statements):
+    client = client_builder(CREATE_FUNCTION_WRITES)
+    statements = capture_statements(client)
+    query = """
+    mutation {
+        login(input: {account_name: "%s"}) {
+            result {
+                id
+                accountByAccountIdToId { name }
+            }
+        }
+    }
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query % "oli"})
+        result = json.loads(resp.text)
+        assert result["errors"] == []
+        assert result["data"]["login"]["result"] == {"id": 1, "accountByAccountIdToId": {"name": "oli"}}
+        assert len(statements) == 1
+
+        # No row returned
+        resp = client.post("/", json={"query": query % "nobody"})
+        result = json.loads(resp.text)
+        assert result["errors"] == []
+        assert result["data"]["login"]["result"] is None
+
+        # The function is called when its result is not selected
+        resp = client.post("/", json={"query": 'mutation { login(input: {account_name: "oli"}) { clientMutationId } }'})
+        assert json.loads(resp.text)["errors"] == []
+        resp = client.post("/", json={"query": query % "oli"})
+        assert json.loads(resp.text)["data"]["login"]["result"]["id"] == 3
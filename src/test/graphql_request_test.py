@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from nebulo.server.json_codec import OrjsonCodec, StdlibJSONCodec, get_json_codec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (id, name) VALUES
+(1, 'oliver'),
+(2, 'rachel');
+"""
+
+MULTI_OPERATION_QUERY = """
+query Total { allAccounts { totalCount } }
+query Names { allAccounts { edges { node { name } } } }
+"""
+
+
+@pytest.mark.parametrize("codec", [StdlibJSONCodec()] + ([OrjsonCodec()] if orjson is not None else []))
+def test_json_codec_round_trip(codec):
+    content = {"data": {"name": "ünïcode", "values": [1, 2.5, None, True]}, "errors": []}
+    encoded = codec.dumps(content)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == content
+
+
+def test_get_json_codec():
+    assert get_json_codec("json").name == "json"
+    assert get_json_codec().name == ("orjson" if orjson is not None else "json")
+    with pytest.raises(ValueError):
+        get_json_codec("not_a_codec")
+
+
+def test_operation_name_selects_operation(client_builder):
+    client = client_builder(SQL_UP)
+
+    with client:
+        resp = client.post("/", json={"query": MULTI_OPERATION_QUERY, "operationName": "Total"})
+        payload = json.loads(resp.text)
+        assert payload["data"] == {"allAccounts": {"totalCount": 2}}
+
+        resp = client.get("/", params={"query": MULTI_OPERATION_QUERY, "operationName": "Names"})
+        payload = json.loads(resp.text)
+        assert len(payload["data"]["allAccounts"]["edges"]) == 2
+
+
+def test_application_graphql_content_type(client_builder):
+    client = client_builder(SQL_UP)
+
+    with client:
+        resp = client.post(
+            "/",
+            data="{ allAccounts { totalCount } }",
+            headers={"content-type": "application/graphql"},
+        )
+    assert resp.status_code == 200
+    assert json.loads(resp.text)["data"] == {"allAccounts": {"totalCount": 2}}
+
+
+def test_invalid_request_body(client_builder):
+    client = client_builder(SQL_UP)
+
+    with client:
+        resp = client.post("/", data="{not json", headers={"content-type": "application/json"})
+        assert resp.status_code == 400
+
+        resp = client.post("/", json={"query": "{ allAccounts { totalCount } }", "variables": [1]})
+        assert resp.status_code == 400
@@ -64,3 +64,24 @@ def test_arg_first(client_builder):
     assert len(result["data"]["allAccounts"]["edges"]) == 2
     assert result["data"]["allAccounts"]["edges"][0]["node"]["id"] == 1
     assert result["data"]["allAccounts"]["edges"][1]["node"]["id"] == 2
+
+
+def test_aliased_root_field(client_builder):
+    client = client_builder(SQL_UP)
+    gql_query = """
+    {
+        accounts: allAccounts(first: 2) {
+            total: totalCount
+            edges { node { name } }
+        }
+    }
+    """
+
+    with client:
+        resp = client.post("/", json={"query": gql_query})
+    assert resp.status_code == 200
+
+    result = resp.json()
+    assert result["errors"] == []
+    assert result["data"]["accounts"]["total"] == 4
+    assert [x["node"]["name"] for x in result["data"]["accounts"]["edges"]] == ["oliver", "rachel"]
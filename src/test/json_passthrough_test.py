@@ -0,0 +1,108 @@
+import json
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null,
+    created_at timestamp without time zone default (now() at time zone 'utc')
+);
+
+INSERT INTO account (id, name) VALUES
+(1, 'oliver'),
+(2, 'rachel'),
+(3, 'sophie');
+
+CREATE TABLE offer (
+    id serial primary key,
+    currency text,
+    account_id int not null,
+
+    constraint fk_offer_account_id
+        foreign key (account_id)
+        references account (id)
+);
+
+INSERT INTO offer (currency, account_id) VALUES
+('usd', 2),
+('gbp', 2);
+"""
+
+QUERY = """
+query Accounts($first: Int!) {
+    allAccounts(first: $first) {
+        totalCount
+        pageInfo { hasNextPage startCursor endCursor }
+        edges {
+            cursor
+            node {
+                nodeId
+                id
+                name
+                label: name
+                createdAt
+                offersByIdToAccountId { edges { node { id currency } } }
+            }
+        }
+    }
+}
+"""
+
+
+def test_passthrough_matches_executor(client_builder):
+    with client_builder(SQL_UP) as client:
+        resp = client.post("/", json={"query": QUERY, "variables": {"first": 2}})
+        assert resp.status_code == 200
+        expected = json.loads(resp.text)
+        assert expected["errors"] == []
+
+    # Same database, reflected again for an app with passthrough enabled
+    with client_builder("SELECT 1;", json_passthrough=True) as client:
+        resp = client.post("/", json={"query": QUERY, "variables": {"first": 2}})
+        assert resp.status_code == 200
+        payload = json.loads(resp.text)
+        # json text output, not re-encoded by the executor
+        assert resp.text.startswith('{"data":{"allAccounts" : {')
+
+    assert payload == expected
+    # Keys follow the selection set, as they do in the executor's response
+    assert json.dumps(payload) == json.dumps(expected)
+    assert payload["data"]["allAccounts"]["totalCount"] == 3
+    assert len(payload["data"]["allAccounts"]["edges"]) == 2
+
+
+def test_passthrough_falls_back_to_executor(client_builder):
+    with client_builder(SQL_UP, json_passthrough=True) as client:
+        # Introspection is not handled by passthrough
+        resp = client.post("/", json={"query": "{ allAccounts { edges { node { __typename name } } } }"})
+        assert resp.status_code == 200
+        payload = json.loads(resp.text)
+        assert payload["errors"] == []
+        assert payload["data"]["allAccounts"]["edges"][0]["node"]["__typename"] == "Account"
+
+        # Errors are reported by the executor
+        resp = client.post("/", json={"query": "query ($first: Int!) { allAccounts(first: $first) { totalCount } }"})
+        assert resp.status_code == 200
+        assert json.loads(resp.text)["errors"]
+
+
+def test_passthrough_reports_statement_errors(client_builder, capture_statements):
+    sql = """
+    CREATE VIEW broken AS
+    SELECT 1 AS id, 1 / 0 AS ratio;
+
+    COMMENT ON VIEW broken IS E'@primary_key (id)';
+    """
+    client = client_builder(sql, json_passthrough=True)
+    statements = capture_statements(client)
+
+    with client:
+        resp = client.post("/", json={"query": "{ allBrokens { edges { node { ratio } } } }"})
+        assert resp.status_code == 200
+        payload = json.loads(resp.text)
+
+    assert payload["data"] == {"allBrokens": None}
+    assert len(payload["errors"]) == 1
+    assert "division by zero" in payload["errors"][0]["message"]
+    assert payload["errors"][0]["path"] == ["allBrokens"]
+    # Reported by the executor without executing the statement again
+    assert len(statements) == 1
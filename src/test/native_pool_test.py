@@ -0,0 +1,122 @@
+import json
+
+import jwt
+import pytest
+from nebulo.config import Config
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+CREATE TABLE blog (
+    id serial primary key,
+    account_id int not null references account(id),
+    title text not null
+);
+
+INSERT INTO account (name) VALUES
+('oliver'),
+('rachel');
+
+INSERT INTO blog (account_id, title) VALUES
+(1, 'first'),
+(1, 'second');
+
+CREATE VIEW whoami AS
+SELECT 1 AS id, current_setting('jwt.claims.email', true) AS email;
+
+COMMENT ON VIEW whoami IS E'@primary_key (id)';
+"""
+
+WHOAMI = "{ allWhoamis { edges { node { email } } } }"
+
+QUERY = """{
+    allAccounts(condition: {name: "oliver"}) {
+        edges { node { name blogsByIdToAccountId(first: 1) { totalCount edges { node { title } } } } }
+    }
+}"""
+
+CREATE = 'mutation { createAccount(input: {account: {name: "sophie"}}) { account { name } } }'
+
+
+@pytest.mark.parametrize("fold_claims", [False, True])
+def test_native_pool_executes_queries(client_builder, fold_claims, capture_statements):
+    client = client_builder(
+        SQL_UP,
+        jwt_identifier="public.jwt_token",
+        jwt_secret="secret",
+        native_pool=True,
+        fold_claims=fold_claims,
+    )
+    statements = capture_statements(client)
+    token = jwt.encode({"email": "o@r.com"}, "secret", algorithm="HS256").decode("utf-8")
+
+    with client:
+        resp = client.post("/", json={"query": QUERY})
+        payload = json.loads(resp.text)
+        assert payload["errors"] == []
+        assert payload["data"]["allAccounts"]["edges"] == [
+            {
+                "node": {
+                    "name": "oliver",
+                    "blogsByIdToAccountId": {"totalCount": 2, "edges": [{"node": {"title": "first"}}]},
+                }
+            }
+        ]
+
+        # Claims are set in the native transaction, and are local to it
+        resp = client.post("/", json={"query": WHOAMI}, headers={"Authorization": f"Bearer {token}"})
+        assert json.loads(resp.text)["data"]["allWhoamis"]["edges"] == [{"node": {"email": "o@r.com"}}]
+        resp = client.post("/", json={"query": WHOAMI})
+        assert json.loads(resp.text)["data"]["allWhoamis"]["edges"][0]["node"]["email"] in (None, "")
+
+        # Queries did not go through SQLAlchemy
+        assert statements == []
+
+        # Mutations do, and their writes are visible to the native pool
+        resp = client.post("/", json={"query": CREATE})
+        assert json.loads(resp.text)["data"]["createAccount"]["account"]["name"] == "sophie"
+        assert statements != []
+
+        resp = client.post("/", json={"query": "{ allAccounts { totalCount } }"})
+        assert json.loads(resp.text)["data"]["allAccounts"]["totalCount"] == 3
+
+
+def test_native_pool_errors_and_passthrough(client_builder, monkeypatch, capture_statements):
+    monkeypatch.setattr(Config, "SQL_COMPILER", "text")
+    client = client_builder(SQL_UP, native_pool=True, json_passthrough=True)
+    statements = capture_statements(client)
+
+    with client:
+        resp = client.post("/", json={"query": '{ allBlogs(condition: {title: "second"}) { edges { node { id } } } }'})
+        assert json.loads(resp.text)["data"]["allBlogs"]["edges"] == [{"node": {"id": 2}}]
+
+        resp = client.post("/", json={"query": '{ allAccounts(after: "invalid") { totalCount } }'})
+        assert len(json.loads(resp.text)["errors"]) == 1
+
+    assert statements == []
+    # Pools are closed on shutdown
+    assert client.app.state.native_backend.get_pool(client.app.state.engine) is None
+
+
+def test_native_pool_rolls_back_failed_claims(client_builder):
+    client = client_builder(
+        SQL_UP,
+        jwt_identifier="public.jwt_token",
+        jwt_secret="secret",
+        native_pool=True,
+        fold_claims=True,
+        pool_size=1,
+        max_overflow=0,
+    )
+    query = "{ allAccounts { totalCount } }"
+    token = jwt.encode({"role": "no_such_role"}, "secret", algorithm="HS256").decode("utf-8")
+
+    with client:
+        resp = client.post("/", json={"query": query}, headers={"Authorization": f"Bearer {token}"})
+        assert len(json.loads(resp.text)["errors"]) == 1
+
+        resp = client.post("/", json={"query": query})
+        assert json.loads(resp.text)["data"]["allAccounts"]["totalCount"] == 2
@@ -1,3 +1,5 @@
+import pytest
+from nebulo.config import Config
 from nebulo.gql.relay.node_interface import NodeIdStructure
 
 SQL_UP = """
@@ -58,3 +60,32 @@ def test_invalid_node_id(client_builder):
     result = resp.json()
     assert len(result["errors"]) == 1
     assert "Expected value of type" in str(result["errors"][0])
+
+
+@pytest.mark.parametrize("sql_compiler", ["sqlalchemy", "text"])
+def test_node_id_with_non_ascii_key(client_builder, engine, monkeypatch, sql_compiler):
+    if engine.execute("show server_encoding").scalar() != "UTF8":
+        pytest.skip("requires a UTF8 database")
+    monkeypatch.setattr(Config, "SQL_COMPILER", sql_compiler)
+    sql = """
+    CREATE TABLE tag (
+        name text primary key,
+        color text
+    );
+
+    INSERT INTO tag (name) VALUES
+    ('plain'),
+    ('café "au lait"'),
+    ('party 🎉');
+    """
+    client = client_builder(sql, json_passthrough=True)
+
+    with client:
+        resp = client.post("/", json={"query": "{ allTags { edges { node { nodeId name } } } }"})
+    assert resp.status_code == 200
+
+    nodes = [x["node"] for x in resp.json()["data"]["allTags"]["edges"]]
+    assert len(nodes) == 3
+    # Matches serializing in python, which escapes non-ASCII characters
+    for node in nodes:
+        assert node["nodeId"] == NodeIdStructure(table_name="tag", values={"name": node["name"]}).serialize()
@@ -0,0 +1,93 @@
+import hashlib
+import json
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (id, name) VALUES
+(1, 'oliver'),
+(2, 'rachel');
+"""
+
+QUERY = "{ allAccounts { edges { node { name } } } }"
+
+QUERY_HASH = hashlib.sha256(QUERY.encode("utf-8")).hexdigest()
+
+EXTENSIONS = {"persistedQuery": {"version": 1, "sha256Hash": QUERY_HASH}}
+
+
+def test_persisted_query_registration_round_trip(client_builder):
+    client = client_builder(SQL_UP)
+
+    with client:
+        # Hash only, unknown to the server
+        resp = client.post("/", json={"extensions": EXTENSIONS})
+        assert resp.status_code == 200
+        payload = json.loads(resp.text)
+        assert payload["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+        # Register with the full query
+        resp = client.post("/", json={"query": QUERY, "extensions": EXTENSIONS})
+        assert resp.status_code == 200
+        assert len(json.loads(resp.text)["data"]["allAccounts"]["edges"]) == 2
+
+        # Hash only, now known
+        resp = client.post("/", json={"extensions": EXTENSIONS})
+        assert resp.status_code == 200
+        assert len(json.loads(resp.text)["data"]["allAccounts"]["edges"]) == 2
+
+
+def test_persisted_query_hash_mismatch(client_builder):
+    client = client_builder(SQL_UP)
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": "not a hash"}}
+
+    with client:
+        resp = client.post("/", json={"query": QUERY, "extensions": extensions})
+    assert resp.status_code == 400
+
+
+def test_get_query_with_persisted_query(client_builder):
+    client = client_builder(SQL_UP)
+
+    with client:
+        resp = client.get("/", params={"query": QUERY, "extensions": json.dumps(EXTENSIONS)})
+        assert resp.status_code == 200
+
+        resp = client.get("/", params={"extensions": json.dumps(EXTENSIONS)})
+        assert resp.status_code == 200
+        assert len(json.loads(resp.text)["data"]["allAccounts"]["edges"]) == 2
+
+
+def test_get_rejects_mutation(client_builder):
+    client = client_builder(SQL_UP)
+    mutation = 'mutation { createAccount(input: {account: {name: "Buddy"}}) { clientMutationId } }'
+
+    with client:
+        resp = client.get("/", params={"query": mutation})
+    assert resp.status_code == 405
+
+
+def test_get_cache_headers(client_builder):
+    client = client_builder(SQL_UP, cache_control_max_age=60)
+
+    with client:
+        resp = client.get("/", params={"query": QUERY})
+        assert resp.status_code == 200
+        assert resp.headers["Cache-Control"] == "public, max-age=60"
+        # Compressed and uncompressed representations share the ETag, so it is weak
+        etag = resp.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        resp = client.get("/", params={"query": QUERY}, headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+        # If-None-Match uses the weak comparison
+        resp = client.get("/", params={"query": QUERY}, headers={"If-None-Match": etag[2:]})
+        assert resp.status_code == 304
+
+        # POST responses are not cacheable
+        resp = client.post("/", json={"query": QUERY})
+        assert resp.headers["Cache-Control"] == "no-store"
@@ -0,0 +1,139 @@
+import json
+
+from nebulo.config import Config
+from nebulo.gql.relay.cursor import CursorStructure
+from nebulo.gql.relay.node_interface import NodeIdStructure
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text
+);
+
+CREATE TABLE blog (
+    id serial primary key,
+    account_id int not null references account(id),
+    title text not null
+);
+
+INSERT INTO account (name) VALUES
+('oliver'),
+('rachel'),
+(null);
+
+INSERT INTO blog (account_id, title) VALUES
+(1, 'first'),
+(1, 'second'),
+(2, 'third');
+"""
+
+ACCOUNT = """query ($nodeId: ID!, $first: Int, $after: Cursor) {
+    account(nodeId: $nodeId) {
+        name
+        blogsByIdToAccountId(first: $first, after: $after) { edges { node { title } } }
+    }
+}"""
+
+ALL_ACCOUNTS = """query ($name: String) {
+    allAccounts(condition: {name: $name}) { edges { node { id } } }
+}"""
+
+
+def to_node_id(account_id: int) -> str:
+    return NodeIdStructure(table_name="account", values={"id": account_id}).serialize()
+
+
+def to_cursor(table_name: str, row_id: int) -> str:
+    return CursorStructure(table_name=table_name, values={"id": row_id}).serialize()
+
+
+def test_plan_cache_binds_new_values(client_builder, capture_statements):
+    client = client_builder(SQL_UP)
+    plan_cache = client.app.state.plan_cache
+    statements = capture_statements(client)
+
+    with client:
+        resp = client.post("/", json={"query": ACCOUNT, "variables": {"nodeId": to_node_id(1), "first": 1}})
+        payload = json.loads(resp.text)
+        assert payload["errors"] == []
+        assert payload["data"]["account"] == {
+            "name": "oliver",
+            "blogsByIdToAccountId": {"edges": [{"node": {"title": "first"}}]},
+        }
+        assert plan_cache.cache_info().misses == 1
+
+        resp = client.post("/", json={"query": ACCOUNT, "variables": {"nodeId": to_node_id(2), "first": 5}})
+        payload = json.loads(resp.text)
+        assert payload["errors"] == []
+        assert payload["data"]["account"] == {
+            "name": "rachel",
+            "blogsByIdToAccountId": {"edges": [{"node": {"title": "third"}}]},
+        }
+        info = plan_cache.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+        assert statements[0] == statements[1]
+
+        # Another shape, with a cursor
+        variables = {"nodeId": to_node_id(1), "first": 5, "after": to_cursor("blog", 1)}
+        resp = client.post("/", json={"query": ACCOUNT, "variables": variables})
+        edges = json.loads(resp.text)["data"]["account"]["blogsByIdToAccountId"]["edges"]
+        assert edges == [{"node": {"title": "second"}}]
+
+        # Cursors are still validated when the plan is cached
+        variables["after"] = to_cursor("account", 1)
+        resp = client.post("/", json={"query": ACCOUNT, "variables": variables})
+        assert "Invalid cursor" in json.loads(resp.text)["errors"][0]["message"]
+
+    info = plan_cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+
+
+def test_plan_cache_null_conditions(client_builder):
+    client = client_builder(SQL_UP)
+
+    with client:
+        results = []
+        for name in ["oliver", None, "rachel", None]:
+            resp = client.post("/", json={"query": ALL_ACCOUNTS, "variables": {"name": name}})
+            results.append([x["node"]["id"] for x in json.loads(resp.text)["data"]["allAccounts"]["edges"]])
+
+    assert results == [[1], [3], [2], [3]]
+    info = client.app.state.plan_cache.cache_info()
+    assert (info.hits, info.misses) == (2, 2)
+
+
+def test_plan_cache_root_fields_of_one_statement(client_builder):
+    client = client_builder(SQL_UP)
+    query = """query ($a: ID!, $b: ID!) {
+        a: account(nodeId: $a) { name }
+        b: account(nodeId: $b) { name }
+    }"""
+
+    with client:
+        for a, b in [(1, 2), (2, 1)]:
+            resp = client.post("/", json={"query": query, "variables": {"a": to_node_id(a), "b": to_node_id(b)}})
+            data = json.loads(resp.text)["data"]
+            assert data == {"a": {"name": ["oliver", "rachel"][a - 1]}, "b": {"name": ["oliver", "rachel"][b - 1]}}
+
+    assert client.app.state.plan_cache.cache_info().hits == 1
+
+
+def test_plan_cache_evictions(client_builder, monkeypatch):
+    monkeypatch.setattr(Config, "PLAN_CACHE_SIZE", 1)
+    client = client_builder(SQL_UP)
+    plan_cache = client.app.state.plan_cache
+
+    with client:
+        for query in [
+            "{ allAccounts { totalCount } }",
+            "{ allBlogs { totalCount } }",
+            "{ allAccounts { totalCount } }",
+        ]:
+            resp = client.post("/", json={"query": query})
+            assert json.loads(resp.text)["errors"] == []
+
+    info = plan_cache.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.maxsize, info.currsize) == (0, 3, 2, 1, 1)
+
+    plan_cache.cache_clear()
+    assert plan_cache.cache_info() == (0, 0, 0, 1, 0)
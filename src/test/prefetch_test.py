@@ -0,0 +1,76 @@
+import jwt
+from nebulo.gql.relay.node_interface import NodeIdStructure
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (id, name) VALUES
+(1, 'oliver'),
+(2, 'rachel');
+
+CREATE FUNCTION to_upper(some_text text) returns text
+    as $$ select upper(some_text) $$ language sql immutable;
+"""
+
+
+def test_prefetch_root_fields_in_one_statement(client_builder, capture_statements):
+    client = client_builder(SQL_UP)
+    statements = capture_statements(client)
+    node_id = NodeIdStructure(table_name="account", values={"id": 2}).serialize()
+
+    query = f"""
+    {{
+        first: account(nodeId: "{node_id}") {{ name }}
+        accounts: allAccounts {{ totalCount edges {{ node {{ name }} }} }}
+        upper: toUpper(some_text: "abc")
+    }}
+    """
+    with client:
+        resp = client.post("/", json={"query": query})
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["errors"] == []
+    assert payload["data"] == {
+        "first": {"name": "rachel"},
+        "accounts": {"totalCount": 2, "edges": [{"node": {"name": "oliver"}}, {"node": {"name": "rachel"}}]},
+        "upper": "ABC",
+    }
+    # Claims are not set without a default role, so a single statement
+    assert len(statements) == 1
+
+
+def test_prefetch_falls_back_to_each_root_field(client_builder):
+    client = client_builder(SQL_UP)
+
+    # LIMIT must not be negative
+    query = """
+    {
+        allAccounts { totalCount }
+        failing: allAccounts(first: -1) { edges { node { name } } }
+    }
+    """
+    with client:
+        resp = client.post("/", json={"query": query})
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["data"]["allAccounts"]["totalCount"] == 2
+    assert len(payload["errors"]) == 1
+
+
+def test_prefetch_reports_transaction_errors_for_each_root_field(client_builder, capture_statements):
+    client = client_builder(SQL_UP, jwt_identifier="public.jwt_token", jwt_secret="secret")
+    statements = capture_statements(client)
+    token = jwt.encode({"role": "no_such_role"}, "secret", algorithm="HS256").decode("utf-8")
+
+    query = '{ allAccounts { totalCount } upper: toUpper(some_text: "abc") }'
+    with client:
+        resp = client.post("/", json={"query": query}, headers={"Authorization": f"Bearer {token}"})
+    payload = resp.json()
+    assert payload["data"] == {"allAccounts": None, "upper": None}
+    assert [error["path"] for error in payload["errors"]] == [["allAccounts"], ["upper"]]
+    assert all("no_such_role" in error["message"] for error in payload["errors"])
+    # Root fields are not resolved separately, which would fail the same way
+    assert len(statements) == 1
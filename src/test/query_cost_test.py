@@ -0,0 +1,97 @@
+import json
+
+from nebulo.gql.cost import QueryCostLimits
+from nebulo.server.routes import graphql as graphql_route
+from nebulo.sql.reflection.manager import reflect_sqla_models
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (name)
+SELECT 'account_' || x FROM generate_series(1, 5) x;
+
+CREATE TABLE offer (
+    id serial primary key,
+    account_id int not null references account (id)
+);
+
+INSERT INTO offer (account_id)
+SELECT (x % 5) + 1 FROM generate_series(1, 50) x;
+
+ANALYZE account;
+ANALYZE offer;
+"""
+
+QUERY = """
+{
+    allAccounts(first: 10) {
+        edges {
+            node {
+                name
+                offersByIdToAccountId(first: 3) {
+                    totalCount
+                    edges { node { id } }
+                }
+            }
+        }
+    }
+}
+"""
+
+
+def test_reflect_reltuples(session, engine):
+    session.execute(SQL_UP)
+    session.commit()
+    tables, _ = reflect_sqla_models(engine, schema="public")
+    reltuples = {table.__table__.name: table.__table__.info["reltuples"] for table in tables}
+    assert reltuples == {"account": 5, "offer": 50}
+
+
+def test_query_cost_extension(client_builder):
+    with client_builder(SQL_UP, expose_query_cost=True) as client:
+        resp = client.post("/", json={"query": QUERY})
+    assert resp.status_code == 200
+    payload = json.loads(resp.text)
+    assert payload["errors"] == []
+
+    cost = payload["extensions"]["cost"]
+    assert cost["depth"] == 2
+    assert cost["node_count"] == 2
+    # 5 accounts (capped by reltuples) + 5 * (3 offers + 50 counted by totalCount)
+    assert cost["estimated_rows"] == 5 + 5 * (3 + 50)
+
+
+def test_query_cost_disabled_by_default(client_builder, monkeypatch):
+    def get_operation_cost(*args):
+        raise AssertionError("cost estimated without limits")
+
+    monkeypatch.setattr(graphql_route, "get_operation_cost", get_operation_cost)
+    with client_builder(SQL_UP) as client:
+        resp = client.post("/", json={"query": QUERY})
+    payload = json.loads(resp.text)
+    assert payload["errors"] == []
+    assert "extensions" not in payload
+
+
+def test_query_cost_limits(client_builder):
+    limits = QueryCostLimits(max_depth=1)
+    with client_builder(SQL_UP, query_cost_limits=limits) as client:
+        resp = client.post("/", json={"query": QUERY})
+        payload = json.loads(resp.text)
+        assert payload["data"] is None
+        assert payload["errors"][0]["extensions"]["code"] == "QUERY_COST_EXCEEDED"
+        assert "depth" in payload["errors"][0]["message"]
+
+        # Shallow queries are allowed, and the estimate is returned when limits apply
+        resp = client.post("/", json={"query": "{ allAccounts { totalCount } }"})
+        payload = json.loads(resp.text)
+        assert payload["errors"] == []
+        assert payload["extensions"]["cost"]["depth"] == 1
+
+    limits = QueryCostLimits(max_estimated_rows=100)
+    with client_builder("SELECT 1;", query_cost_limits=limits) as client:
+        resp = client.post("/", json={"query": QUERY})
+        assert "estimated number of rows" in json.loads(resp.text)["errors"][0]["message"]
@@ -0,0 +1,72 @@
+from graphql.utilities import print_schema
+from nebulo.gql.sqla_to_gql import sqla_models_to_graphql_schema
+from nebulo.sql.reflection.manager import reflect_sqla_models, sqla_models_from_snapshot
+from nebulo.sql.reflection.snapshot import dump_snapshot, load_snapshot, reflect_snapshot
+
+SQL_UP = """
+CREATE TYPE light_color AS ENUM ('red', 'green');
+
+CREATE TYPE full_name AS (
+    first_name text,
+    last_name text
+);
+
+CREATE TABLE account (
+    id serial primary key,
+    name full_name not null,
+    color light_color
+);
+
+CREATE TABLE offer (
+    id serial primary key,
+    account_id int not null,
+
+    constraint fk_offer_account_id
+        foreign key (account_id)
+        references account (id)
+);
+
+comment on constraint fk_offer_account_id on offer is '@name Owner Offers';
+
+CREATE VIEW account_summary AS
+SELECT id, color FROM account;
+
+comment on view account_summary is E'
+@primary_key (id)
+@foreign_key (id) references public.account (id)';
+
+CREATE FUNCTION get_account(account_id int) returns account
+    as $$ select * from account where id = account_id limit 1; $$ language sql;
+
+ANALYZE account;
+"""
+
+
+def test_reflection_snapshot_matches_reflection(engine, session):
+    session.execute(SQL_UP)
+    session.commit()
+
+    tables, functions = reflect_sqla_models(engine, schema="public")
+    expected = print_schema(sqla_models_to_graphql_schema(tables, functions))
+
+    data = dump_snapshot(reflect_snapshot(engine, schema="public"))
+    snapshot = load_snapshot(data)
+    tables, functions = sqla_models_from_snapshot(snapshot)
+
+    assert print_schema(sqla_models_to_graphql_schema(tables, functions)) == expected
+    # Constraint comments are part of the snapshot
+    assert "Owner: Account!" in expected
+    assert {x.__table__.name for x in tables} == {"account", "offer", "account_summary"}
+    assert "reltuples" in snapshot.metadata.tables["public.account"].info
+
+
+def test_app_from_reflection_snapshot(client_builder, engine, tmp_path):
+    client = client_builder(SQL_UP)
+    path = tmp_path / "snapshot.pickle"
+    path.write_bytes(dump_snapshot(reflect_snapshot(engine, schema="public")))
+
+    client = client_builder("SELECT 1;", reflection_snapshot=str(path))
+    with client:
+        resp = client.post("/", json={"query": "{ allAccounts { totalCount } }"})
+    assert resp.status_code == 200
+    assert resp.json()["data"]["allAccounts"]["totalCount"] == 0
@@ -0,0 +1,107 @@
+import json
+
+from nebulo.config import Config
+
+SQL_UP = """
+CREATE TABLE author (
+    id serial primary key,
+    name text not null
+);
+
+CREATE TABLE post (
+    id serial primary key,
+    author_id int references author(id),
+    title text not null
+);
+
+CREATE TABLE comment (
+    id serial primary key,
+    post_id int not null references post(id),
+    body text not null
+);
+
+INSERT INTO author (name) VALUES
+('oliver'),
+('rachel');
+
+INSERT INTO post (author_id, title) VALUES
+(1, 'first'),
+(1, 'second'),
+(null, 'anonymous');
+
+INSERT INTO comment (post_id, body) VALUES
+(1, 'a'),
+(1, 'b'),
+(3, 'c');
+"""
+
+QUERIES = [
+    """{
+        allComments {
+            edges { node { body post: postByPostIdToId { title author: authorByAuthorIdToId { name } } } }
+        }
+    }""",
+    """{
+        allAuthors(first: 1) {
+            totalCount
+            edges { node {
+                name
+                posts: postsByIdToAuthorId(last: 1) {
+                    pageInfo { hasPreviousPage }
+                    edges { node { title comments: commentsByIdToPostId { edges { node { body } } } } }
+                }
+            } }
+        }
+    }""",
+    """{
+        allPosts {
+            edges { node {
+                title
+                author: authorByAuthorIdToId { name }
+                comments: commentsByIdToPostId(first: 1) { edges { node { body post: postByPostIdToId { id } } } }
+            } }
+        }
+    }""",
+]
+
+
+def test_relationship_strategies_match(client_builder, monkeypatch, capture_statements):
+    # Statements are inspected, so none may be written by the text builder
+    monkeypatch.setattr(Config, "SQL_COMPILER", "sqlalchemy")
+    client = client_builder(SQL_UP)
+    statements = capture_statements(client)
+
+    with client:
+        for query in QUERIES:
+            results, laterals = [], []
+            for strategy in ["subquery", "lateral", "auto"]:
+                resp = client.post("/", json={"query": query, "extensions": {"relationshipStrategy": strategy}})
+                payload = json.loads(resp.text)
+                assert payload["errors"] == []
+                results.append(payload["data"])
+                laterals.append("LATERAL" in statements[-1])
+            assert results[0] == results[1] == results[2]
+            # auto only joins to-one relationships LATERAL, and the second query only nests connections
+            assert laterals == [False, True, query is not QUERIES[1]]
+
+    # A to-one relationship without a related row is null
+    edges = results[0]["allPosts"]["edges"]
+    assert edges[2]["node"]["author"] is None
+    assert edges[2]["node"]["comments"]["edges"] == [{"node": {"body": "c", "post": {"id": 3}}}]
+    assert client.app.state.plan_cache.cache_info().currsize == 9
+
+
+def test_relationship_strategy_auto_joins_to_one_relationships(client_builder, monkeypatch, capture_statements):
+    monkeypatch.setattr(Config, "RELATIONSHIP_STRATEGY", "auto")
+    client = client_builder(SQL_UP)
+    statements = capture_statements(client)
+    query = "{ allAuthors { edges { node { postsByIdToAuthorId { edges { node { title } } } } } } }"
+
+    with client:
+        resp = client.post("/", json={"query": query})
+        assert json.loads(resp.text)["errors"] == []
+        # Connections remain subqueries
+        assert "LATERAL" not in statements[-1]
+
+        resp = client.post("/", json={"query": query, "extensions": {"relationshipStrategy": "unknown"}})
+        assert "relationshipStrategy must be one of" in json.loads(resp.text)["errors"][0]["message"]
@@ -0,0 +1,99 @@
+import jwt
+from nebulo.server.replicas import ReplicaRouter
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (name) VALUES
+('oliver');
+
+CREATE FUNCTION is_read_only() returns text
+    as $$ select current_setting('transaction_read_only') $$ language sql immutable;
+"""
+
+
+def test_replica_serves_queries_read_only(client_builder, connection_str):
+    client = client_builder(SQL_UP, replicas=[connection_str])
+    replica_router = client.app.state.replica_router
+
+    with client:
+        resp = client.post("/", json={"query": "{ isReadOnly }"})
+        assert resp.status_code == 200
+        assert resp.json()["data"]["isReadOnly"] == "on"
+        assert replica_router.replica_reads == 1
+
+        mutation = """
+        mutation {
+            createAccount(input: {account: {name: "rachel"}}) {
+                account { name }
+            }
+        }
+        """
+        resp = client.post("/", json={"query": mutation})
+        assert resp.status_code == 200
+        assert resp.json()["data"]["createAccount"]["account"]["name"] == "rachel"
+        # Mutations are not counted as reads
+        assert replica_router.replica_reads == 1
+
+
+def test_primary_queries_are_not_read_only(client_builder):
+    client = client_builder(SQL_UP)
+    with client:
+        resp = client.post("/", json={"query": "{ isReadOnly }"})
+    assert resp.json()["data"]["isReadOnly"] == "off"
+
+
+def test_read_your_writes_pins_subject_to_primary():
+    primary, replica = object(), object()
+    replica_router = ReplicaRouter(primary, [replica], read_your_writes=60)  # type: ignore
+
+    assert replica_router.get_engine({"sub": "alice"}, is_query=True) == (replica, True)
+    assert replica_router.get_engine({"sub": "alice"}, is_query=False) == (primary, False)
+
+    replica_router.record_write({"sub": "alice"})
+    assert replica_router.get_engine({"sub": "alice"}, is_query=True) == (primary, False)
+    # Other subjects and anonymous users are unaffected
+    assert replica_router.get_engine({"sub": "bob"}, is_query=True) == (replica, True)
+    assert replica_router.get_engine({}, is_query=True) == (replica, True)
+
+
+def test_cached_queries_read_from_primary(client_builder, connection_str):
+    client = client_builder(SQL_UP, replicas=[connection_str], result_cache_ttl=60)
+    replica_router = client.app.state.replica_router
+
+    with client:
+        # Results are cached, so a stale read from a replica would outlive its replication lag
+        resp = client.post("/", json={"query": "{ allAccounts { totalCount } }"})
+        assert resp.json()["data"]["allAccounts"]["totalCount"] == 1
+        assert replica_router.replica_reads == 0
+
+        # Functions are not cached
+        resp = client.post("/", json={"query": "{ isReadOnly }"})
+        assert resp.json()["data"]["isReadOnly"] == "on"
+        assert replica_router.replica_reads == 1
+
+
+def test_failed_mutation_does_not_pin_subject(client_builder, connection_str):
+    client = client_builder(
+        SQL_UP + "ALTER TABLE account ADD CONSTRAINT name_not_empty CHECK (name <> '');",
+        replicas=[connection_str],
+        read_your_writes=60,
+        jwt_identifier="public.jwt_token",
+        jwt_secret="secret",
+    )
+    replica_router = client.app.state.replica_router
+    token = jwt.encode({"sub": "alice"}, "secret", algorithm="HS256").decode("utf-8")
+    headers = {"Authorization": f"Bearer {token}"}
+    mutation = 'mutation { createAccount(input: {account: {name: "%s"}}) { account { name } } }'
+
+    with client:
+        resp = client.post("/", json={"query": mutation % ""}, headers=headers)
+        assert len(resp.json()["errors"]) == 1
+        assert not replica_router.is_pinned({"sub": "alice"})
+
+        resp = client.post("/", json={"query": mutation % "alice"}, headers=headers)
+        assert resp.json()["errors"] == []
+        assert replica_router.is_pinned({"sub": "alice"})
@@ -0,0 +1,97 @@
+import json
+import time
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (name) VALUES ('oliver'), ('rachel');
+
+CREATE VIEW account_view AS SELECT id, name FROM account;
+
+COMMENT ON VIEW account_view IS E'@primary_key (id)';
+"""
+
+QUERY = "{ allAccounts { totalCount } }"
+
+
+def total_count(client, query=QUERY):
+    resp = client.post("/", json={"query": query})
+    assert resp.status_code == 200
+    return json.loads(resp.text)["data"]["allAccounts"]["totalCount"]
+
+
+def wait_for(predicate, timeout=5.0):
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_result_cache_invalidated_by_notify(client_builder, session):
+    client = client_builder(SQL_UP, result_cache_ttl=60)
+    result_cache = client.app.state.result_cache
+
+    with client:
+        assert total_count(client) == 2
+        assert total_count(client) == 2
+        assert result_cache.cache_info().hits == 1
+
+        # Write from outside the server
+        session.execute("INSERT INTO account (name) VALUES ('sophie')")
+        session.commit()
+
+        assert wait_for(lambda: total_count(client) == 3)
+
+
+def test_result_cache_invalidated_by_mutation(client_builder):
+    client = client_builder(SQL_UP, result_cache_ttl=60)
+    mutation = 'mutation { createAccount(input: {account: {name: "buddy"}}) { account { id } } }'
+
+    with client:
+        assert total_count(client) == 2
+        resp = client.post("/", json={"query": mutation})
+        assert json.loads(resp.text)["errors"] == []
+        assert total_count(client) == 3
+
+
+def test_result_cache_keyed_by_claims(client_builder):
+    client = client_builder(SQL_UP, result_cache_ttl=60)
+    result_cache = client.app.state.result_cache
+
+    with client:
+        total_count(client)
+        total_count(client, "{ allAccounts(first: 1) { totalCount } }")
+        assert result_cache.cache_info().misses == 2
+
+        key = result_cache.to_key(QUERY, None, {}, None, {})
+        assert key != result_cache.to_key(QUERY, None, {}, None, {"role": "anon_api_user"})
+        assert key != result_cache.to_key(QUERY, None, {}, "anon_api_user", {})
+
+
+def test_result_cache_skips_views(client_builder):
+    client = client_builder(SQL_UP, result_cache_ttl=60)
+    result_cache = client.app.state.result_cache
+
+    with client:
+        client.post("/", json={"query": "{ allAccountViews { totalCount } }"})
+        client.post("/", json={"query": "{ allAccountViews { totalCount } }"})
+        assert result_cache.cache_info().hits == 0
+        assert result_cache.cache_info().currsize == 0
+
+
+def test_result_cache_with_batches(client_builder):
+    client = client_builder(SQL_UP, result_cache_ttl=60)
+    result_cache = client.app.state.result_cache
+
+    with client:
+        resp = client.post("/", json=[{"query": QUERY}, {"query": "{ allAccounts(first: 1) { totalCount } }"}])
+        assert resp.status_code == 200
+        assert [x["data"]["allAccounts"]["totalCount"] for x in json.loads(resp.text)] == [2, 2]
+
+        # Batched operations run in a shared transaction and bypass the cache
+        assert result_cache.cache_info().currsize == 0
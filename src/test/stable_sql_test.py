@@ -0,0 +1,87 @@
+import json
+
+from nebulo.gql.relay.cursor import CursorStructure
+from nebulo.gql.relay.node_interface import NodeIdStructure
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+CREATE TABLE blog (
+    id serial primary key,
+    account_id int not null references account(id),
+    title text not null
+);
+
+INSERT INTO account (name) VALUES
+('oliver'),
+('rachel'),
+('sophie');
+
+INSERT INTO blog (account_id, title) VALUES
+(1, 'first'),
+(1, 'second');
+"""
+
+
+def test_sql_depends_only_on_query_shape(client_builder, capture_statements):
+    client = client_builder(SQL_UP)
+    statements = capture_statements(client)
+
+    queries = [
+        (
+            """query ($nodeId: ID!, $first: Int) {
+                account(nodeId: $nodeId) { name blogsByIdToAccountId(first: $first) { edges { node { title } } } }
+            }""",
+            [
+                {"nodeId": NodeIdStructure(table_name="account", values={"id": 1}).serialize(), "first": 1},
+                {"nodeId": NodeIdStructure(table_name="account", values={"id": 2}).serialize(), "first": 5},
+            ],
+        ),
+        (
+            """query ($first: Int, $after: Cursor, $name: String) {
+                allAccounts(first: $first, after: $after, condition: {name: $name}) {
+                    totalCount
+                    pageInfo { hasNextPage }
+                    edges { cursor node { name } }
+                }
+            }""",
+            [
+                {"first": 1, "after": CursorStructure(table_name="account", values={"id": 1}).serialize(), "name": "a"},
+                {"first": 2, "after": CursorStructure(table_name="account", values={"id": 2}).serialize(), "name": "b"},
+            ],
+        ),
+        (
+            """mutation ($name: String!) {
+                createAccount(input: {account: {name: $name}}) { account { id name } }
+            }""",
+            [{"name": "buddy"}, {"name": "ted"}],
+        ),
+    ]
+
+    with client:
+        for query, variables in queries:
+            texts = []
+            for values in variables:
+                statements.clear()
+                resp = client.post("/", json={"query": query, "variables": values})
+                assert json.loads(resp.text)["errors"] == []
+                texts.append(statements[-1])
+            assert texts[0] == texts[1]
+
+
+def test_null_page_variables_are_ignored(client_builder):
+    client = client_builder(SQL_UP)
+    query = """query ($first: Int, $after: Cursor) {
+        allAccounts(first: $first, after: $after) { pageInfo { hasPreviousPage } edges { node { name } } }
+    }"""
+
+    with client:
+        resp = client.post("/", json={"query": query, "variables": {"first": None, "after": None}})
+    payload = json.loads(resp.text)
+    assert payload["errors"] == []
+    result = payload["data"]["allAccounts"]
+    assert [x["node"]["name"] for x in result["edges"]] == ["oliver", "rachel", "sophie"]
+    assert result["pageInfo"]["hasPreviousPage"] is False
@@ -0,0 +1,115 @@
+import json
+
+from nebulo.gql.resolve.resolvers import passthrough
+from sqlalchemy import text
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text not null
+);
+
+INSERT INTO account (name)
+SELECT 'account_' || x FROM generate_series(1, 250) x;
+"""
+
+QUERY = """
+{
+    allAccounts(first: 20) {
+        totalCount
+        pageInfo { hasNextPage endCursor }
+        edges { cursor node { id name } }
+    }
+}
+"""
+
+
+def test_streamed_connection_matches_executor(client_builder):
+    with client_builder(SQL_UP) as client:
+        expected = json.loads(client.post("/", json={"query": QUERY}).text)
+
+    with client_builder("SELECT 1;", stream_connections=True) as client:
+        resp = client.post("/", json={"query": QUERY})
+        assert resp.status_code == 200
+        assert "Content-Length" not in resp.headers
+        payload = json.loads(resp.text)
+
+    assert payload == expected
+    assert payload["data"]["allAccounts"]["totalCount"] == 250
+    assert len(payload["data"]["allAccounts"]["edges"]) == 20
+    assert payload["data"]["allAccounts"]["edges"][-1]["node"]["id"] == 20
+
+
+def test_streamed_connection_last(client_builder):
+    query = "{ allAccounts(last: 2) { edges { node { id } } } }"
+
+    with client_builder(SQL_UP, stream_connections=True) as client:
+        resp = client.post("/", json={"query": query})
+        # Streamed without an envelope statement
+        assert "Content-Length" not in resp.headers
+        payload = json.loads(resp.text)
+
+    assert [x["node"]["id"] for x in payload["data"]["allAccounts"]["edges"]] == [249, 250]
+
+
+def test_compression_threshold(client_builder):
+    with client_builder(SQL_UP, compression_minimum_size=1000) as client:
+        # Large responses are compressed
+        resp = client.post("/", json={"query": QUERY}, headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        # Decoded by the client
+        assert len(json.loads(resp.text)["data"]["allAccounts"]["edges"]) == 20
+
+        # Small responses are not
+        resp = client.post(
+            "/", json={"query": "{ allAccounts(first: 1) { totalCount } }"}, headers={"Accept-Encoding": "gzip"}
+        )
+        assert "Content-Encoding" not in resp.headers
+
+        # Clients that do not accept an encoding
+        resp = client.post("/", json={"query": QUERY}, headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in resp.headers
+
+
+def test_streamed_connection_reads_one_snapshot(client_builder):
+    sql = """
+    CREATE VIEW isolation AS
+    SELECT
+        1 AS id,
+        current_setting('transaction_isolation') AS level,
+        current_setting('transaction_read_only') AS read_only;
+
+    COMMENT ON VIEW isolation IS E'@primary_key (id)';
+    """
+    query = "{ allIsolations { totalCount edges { node { level readOnly } } } }"
+
+    with client_builder(sql, stream_connections=True) as client:
+        resp = client.post("/", json={"query": query})
+        payload = json.loads(resp.text)
+
+    # The envelope and the edges are read in one REPEATABLE READ transaction
+    assert payload["data"]["allIsolations"]["edges"] == [{"node": {"level": "repeatable read", "readOnly": "on"}}]
+
+
+def test_streamed_connection_ends_body_with_error(client_builder, monkeypatch):
+    # Edges are fetched from the cursor in batches, and a row after the first batch fails
+    sql = """
+    SELECT CASE WHEN x < 150 THEN '{"node":{"id":' || x || '}}' ELSE (1 / (x - x))::text END
+    FROM generate_series(1, 200) x
+    """
+    edges = text(sql)
+    monkeypatch.setattr(passthrough, "sql_connection_edges", lambda tree, strategy: edges)
+
+    with client_builder(SQL_UP, stream_connections=True) as client:
+        resp = client.post("/", json={"query": "{ allAccounts { edges { node { id } } } }"})
+        assert resp.status_code == 200
+        assert "Content-Length" not in resp.headers
+        payload = json.loads(resp.text)
+
+    # The body is complete JSON reporting the error after the edges that were read
+    edges = payload["data"]["allAccounts"]["edges"]
+    assert edges == [{"node": {"id": x}} for x in range(1, len(edges) + 1)]
+    assert len(payload["errors"]) == 1
+    assert "division by zero" in payload["errors"][0]["message"]
+    assert payload["errors"][0]["path"] == ["allAccounts", "edges"]
@@ -0,0 +1,121 @@
+import json
+
+from nebulo.config import Config
+from nebulo.gql.relay.cursor import CursorStructure
+from nebulo.gql.relay.node_interface import NodeIdStructure
+from nebulo.gql.resolve.transpile.text_builder import Params, literal_string, quote
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    name text
+);
+
+CREATE TABLE blog (
+    id serial primary key,
+    account_id int not null references account(id),
+    title text not null
+);
+
+CREATE TABLE version (
+    major int,
+    minor int,
+    label text,
+    primary key (major, minor)
+);
+
+INSERT INTO account (name) VALUES
+('oliver'),
+('rachel'),
+(null);
+
+INSERT INTO blog (account_id, title) VALUES
+(1, 'first'),
+(1, 'second'),
+(2, 'third');
+
+INSERT INTO version (major, minor, label) VALUES
+(1, 0, 'a'),
+(1, 1, 'b'),
+(2, 0, 'c');
+
+CREATE FUNCTION to_upper(some_text text) returns text as
+$$ select upper(some_text) $$ language sql immutable;
+"""
+
+QUERIES = [
+    (
+        """query ($nodeId: ID!) {
+            account(nodeId: $nodeId) {
+                nodeId
+                name
+                blogs: blogsByIdToAccountId(first: 1) {
+                    totalCount
+                    pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+                    edges { cursor node { title author: accountByAccountIdToId { name } } }
+                }
+            }
+        }""",
+        {"nodeId": NodeIdStructure(table_name="account", values={"id": 1}).serialize()},
+    ),
+    (
+        """query ($name: String, $after: Cursor) {
+            allAccounts(condition: {name: $name}, after: $after) { totalCount edges { node { id } } }
+        }""",
+        {"name": None, "after": CursorStructure(table_name="account", values={"id": 1}).serialize()},
+    ),
+    (
+        """query ($before: Cursor) {
+            allVersions(last: 2, before: $before) { pageInfo { hasNextPage } edges { cursor node { label } } }
+        }""",
+        {"before": CursorStructure(table_name="version", values={"major": 2, "minor": 0}).serialize()},
+    ),
+    (
+        """{
+            blogs: allBlogs(first: 2) { edges { node { title } } }
+            versions: allVersions { totalCount }
+        }""",
+        {},
+    ),
+    ('{ toUpper(some_text: "abc") }', {}),
+]
+
+
+def test_text_builder_matches_sqlalchemy(client_builder, monkeypatch):
+    client = client_builder(SQL_UP)
+
+    with client:
+        for query, variables in QUERIES:
+            results = []
+            for compiler in ["sqlalchemy", "text"]:
+                monkeypatch.setattr(Config, "SQL_COMPILER", compiler)
+                resp = client.post("/", json={"query": query, "variables": variables})
+                payload = json.loads(resp.text)
+                assert payload["errors"] == []
+                results.append(payload["data"])
+            assert results[0] == results[1]
+
+    assert results[0] == {"toUpper": "ABC"}
+
+
+def test_text_builder_json_passthrough(client_builder, monkeypatch):
+    monkeypatch.setattr(Config, "SQL_COMPILER", "text")
+    client = client_builder(SQL_UP, json_passthrough=True)
+    query = "{ allBlogs(condition: {accountId: 1}) { edges { node { title } } } }"
+
+    with client:
+        resp = client.post("/", json={"query": query})
+    edges = json.loads(resp.text)["data"]["allBlogs"]["edges"]
+    assert edges == [{"node": {"title": "first"}}, {"node": {"title": "second"}}]
+
+
+def test_text_builder_params_follow_placeholders():
+    params = Params()
+    first, second = params.bind(1), params.bind(2)
+    # Placeholders are numbered as values are bound, and reordered to match the text
+    query = params.finalize(f"SELECT {second}, '50%%', {first}")
+    assert query.sql == "SELECT %s, '50%%', %s"
+    assert query.params == (2, 1)
+
+    assert literal_string("it's 50%") == "'it''s 50%%'"
+    assert quote("nodeId") == '"nodeId"'
@@ -0,0 +1,160 @@
+import json
+
+from nebulo.config import Config
+from nebulo.gql.relay.node_interface import NodeIdStructure
+
+SQL_UP = """
+CREATE TABLE account (
+    id serial primary key,
+    email text not null unique,
+    name text not null,
+    age int not null default 10
+);
+
+INSERT INTO account (email, name) VALUES
+('o@r.com', 'oliver'),
+('r@r.com', 'rachel');
+
+CREATE TABLE event (
+    name text not null
+);
+"""
+
+
+def test_upsert_on_primary_key(client_builder, capture_statements):
+    client = client_builder(SQL_UP)
+    statements = capture_statements(client)
+    query = """
+    mutation {
+        upsertAccount(input: {account: {id: %d, email: "%s", name: "%s"}}) {
+            account { id email name age }
+        }
+    }
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query % (1, "o@r.com", "OLIVER")})
+        payload = json.loads(resp.text)
+        assert payload["errors"] == []
+        assert payload["data"]["upsertAccount"]["account"] == {"id": 1, "email": "o@r.com", "name": "OLIVER", "age": 10}
+        assert len(statements) == 1
+
+        resp = client.post("/", json={"query": query % (50, "s@r.com", "sophie")})
+        payload = json.loads(resp.text)
+        assert payload["data"]["upsertAccount"]["account"]["id"] == 50
+
+
+def test_upsert_on_unique_constraint(client_builder):
+    client = client_builder(SQL_UP)
+    query = """
+    mutation {
+        upsertAccount(input: {account: {email: "r@r.com", name: "RACHEL", age: 20}, onConflict: account_email_key}) {
+            account { id name age }
+        }
+    }
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query})
+        payload = json.loads(resp.text)
+        assert payload["errors"] == []
+        assert payload["data"]["upsertAccount"]["account"] == {"id": 2, "name": "RACHEL", "age": 20}
+
+        resp = client.post("/", json={"query": "{ allAccounts { totalCount } }"})
+        assert json.loads(resp.text)["data"]["allAccounts"]["totalCount"] == 2
+
+
+def test_upsert_many(client_builder):
+    client = client_builder(SQL_UP)
+    query = """
+    mutation {
+        upsertManyAccounts(input: {
+            accounts: [
+                {email: "s@r.com", name: "sophie"},
+                {email: "o@r.com", name: "OLIVER", age: 30},
+                {email: "r@r.com", name: "RACHEL"}
+            ],
+            onConflict: account_email_key
+        }) {
+            nodeIds
+            accounts { id name age }
+        }
+    }
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query})
+    payload = json.loads(resp.text)
+    assert payload["errors"] == []
+    result = payload["data"]["upsertManyAccounts"]
+    assert len(result["nodeIds"]) == 3
+    assert result["accounts"] == [
+        {"id": 3, "name": "sophie", "age": 10},
+        {"id": 1, "name": "OLIVER", "age": 30},
+        {"id": 2, "name": "RACHEL", "age": 10},
+    ]
+
+
+def test_upsert_many_in_input_order(client_builder, monkeypatch):
+    monkeypatch.setattr(Config, "BULK_MUTATION_CHUNK_SIZE", 2)
+    client = client_builder(SQL_UP)
+    # Rows are not in primary key order, and are split across chunks and statements setting different columns
+    query = """
+    mutation {
+        upsertManyAccounts(input: {
+            accounts: [
+                {id: 9, email: "t@r.com", name: "ted"},
+                {id: 5, email: "b@r.com", name: "buddy", age: 5},
+                {id: 2, email: "r@r.com", name: "RACHEL"},
+                {id: 7, email: "s@r.com", name: "sophie"},
+                {id: 4, email: "a@r.com", name: "alice", age: 6}
+            ]
+        }) {
+            nodeIds
+            accounts { id name }
+        }
+    }
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query})
+    payload = json.loads(resp.text)
+    assert payload["errors"] == []
+    result = payload["data"]["upsertManyAccounts"]
+    assert [x["id"] for x in result["accounts"]] == [9, 5, 2, 7, 4]
+    assert result["nodeIds"] == [
+        NodeIdStructure(table_name="account", values={"id": x}).serialize() for x in [9, 5, 2, 7, 4]
+    ]
+
+
+def test_upsert_many_rejects_repeated_keys(client_builder):
+    client = client_builder(SQL_UP)
+    query = """
+    mutation {
+        upsertManyAccounts(input: {
+            accounts: [{email: "s@r.com", name: "sophie"}, {email: "s@r.com", name: "SOPHIE"}],
+            onConflict: account_email_key
+        }) {
+            nodeIds
+        }
+    }
+    """
+
+    with client:
+        resp = client.post("/", json={"query": query})
+        payload = json.loads(resp.text)
+        assert payload["data"]["upsertManyAccounts"] is None
+        assert (
+            payload["errors"][0]["message"] == "Key (email)=(s@r.com) of account_email_key is set by more than one row"
+        )
+
+        # Nothing was written
+        resp = client.post("/", json={"query": "{ allAccounts { totalCount } }"})
+        assert json.loads(resp.text)["data"]["allAccounts"]["totalCount"] == 2
+
+
+def test_upsert_requires_unique_constraint(schema_builder):
+    schema = schema_builder(SQL_UP)
+    assert "upsertAccount" in schema.mutation_type.fields
+    assert "upsertEvent" not in schema.mutation_type.fields
+    assert set(schema.type_map["AccountConflictTarget"].values) == {"account_pkey", "account_email_key"}
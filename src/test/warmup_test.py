@@ -0,0 +1,69 @@
+from nebulo.server.warmup import Warmup
+
+SQL_UP = """
+CREATE TYPE light_color AS ENUM ('red', 'green');
+
+CREATE TYPE full_name AS (
+    first_name text,
+    last_name text
+);
+
+CREATE TABLE account (
+    id serial primary key,
+    name full_name,
+    color light_color
+);
+"""
+
+WARMUP_QUERIES = """
+query Accounts {
+    allAccounts { edges { node { ...AccountFields } } }
+}
+
+query AccountCount {
+    allAccounts { totalCount }
+}
+
+mutation CreateAccount {
+    createAccount(input: {account: {color: RED}}) { account { id } }
+}
+
+fragment AccountFields on Account {
+    id
+    color
+}
+"""
+
+
+def test_warmup_opens_pool_connections(client_builder, tmp_path, caplog):
+    path = tmp_path / "warmup.graphql"
+    path.write_text(WARMUP_QUERIES)
+
+    client = client_builder(SQL_UP, pool_size=3, warmup=True, warmup_queries=str(path))
+    warmup = client.app.state.warmup
+    assert warmup.type_names == ['"public"."full_name"', '"public"."light_color"']
+    assert len(warmup.documents) == 2
+    caplog.clear()
+
+    assert not warmup.is_complete
+    with client:
+        assert warmup.is_complete
+        assert warmup.engines[0].pool.checkedin() == 3
+        # Type codecs loaded and queries executed without errors
+        assert not [x for x in caplog.records if x.name == "nebulo.server.warmup"]
+
+        resp = client.post("/", json={"query": "{ allAccounts { totalCount } }"})
+        assert resp.json()["data"]["allAccounts"]["totalCount"] == 0
+
+
+def test_warmup_disabled_by_default(client_builder):
+    client = client_builder(SQL_UP)
+    assert client.app.state.warmup is None
+
+
+def test_warmup_parse_documents(caplog):
+    documents = Warmup.parse_documents(WARMUP_QUERIES)
+    # Fragments are included with each query operation, and the mutation is skipped
+    assert [x.definitions[0].name.value for x in documents] == ["Accounts", "AccountCount"]
+    assert [len(x.definitions) for x in documents] == [2, 2]
+    assert [x.getMessage() for x in caplog.records] == ["Warmup skipped mutation operation CreateAccount"]